@@ -0,0 +1,5 @@
+"""
+Module is made for performance benchmarks of the application.
+
+Module contains: endpoints, serialization
+"""
@@ -0,0 +1,307 @@
+"""
+This module runs benchmark of every route of the application on SQLite database.
+
+For every data size database is filled with the same generated data, every route is
+called through Flask test client and latency percentiles, number of SQL statements
+per request and peak memory of request are written as JSON.
+
+Run it from the root of the project:
+
+    python -m benchmarks.endpoints --sizes 1000,10000 --output bench.json
+
+Every measured request must succeed: write routes of website must not flash error
+and routes of REST-API must not return error, otherwise benchmark fails, because it
+would time the error path instead of the route.
+
+This module includes functions: percentile(), build_scenarios(), load_data(),
+check_outcome(), run_scenario(), run_benchmark(), git_commit(), main().
+
+This module imports: argparse, json, logging, os, platform, random, subprocess, sys, tempfile,
+time, tracemalloc, sqlalchemy.
+"""
+import argparse
+import json
+import logging
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+import sqlalchemy
+
+SEED = 0
+
+
+def percentile(values: list, percent: float) -> float:
+    """
+    Return percentile of values with nearest-rank method.
+    :param values: Sorted values.
+    :param percent: Percent from 0 to 100.
+    :return: float
+    """
+    rank = max(1, -(-len(values) * percent // 100))
+    return values[int(rank) - 1]
+
+
+def build_scenarios(teachers: int, universities: int, requests: int) -> list:
+    """
+    Build list of scenarios, one for every route. Scenario is tuple (method, endpoint,
+    function that returns url values for request number k, function that returns
+    keyword arguments of test client for request number k).
+    Write scenarios change different rows for every request, so every request does the same
+    work, and they are ordered so that rows are created before they are deleted.
+    :param teachers: Number of teachers in database.
+    :param universities: Number of universities in database.
+    :param requests: Number of requests in every scenario.
+    :return: list
+    """
+    rng = random.Random(SEED)
+
+    def teacher_id(_):
+        return rng.randint(1, teachers)
+
+    def university_id(_):
+        return rng.randint(1, universities)
+
+    def new_teacher(k):
+        return {'name': f'Bench{k}', 'last_name': 'Bench', 'birth_date': '1980-01-01',
+                'salary': 1000 + k, 'university': 'Bench'}
+
+    dates = {'date_from': '1980-01-01', 'date_to': '1980-12-31'}
+    return [
+        ('GET', 'api.index', lambda k: {}, lambda k: {}),
+        ('GET', 'api.index', lambda k: {'all': 'true'}, lambda k: {}),
+        ('GET', 'api.export_teachers', lambda k: {'format': 'ndjson'}, lambda k: {}),
+        ('GET', 'api.export_teachers', lambda k: {'format': 'csv'}, lambda k: {}),
+        ('GET', 'api.read_teacher', lambda k: {'teacher_id': teacher_id(k)}, lambda k: {}),
+        ('POST', 'api.search_by_date', lambda k: {}, lambda k: {'json': dates}),
+        ('GET', 'api.get_university', lambda k: {}, lambda k: {}),
+        ('GET', 'api.get_university_by_id', lambda k: {'university_id': university_id(k)},
+         lambda k: {}),
+        ('GET', 'views.get_all_teachers', lambda k: {}, lambda k: {}),
+        ('GET', 'views.get_add_teacher', lambda k: {}, lambda k: {}),
+        ('GET', 'views.get_update_teacher', lambda k: {'teacher_id': teacher_id(k)},
+         lambda k: {}),
+        ('POST', 'views.search_by_date', lambda k: {}, lambda k: {'data': dates}),
+        ('GET', 'views.get_all_universities', lambda k: {}, lambda k: {}),
+        ('GET', 'views.add_university', lambda k: {}, lambda k: {}),
+        ('GET', 'metrics', lambda k: {}, lambda k: {}),
+        ('GET', 'pool_statistics', lambda k: {}, lambda k: {}),
+        ('GET', 'views.get_update_university', lambda k: {'university_id': university_id(k)},
+         lambda k: {}),
+        ('POST', 'api.post_university', lambda k: {},
+         lambda k: {'json': {'name': f'BenchApi{k}', 'location': 'Bench'}}),
+        ('POST', 'views.create_university', lambda k: {},
+         lambda k: {'data': {'name': f'BenchView{k}', 'location': 'Bench'}}),
+        ('PATCH', 'api.update_university', lambda k: {'university_id': university_id(k)},
+         lambda k: {'json': {'location': f'Bench {k}'}}),
+        ('POST', 'views.update_university', lambda k: {},
+         lambda k: {'data': {'university_id': university_id(k), 'location': f'View {k}'}}),
+        ('POST', 'api.add_teacher', lambda k: {}, lambda k: {'json': new_teacher(k)}),
+        ('POST', 'api.add_teachers_bulk', lambda k: {},
+         lambda k: {'json': [new_teacher(k * 100 + i) for i in range(100)]}),
+        ('POST', 'views.add_teacher', lambda k: {}, lambda k: {'data': new_teacher(k)}),
+        ('PATCH', 'api.update_teacher', lambda k: {'teacher_id': 1 + k},
+         lambda k: {'json': {'salary': 2000 + k}}),
+        ('POST', 'views.update_teacher', lambda k: {},
+         lambda k: {'data': {'teacher_id': requests + 1 + k, 'salary': 3000 + k}}),
+        ('DELETE', 'api.delete_teacher', lambda k: {'teacher_id': teachers - k}, lambda k: {}),
+        ('POST', 'views.delete_teacher', lambda k: {'teacher_id': teachers - requests - k},
+         lambda k: {}),
+        ('DELETE', 'api.delete_university',
+         lambda k: {'university_id': universities + 1 + k}, lambda k: {}),
+        ('POST', 'views.delete_university',
+         lambda k: {'university_id': universities + requests + 1 + k}, lambda k: {}),
+    ]
+
+
+def load_data(teachers: int, universities: int) -> None:
+    """
+    Recreate tables and fill them with generated universities and teachers.
+    Universities are numbered from 1, so the first one is called "Bench" for write scenarios.
+    :param teachers: Number of teachers.
+    :param universities: Number of universities.
+    :return: None
+    """
+    from app import db
+    from commands import generate_data
+    from models.university import University
+    from service import teachers_crud
+    from service import universities_crud
+
+    db.session.remove()
+    db.drop_all()
+    db.create_all()
+    rng = random.Random(SEED)
+    rows = generate_data.generate_universities(universities, rng)
+    rows[0]['name'] = 'Bench'
+    db.session.execute(University.__table__.insert(), rows)
+    db.session.commit()
+    university_ids = list(range(1, universities + 1))
+    for chunk in generate_data.generate_teachers(teachers, university_ids, rng, 10000):
+        teachers_crud.insert_teacher_rows(chunk, update_aggregates=False)
+        db.session.commit()
+    universities_crud.rebuild_salary_aggregates()
+    db.session.remove()
+
+
+def check_outcome(client, response, request: str) -> None:
+    """
+    Raise AssertionError if route returned error in JSON or flashed error message.
+    Flashed messages are removed from session, so they don't grow from request to request.
+    :param client: Flask test client.
+    :param response: Response of route.
+    :param request: Method and url of request for message of error.
+    :return: None
+    """
+    if response.is_json and isinstance(response.json, dict) and 'error' in response.json:
+        raise AssertionError(f'{request} returned error: {response.json["error"]}')
+    with client.session_transaction() as session:
+        flashes = session.pop('_flashes', [])
+    for category, message in flashes:
+        if category == 'error':
+            raise AssertionError(f'{request} flashed error: {message}')
+
+
+def run_scenario(client, scenario: tuple, warmup: int, iterations: int,
+                 statements: list) -> dict:
+    """
+    Call route of scenario warmup + iterations times, then once more with memory tracing.
+    Return dict with results of scenario.
+    :param client: Flask test client.
+    :param scenario: Tuple (method, endpoint, url values function, client arguments function).
+    :param warmup: Number of requests that are not measured.
+    :param iterations: Number of measured requests.
+    :param statements: List with one counter of executed SQL statements.
+    :return: dict
+    """
+    from flask import url_for
+
+    app = client.application
+    method, endpoint, url_values, client_args = scenario
+    latencies = []
+    status_codes = {}
+    statements_before = statements_after = 0
+    for k in range(warmup + iterations + 1):
+        with app.test_request_context():
+            url = url_for(endpoint, **url_values(k))
+        kwargs = client_args(k)
+        if k == warmup:
+            statements_before = statements[0]
+        if k == warmup + iterations:
+            statements_after = statements[0]
+            tracemalloc.start()
+        start = time.perf_counter()
+        response = client.open(url, method=method, **kwargs)
+        response.get_data()
+        elapsed = time.perf_counter() - start
+        check_outcome(client, response, f'{method} {url}')
+        if k == warmup + iterations:
+            _, peak_memory = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+        elif k >= warmup:
+            latencies.append(elapsed * 1000)
+            status_codes[response.status_code] = status_codes.get(response.status_code, 0) + 1
+        response.close()
+    latencies.sort()
+    return {'method': method,
+            'endpoint': endpoint,
+            'url': url,
+            'requests': iterations,
+            'status_codes': {str(code): count for code, count in status_codes.items()},
+            'p50_ms': round(percentile(latencies, 50), 3),
+            'p95_ms': round(percentile(latencies, 95), 3),
+            'p99_ms': round(percentile(latencies, 99), 3),
+            'mean_ms': round(sum(latencies) / len(latencies), 3),
+            'queries_per_request': round((statements_after - statements_before) / iterations, 2),
+            'peak_memory_kb': round(peak_memory / 1024, 1)}
+
+
+def run_benchmark(sizes: list, warmup: int, iterations: int) -> dict:
+    """
+    Run every scenario for every size of data. Return dict with metadata and results.
+    :param sizes: Numbers of teachers.
+    :param warmup: Number of requests that are not measured.
+    :param iterations: Number of measured requests.
+    :return: dict
+    """
+    from app import create_app, db, logger
+
+    app = create_app()
+    logger.setLevel(logging.WARNING)
+    statements = [0]
+
+    def count_statement(*_):
+        statements[0] += 1
+
+    results = []
+    with app.app_context():
+        sqlalchemy.event.listen(db.engine, 'before_cursor_execute', count_statement)
+        covered = set()
+        for size in sizes:
+            universities = max(5, size // 100)
+            load_data(size, universities)
+            client = app.test_client()
+            for scenario in build_scenarios(size, universities, warmup + iterations + 1):
+                result = run_scenario(client, scenario, warmup, iterations, statements)
+                result['size'] = size
+                results.append(result)
+                covered.add(scenario[1])
+        missing = {rule.endpoint for rule in app.url_map.iter_rules()} - covered - {'static'}
+    return {'meta': {'commit': git_commit(),
+                     'python': platform.python_version(),
+                     'sqlalchemy': sqlalchemy.__version__,
+                     'database': app.config['SQLALCHEMY_DATABASE_URI'].split(':')[0],
+                     'seed': SEED,
+                     'sizes': sizes,
+                     'warmup': warmup,
+                     'iterations': iterations,
+                     'not_covered_endpoints': sorted(missing)},
+            'results': results}
+
+
+def git_commit() -> str:
+    """
+    Return hash of current git commit or None if it is unknown.
+    :return: str
+    """
+    try:
+        return subprocess.run(['git', 'rev-parse', 'HEAD'], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main() -> None:
+    """
+    Read arguments of command line, run benchmark and write results.
+    :return: None
+    """
+    parser = argparse.ArgumentParser(description='Benchmark every route on SQLite database.')
+    parser.add_argument('--sizes', default='1000,10000,100000',
+                        help='Comma separated numbers of teachers.')
+    parser.add_argument('--database', choices=('memory', 'file'), default='file',
+                        help='Use in-memory SQLite or SQLite file in temporary directory.')
+    parser.add_argument('--warmup', type=int, default=3, help='Requests that are not measured.')
+    parser.add_argument('--iterations', type=int, default=30, help='Measured requests.')
+    parser.add_argument('--output', help='File for JSON results, stdout by default.')
+    args = parser.parse_args()
+    if args.database == 'memory':
+        os.environ['DATABASE_URL'] = 'sqlite://'
+    else:
+        path = os.path.join(tempfile.mkdtemp(prefix='bench_'), 'bench.db')
+        os.environ['DATABASE_URL'] = f'sqlite:///{path}'
+    sizes = [int(size) for size in args.sizes.split(',')]
+    report = run_benchmark(sizes, args.warmup, args.iterations)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as file:
+            json.dump(report, file, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+
+
+if __name__ == '__main__':
+    main()
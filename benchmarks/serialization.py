@@ -0,0 +1,136 @@
+"""
+This module compares writing teachers as JSON with marshmallow and with rest.serializers.
+
+The same generated teachers are written as GET /api/ writes them: by marshmallow from
+Teacher objects (as before) and by serializers from row tuples, with and without orjson.
+Benchmark fails if bodies are not byte-identical, otherwise it shows time of one body
+and speedup against marshmallow.
+
+Run it from the root of the project:
+
+    python -m benchmarks.serialization --sizes 100,1000,10000
+
+This module includes functions: make_teachers(), best_time(), run_benchmark(), main().
+
+This module imports: argparse, datetime, json, random, sys, time, unittest.mock.patch.
+"""
+import argparse
+import datetime
+import json
+import random
+import sys
+import time
+from unittest.mock import patch
+
+SEED = 0
+
+
+def make_teachers(size: int) -> tuple:
+    """
+    Return generated teachers as Teacher objects and as row tuples of
+    teachers_crud.teacher_rows_query(), every hundredth teacher has no university.
+    :param size: Number of teachers.
+    :return: tuple
+    """
+    from models.teacher import Teacher
+    from models.university import University
+
+    rng = random.Random(SEED)
+    universities = []
+    for number in range(1, max(5, size // 100) + 1):
+        university = University(f'University{number}', f'Street {number}',
+                                rng.randint(500, 3000))
+        university.id = number
+        universities.append(university)
+    teachers, rows = [], []
+    for number in range(1, size + 1):
+        university = rng.choice(universities) if number % 100 else None
+        teacher = Teacher(f'Name{number}', f'Last{number}',
+                          datetime.date(1950, 1, 1) + datetime.timedelta(rng.randint(0, 18000)),
+                          rng.randint(500, 5000), university)
+        teacher.id = number
+        teachers.append(teacher)
+        university_values = (university.id, university.name, university.location,
+                             university.average_salary) if university else (None,) * 4
+        rows.append((teacher.id, teacher.name, teacher.last_name, teacher.birth_date,
+                     teacher.salary) + university_values)
+    return teachers, rows
+
+
+def best_time(function, repeat: int) -> float:
+    """
+    Return the best time of function in seconds.
+    :param function: Function without arguments.
+    :param repeat: How many times function is called.
+    :return: float
+    """
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def run_benchmark(sizes: list, repeat: int) -> list:
+    """
+    Write teachers of every size in every way, check that bodies are the same
+    and return results.
+    :param sizes: Numbers of teachers.
+    :param repeat: How many times every body is written.
+    :return: list
+    """
+    from flask import jsonify
+    from app import create_app
+    from models.teacher import TeacherSchema
+    from rest import serializers
+
+    app = create_app({'SQLALCHEMY_DATABASE_URI': 'sqlite://'})
+    results = []
+    with app.app_context():
+        for size in sizes:
+            teachers, rows = make_teachers(size)
+
+            def with_marshmallow():
+                return jsonify({'teachers': TeacherSchema(many=True).dump(teachers),
+                                'next': size}).data
+
+            def with_serializers():
+                return serializers.json_response({
+                    'teachers': [serializers.dump_teacher_row(row) for row in rows],
+                    'next': size}).data
+
+            ways = {'marshmallow': with_marshmallow, 'serializers+json': with_serializers}
+            if serializers.orjson is not None:
+                ways['serializers+orjson'] = with_serializers
+            expected = with_marshmallow()
+            for way, function in ways.items():
+                with patch('rest.serializers.orjson',
+                           serializers.orjson if way.endswith('orjson') else None):
+                    if function() != expected:
+                        raise AssertionError(f'Body of {way} differs from marshmallow '
+                                             f'for {size} teachers.')
+                    seconds = best_time(function, repeat)
+                results.append({'size': size, 'way': way, 'ms': round(seconds * 1000, 3)})
+            base = results[-len(ways)]['ms']
+            for result in results[-len(ways):]:
+                result['speedup'] = round(base / result['ms'], 1)
+    return results
+
+
+def main() -> None:
+    """
+    Read arguments of command line, run benchmark and write results.
+    :return: None
+    """
+    parser = argparse.ArgumentParser(description='Compare marshmallow with rest.serializers.')
+    parser.add_argument('--sizes', default='100,1000,10000',
+                        help='Comma separated numbers of teachers.')
+    parser.add_argument('--repeat', type=int, default=5, help='Repeats of every way.')
+    args = parser.parse_args()
+    sizes = [int(size) for size in args.sizes.split(',')]
+    json.dump(run_benchmark(sizes, args.repeat), sys.stdout, indent=2)
+
+
+if __name__ == '__main__':
+    main()
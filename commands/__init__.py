@@ -0,0 +1,12 @@
+"""
+Module is made for handling command line commands of the application.
+
+Commands are registered in blueprint "cli" without group, so they are run with
+"flask <command>".
+
+Module contains: database, aggregates, import_teachers, generate_data, indexes
+"""
+from flask import Blueprint
+
+cli = Blueprint('cli', __name__, cli_group=None)
+from commands import database, aggregates, import_teachers, generate_data, indexes
@@ -0,0 +1,21 @@
+"""
+This module contains commands that maintain salary aggregates of universities.
+
+This module contains functions: rebuild_aggregates().
+
+This module imports: click, cli, universities_crud.
+"""
+import click
+from commands import cli
+from service import universities_crud
+
+
+@cli.cli.command('rebuild-aggregates')
+def rebuild_aggregates() -> None:
+    """
+    Count sum of salaries, number of teachers and average salary of every university
+    from scratch.
+    :return: None
+    """
+    count = universities_crud.rebuild_salary_aggregates()
+    click.echo(f'Salary aggregates of {count} universities were rebuilt.')
@@ -0,0 +1,52 @@
+"""
+This module contains commands that create database and fill it with example data.
+
+Application doesn't touch database when it starts, so database is created once
+with "flask create-db" and example data is added with "flask seed".
+
+This module contains functions: create_db(), seed().
+
+This module imports: click, flask.current_app, flask_migrate.stamp, sqlalchemy_utils,
+app.db, cli, University, populate_database.
+"""
+import click
+from flask import current_app
+from flask_migrate import stamp
+from sqlalchemy_utils import create_database
+from sqlalchemy_utils import database_exists
+from app import db
+from commands import cli
+from models.university import University
+
+
+@cli.cli.command('create-db')
+def create_db() -> None:
+    """
+    Create database if it doesn't exist and create tables that don't exist.
+    New database is marked with the last migration, because its tables are made
+    from models, so "flask db upgrade" applies only migrations that are added later.
+    :return: None
+    """
+    url = current_app.config['SQLALCHEMY_DATABASE_URI']
+    if database_exists(url):
+        db.create_all(bind=None)
+        click.echo('Tables were created.')
+        return
+    create_database(url)
+    db.create_all(bind=None)
+    stamp()
+    click.echo('Database was created with tables of the last migration.')
+
+
+@cli.cli.command('seed')
+def seed() -> None:
+    """
+    Fill empty database with example universities and teachers.
+    :return: None
+    """
+    from database.populate_db import populate_database
+
+    if University.query.first() is not None:
+        raise click.ClickException('Database is not empty, example data was not added.')
+    populate_database()
+    click.echo('Example data was added.')
@@ -0,0 +1,138 @@
+"""
+This module contains command that generates big random dataset for load tests and benchmarks.
+
+Data is generated with seeded random generator, so the same seed on empty database
+always gives the same universities and teachers. Teachers are generated and inserted
+chunk by chunk, so millions of rows don't have to fit in memory.
+
+This module contains functions: generate_universities(), generate_teachers(), generate_data().
+
+This module imports: datetime, math, random, time, typing.Iterator, click, sqlalchemy.func,
+app.db, cli, University, teachers_crud, universities_crud.
+"""
+import datetime
+import math
+import random
+import time
+from typing import Iterator
+import click
+from sqlalchemy import func
+from app import db
+from commands import cli
+from models.university import University
+from service import teachers_crud
+from service import universities_crud
+
+FIRST_NAMES = ('Andriy', 'Irina', 'Vitaliy', 'Oleg', 'Genadiy', 'Alexander', 'Sergey',
+               'Svitlana', 'Anton', 'Olena', 'Mykola', 'Tetiana', 'Dmytro', 'Natalia',
+               'Yuriy', 'Oksana', 'Volodymyr', 'Kateryna', 'Bohdan', 'Iryna', 'Taras',
+               'Larysa', 'Pavlo', 'Halyna', 'Viktor', 'Maria', 'Roman', 'Yulia',
+               'Ihor', 'Lesia')
+LAST_NAMES = ('Kovalenko', 'Perova', 'Puchkov', 'Strochak', 'Gorin', 'Hryapkin', 'Chaynikov',
+              'Ponomarova', 'Ostapenko', 'Shevchenko', 'Bondarenko', 'Tkachenko', 'Kravchenko',
+              'Oliynyk', 'Lysenko', 'Rudenko', 'Savchenko', 'Petrenko', 'Marchenko', 'Moroz',
+              'Melnyk', 'Boyko', 'Kovalchuk', 'Shevchuk', 'Polishchuk', 'Tkachuk', 'Kushnir',
+              'Pavlenko', 'Zinchenko', 'Kuzmenko', 'Honcharenko', 'Klymenko', 'Vasylenko',
+              'Ivanenko', 'Romanenko', 'Symonenko', 'Levchenko', 'Karpenko', 'Fedorenko',
+              'Hnatyuk')
+CITIES = ('Kharkiv', 'Kyiv', 'Lviv', 'Odesa', 'Dnipro', 'Poltava', 'Sumy', 'Chernihiv',
+          'Vinnytsia', 'Zhytomyr', 'Uzhhorod', 'Ternopil')
+KINDS = ('Tech', 'Medical', 'Pedagogical', 'Economic', 'Agrarian', 'National', 'Polytechnic',
+         'Law', 'Art', 'Aviation')
+STREETS = ('Nauchna', 'Kirpichova', 'Independence Avenue', 'Chkalova', 'Sumska', 'Pushkinska',
+           'Shevchenka', 'Franka', 'Svobody', 'Universytetska')
+# Ages are counted from fixed date, so generated data doesn't depend on current day.
+REFERENCE_DATE = datetime.date(2021, 12, 1)
+
+
+def generate_universities(count: int, rng: random.Random, first_number: int = 1) -> list:
+    """
+    Generate universities with unique names. Return list of dicts with keys name,
+    location, average_salary, salary_sum, teacher_count.
+    :param count: How many universities to generate.
+    :param rng: Seeded random generator.
+    :param first_number: Number of first university, it makes names unique among
+    universities that were generated before.
+    :return: list
+    """
+    return [{'name': f'{rng.choice(CITIES)}{rng.choice(KINDS)}{number}',
+             'location': f'{rng.choice(STREETS)} {rng.randint(1, 200)}',
+             'average_salary': 0, 'salary_sum': 0, 'teacher_count': 0}
+            for number in range(first_number, first_number + count)]
+
+
+def generate_teachers(count: int, university_ids: list, rng: random.Random,
+                      chunk_size: int) -> Iterator[list]:
+    """
+    Generate teachers chunk by chunk. Age of teachers is normally distributed around 45,
+    salary is log-normally distributed and grows with age, some universities are much
+    bigger than others. Yield lists of dicts with keys name, last_name, birth_date,
+    salary, university_id.
+    :param count: How many teachers to generate.
+    :param university_ids: Ids of universities where teachers work.
+    :param rng: Seeded random generator.
+    :param chunk_size: How many teachers are in one chunk.
+    :return: Iterator[list]
+    """
+    cum_weights = []
+    total = 0
+    for _ in university_ids:
+        total += rng.paretovariate(1.2)
+        cum_weights.append(total)
+    base_salary = math.log(1400)
+    while count > 0:
+        size = min(chunk_size, count)
+        chunk = []
+        for university_id in rng.choices(university_ids, cum_weights=cum_weights, k=size):
+            age = min(max(rng.gauss(45, 11), 23), 75)
+            birth_date = REFERENCE_DATE - datetime.timedelta(days=int(age * 365.25))
+            salary = rng.lognormvariate(base_salary, 0.35) * (1 + (age - 45) * 0.01)
+            chunk.append({'name': rng.choice(FIRST_NAMES), 'last_name': rng.choice(LAST_NAMES),
+                          'birth_date': birth_date,
+                          'salary': min(max(int(salary) // 10 * 10, 500), 10000),
+                          'university_id': university_id})
+        count -= size
+        yield chunk
+
+
+@cli.cli.command('generate-data')
+@click.option('--universities', type=click.IntRange(min=1), default=100, show_default=True,
+              help='How many universities to generate.')
+@click.option('--teachers', type=click.IntRange(min=0), default=100000, show_default=True,
+              help='How many teachers to generate.')
+@click.option('--seed', type=int, default=0, show_default=True,
+              help='Seed of random generator.')
+@click.option('--chunk-size', type=click.IntRange(min=1), default=10000, show_default=True,
+              help='How many teachers are inserted in one transaction.')
+def generate_data(universities: int, teachers: int, seed: int, chunk_size: int) -> None:
+    """
+    Generate random universities and teachers and insert them to database.
+    :param universities: How many universities to generate.
+    :param teachers: How many teachers to generate.
+    :param seed: Seed of random generator.
+    :param chunk_size: How many teachers are inserted in one transaction.
+    :return: None
+    """
+    rng = random.Random(seed)
+    start = time.perf_counter()
+    # Numbers of generated names are never greater than ids of their universities, so names
+    # numbered after the greatest id are new even if some universities were deleted.
+    first_number = (db.session.query(func.max(University.id)).scalar() or 0) + 1
+    rows = generate_universities(universities, rng, first_number)
+    db.session.execute(University.__table__.insert(), rows)
+    db.session.commit()
+    university_ids = sorted(university.id for university in
+                            universities_crud.get_universities_by_names(
+                                row['name'] for row in rows).values())
+    click.echo(f'{len(university_ids)} universities generated.')
+    generated = 0
+    for chunk in generate_teachers(teachers, university_ids, rng, chunk_size):
+        teachers_crud.insert_teacher_rows(chunk, update_aggregates=False)
+        db.session.commit()
+        generated += len(chunk)
+        elapsed = time.perf_counter() - start
+        click.echo(f'{generated} teachers generated, {generated / elapsed:.0f} rows/s')
+    universities_crud.rebuild_salary_aggregates()
+    elapsed = time.perf_counter() - start
+    click.echo(f'Generated {len(university_ids)} universities and {generated} teachers '
+               f'in {elapsed:.1f} s.')
@@ -0,0 +1,108 @@
+"""
+This module contains command that imports teachers from big files.
+
+File is read line by line and teachers are inserted in chunks with one executemany
+statement and one transaction per chunk, so file of any size can be imported.
+
+This module contains functions: read_teacher_file(), insert_chunk(), import_teachers().
+
+This module imports: csv, json, time, typing.Iterator, click, app.db, cli, University,
+teachers_crud, validate_teacher.
+"""
+import csv
+import json
+import time
+from typing import Iterator
+import click
+from app import db
+from commands import cli
+from models.university import University
+from service import teachers_crud
+from service.validation import validate_teacher
+
+
+def read_teacher_file(path: str) -> Iterator[tuple]:
+    """
+    Read teachers one by one from CSV file with header or from JSON lines file.
+    Yield tuples (line number, dict with data of teacher or None if line is not valid JSON).
+    Salary from CSV file is converted to int.
+    :param path: Path to file with extension .csv, .jsonl or .ndjson.
+    :return: Iterator[tuple]
+    """
+    with open(path, newline='', encoding='utf-8') as file:
+        if path.endswith('.csv'):
+            reader = csv.DictReader(file)
+            for row in reader:
+                salary = row.get('salary')
+                if salary and salary.isdigit():
+                    row['salary'] = int(salary)
+                yield reader.line_num, row
+            return
+        for line_number, line in enumerate(file, start=1):
+            if not line.strip():
+                continue
+            try:
+                yield line_number, json.loads(line)
+            except ValueError:
+                yield line_number, None
+
+
+def insert_chunk(chunk: list, imported: int, start: float) -> int:
+    """
+    Insert chunk of teachers in one transaction and show speed of import.
+    Return number of imported teachers with this chunk.
+    :param chunk: Dicts with keys name, last_name, birth_date, salary, university_id.
+    :param imported: Number of teachers imported before this chunk.
+    :param start: Time when import was started.
+    :return: int
+    """
+    try:
+        teachers_crud.insert_teacher_rows(chunk)
+        db.session.commit()
+    except Exception as ex:
+        db.session.rollback()
+        raise click.ClickException(f'Import was stopped after {imported} teachers: {ex}')
+    imported += len(chunk)
+    elapsed = time.perf_counter() - start
+    click.echo(f'{imported} teachers imported, {imported / elapsed:.0f} rows/s')
+    return imported
+
+
+@cli.cli.command('import-teachers')
+@click.argument('path', type=click.Path(exists=True, dir_okay=False))
+@click.option('--chunk-size', type=click.IntRange(min=1), default=10000, show_default=True,
+              help='How many teachers are inserted in one transaction.')
+def import_teachers(path: str, chunk_size: int) -> None:
+    """
+    Import teachers from CSV or JSON lines file with fields name, last_name, birth_date,
+    salary and university. Wrong lines are skipped and shown.
+    :param path: Path to file.
+    :param chunk_size: How many teachers are inserted in one transaction.
+    :return: None
+    """
+    universities = {university.name: university for university in University.query.all()}
+    imported = 0
+    skipped = 0
+    chunk = []
+    start = time.perf_counter()
+    for line_number, data in read_teacher_file(path):
+        if isinstance(data, dict):
+            res = validate_teacher(data, universities.get)
+        else:
+            res = {'error': {'message': 'Line is not JSON object.', 'status': 400}}
+        if isinstance(res, dict):
+            skipped += 1
+            click.echo(f'Line {line_number} was skipped: {res["error"]["message"]}', err=True)
+            continue
+        name, last_name, birth_date, salary, university_db = res
+        chunk.append({'name': name, 'last_name': last_name, 'birth_date': birth_date.date(),
+                      'salary': salary, 'university_id': university_db.id})
+        if len(chunk) == chunk_size:
+            imported = insert_chunk(chunk, imported, start)
+            chunk = []
+    if chunk:
+        imported = insert_chunk(chunk, imported, start)
+    elapsed = time.perf_counter() - start
+    rate = imported / elapsed if elapsed else 0
+    click.echo(f'Imported {imported} teachers, skipped {skipped} in {elapsed:.1f} s '
+               f'({rate:.0f} rows/s).')
@@ -0,0 +1,64 @@
+"""
+This module contains command that checks that database uses indexes for hot queries.
+
+Queries are the same as in search by date, in lookups of teachers of university and
+in lookups of university by name. Their plans are read with EXPLAIN on MySQL and with
+EXPLAIN QUERY PLAN on SQLite.
+
+This module contains functions: explain_index_usage(), check_indexes().
+
+This module imports: click, sqlalchemy.text, app.db, cli.
+"""
+import click
+from sqlalchemy import text
+from app import db
+from commands import cli
+
+INDEXED_QUERIES = (
+    ('search_by_date', 'ix_teacher_birth_date',
+     'SELECT * FROM teacher WHERE birth_date BETWEEN :date_from AND :date_to',
+     {'date_from': '1980-01-01', 'date_to': '1980-12-31'}),
+    ('teachers_of_university', 'ix_teacher_university_id',
+     'SELECT * FROM teacher WHERE university_id = :university_id',
+     {'university_id': 1}),
+    ('university_by_name', 'ix_university_name',
+     'SELECT * FROM university WHERE name = :name',
+     {'name': 'NURE'}),
+)
+
+
+def explain_index_usage(connection) -> list:
+    """
+    Read plans of hot queries. Return list of tuples (query name, expected index,
+    expected index if plan uses it or None, plan as text).
+    :param connection: SQLAlchemy connection to MySQL or SQLite database.
+    :return: list
+    """
+    results = []
+    for name, expected_index, query, params in INDEXED_QUERIES:
+        if connection.dialect.name == 'mysql':
+            rows = connection.execute(text(f'EXPLAIN {query}'), params).mappings().all()
+            plan = '; '.join(f"{row['table']}: type={row['type']} key={row['key']}"
+                             for row in rows)
+            used_index = expected_index if rows and rows[0]['key'] == expected_index else None
+        else:
+            rows = connection.execute(text(f'EXPLAIN QUERY PLAN {query}'), params).all()
+            plan = '; '.join(row[-1] for row in rows)
+            used_index = expected_index if expected_index in plan else None
+        results.append((name, expected_index, used_index, plan))
+    return results
+
+
+@cli.cli.command('check-indexes')
+def check_indexes() -> None:
+    """
+    Show plans of hot queries and fail if database doesn't use index for any of them.
+    :return: None
+    """
+    results = explain_index_usage(db.session.connection())
+    for name, expected_index, used_index, plan in results:
+        status = 'OK' if used_index else 'NO INDEX'
+        click.echo(f'{status:8} {name}: expected {expected_index}, used {used_index}\n'
+                   f'         {plan}')
+    if not all(used_index for _, _, used_index, _ in results):
+        raise click.ClickException('Some queries don\'t use indexes, run "flask db upgrade".')
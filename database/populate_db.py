@@ -3,6 +3,8 @@ import datetime
 from app import db
 from models.teacher import Teacher
 from models.university import University
+from service import table_versions
+from service import universities_crud
 
 university1 = University('NURE', 'Nauchna 14')
 university2 = University('KPI', 'Kirpichova 17')
@@ -26,4 +28,6 @@ def populate_database():
     db.session.commit()
     db.session.add_all([teacher1, teacher2, teacher3, teacher4,
                         teacher5, teacher6, teacher7, teacher8, teacher9, teacher10])
+    table_versions.bump_versions(table_versions.TEACHER)
     db.session.commit()
+    universities_crud.rebuild_salary_aggregates()
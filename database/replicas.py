@@ -0,0 +1,226 @@
+"""
+This module sends reads to read replicas of the database.
+
+Replicas are binds "replica_0", "replica_1", ... made from DATABASE_REPLICA_URLS.
+RoutingSession sends statements of GET requests (and of routes marked with
+replica_read()) to replicas in round-robin order, one replica for the whole request.
+Replica isn't checked before it is used: if its connection fails when statement runs,
+primary database is used instead and replica is skipped for DATABASE_REPLICA_RETRY
+seconds, after that it is connected once before it gets requests again. If no replica
+works, primary database is used. Everything else goes to primary: writes,
+commands, statements after flush. After request writes, client gets cookie that sends
+its requests to primary for DATABASE_REPLICA_PIN seconds, so it reads its own writes
+while replicas catch up.
+
+This module includes classes ReplicaRouter, RoutingSession, RoutingSQLAlchemy and
+functions: replica_bind_names(), replica_read(), is_read_request(), init_app(),
+read_pin_cookie(), write_pin_cookie().
+
+This module imports: itertools, threading, time, typing.Callable, flask.Flask,
+flask.current_app, flask.g, flask.has_request_context, flask.request, flask_sqlalchemy,
+sqlalchemy.exc, sqlalchemy.orm.
+"""
+import itertools
+import threading
+import time
+from typing import Callable
+from flask import Flask
+from flask import current_app
+from flask import g
+from flask import has_request_context
+from flask import request
+from flask_sqlalchemy import SignallingSession
+from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import exc
+from sqlalchemy import orm
+
+PIN_COOKIE = 'db_primary_until'
+
+
+def replica_bind_names(urls: list) -> dict:
+    """
+    Return binds of replicas for SQLALCHEMY_BINDS.
+    :param urls: Urls of replicas.
+    :return: dict
+    """
+    return {f'replica_{number}': url for number, url in enumerate(urls)}
+
+
+def replica_read(view: Callable) -> Callable:
+    """
+    Mark route that only reads but isn't GET (for example search with POST form),
+    so it reads from replica too.
+    :param view: Function of route.
+    :return: Callable
+    """
+    view.replica_read = True
+    return view
+
+
+class ReplicaRouter:
+    """
+    Chooses replica in round-robin order and remembers replicas that don't work.
+    """
+
+    def __init__(self, names: list, retry: float, pin: float):
+        """
+        :param names: Names of binds of replicas.
+        :param retry: Seconds when replica that failed is not used.
+        :param pin: Seconds when client is sent to primary after it wrote.
+        """
+        self.names = names
+        self.retry = retry
+        self.pin = pin
+        self._order = itertools.cycle(names)
+        self._lock = threading.Lock()
+        self._down_until = {}
+
+    def choose(self, db: SQLAlchemy, app: Flask):
+        """
+        Return name of the next replica that is not marked down or None if there is
+        no such replica. Only replica that was marked down and whose retry time is over
+        is connected here, others are used without check.
+        :param db: SQLAlchemy extension.
+        :param app: Flask application.
+        :return: str or None
+        """
+        for _ in self.names:
+            with self._lock:
+                name = next(self._order)
+                down_until = self._down_until.get(name)
+            if down_until is None:
+                return name
+            if down_until > time.monotonic():
+                continue
+            try:
+                db.get_engine(app, bind=name).connect().close()
+            except Exception as ex:
+                self.mark_down(name, ex)
+                continue
+            with self._lock:
+                self._down_until.pop(name, None)
+            return name
+        return None
+
+    def mark_down(self, name: str, error: Exception) -> None:
+        """
+        Skip replica for retry seconds.
+        :param name: Name of bind of replica.
+        :param error: Error of connection.
+        :return: None
+        """
+        current_app.logger.warning('Replica %s is not available: %s', name, error)
+        with self._lock:
+            self._down_until[name] = time.monotonic() + self.retry
+
+
+class RoutingSession(SignallingSession):
+    """
+    Session that reads from replicas in requests that only read.
+    """
+
+    def __init__(self, db, **options):
+        self.db = db
+        super().__init__(db, **options)
+
+    def get_bind(self, mapper=None, clause=None, **kwargs):
+        """
+        Return engine of replica for statement of request that reads and engine
+        of primary database for everything else.
+        :param mapper: Mapper of model.
+        :param clause: Statement.
+        :return: Engine
+        """
+        primary = super().get_bind(mapper, clause)
+        if not has_request_context() or self.app.extensions.get('replicas') is None:
+            return primary
+        if self._flushing or getattr(clause, 'is_dml', False):
+            g.db_wrote = True
+            return primary
+        if g.get('db_wrote') or g.get('db_pinned') or not is_read_request():
+            return primary
+        if 'db_replica' not in g:
+            g.db_replica = self.app.extensions['replicas'].choose(self.db, self.app)
+        if g.db_replica is None:
+            return primary
+        return self.db.get_engine(self.app, bind=g.db_replica)
+
+    def _connection_for_bind(self, engine, execution_options=None, **kw):
+        """
+        Connect to engine. If replica of request can't be connected, it is marked down
+        and request reads from primary database.
+        :param engine: Engine from get_bind().
+        :param execution_options: Options of connection.
+        :return: Connection
+        """
+        try:
+            return super()._connection_for_bind(engine, execution_options, **kw)
+        except (exc.DBAPIError, exc.TimeoutError) as ex:
+            name = g.get('db_replica') if has_request_context() else None
+            if name is None or engine is not self.db.get_engine(self.app, bind=name):
+                raise
+            self.app.extensions['replicas'].mark_down(name, ex)
+            g.db_replica = None
+            return super()._connection_for_bind(super().get_bind(), execution_options, **kw)
+
+
+class RoutingSQLAlchemy(SQLAlchemy):
+    """
+    SQLAlchemy extension with RoutingSession.
+    """
+
+    def create_session(self, options):
+        return orm.sessionmaker(class_=RoutingSession, db=self, **options)
+
+
+def is_read_request() -> bool:
+    """
+    Return True if current request only reads: it is GET or HEAD or its route
+    is marked with replica_read().
+    :return: bool
+    """
+    if request.method in ('GET', 'HEAD'):
+        return True
+    view = current_app.view_functions.get(request.endpoint)
+    return getattr(view, 'replica_read', False)
+
+
+def init_app(app: Flask) -> None:
+    """
+    Turn on reading from replicas if application has binds of replicas.
+    :param app: Flask application.
+    :return: None
+    """
+    names = [name for name in app.config.get('SQLALCHEMY_BINDS') or {}
+             if name.startswith('replica_')]
+    if not names:
+        app.extensions['replicas'] = None
+        return
+    app.extensions['replicas'] = ReplicaRouter(names, app.config['DATABASE_REPLICA_RETRY'],
+                                               app.config['DATABASE_REPLICA_PIN'])
+    app.before_request(read_pin_cookie)
+    app.after_request(write_pin_cookie)
+
+
+def read_pin_cookie() -> None:
+    """
+    Send request to primary if client wrote recently.
+    :return: None
+    """
+    try:
+        g.db_pinned = float(request.cookies.get(PIN_COOKIE, 0)) > time.time()
+    except ValueError:
+        g.db_pinned = False
+
+
+def write_pin_cookie(response):
+    """
+    Set cookie that sends next requests of client to primary if request wrote.
+    :param response: Response of request.
+    :return: Response
+    """
+    if g.get('db_wrote'):
+        pin = current_app.extensions['replicas'].pin
+        response.set_cookie(PIN_COOKIE, str(time.time() + pin), max_age=int(pin) + 1,
+                            httponly=True)
+    return response
@@ -0,0 +1,5 @@
+"""
+Module is made for logging and measuring work of the application.
+
+Module contains: log_queue, query_counter, metrics, pool_stats
+"""
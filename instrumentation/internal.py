@@ -0,0 +1,50 @@
+"""
+This module keeps internal routes of the application away from public clients.
+
+Routes /metrics and /internal/pool show internals of workers, so they answer only
+clients whose address is in INTERNAL_ALLOWED_NETWORKS (localhost by default), others
+get 404 Not Found as if routes didn't exist. Address is taken from REMOTE_ADDR, so
+behind proxy that is on the same host they must be blocked by proxy itself.
+
+This module includes functions: allowed_networks(), internal_only().
+
+This module imports: functools, ipaddress, typing.Callable, flask.abort,
+flask.current_app, flask.request.
+"""
+import functools
+import ipaddress
+from typing import Callable
+from flask import abort
+from flask import current_app
+from flask import request
+
+
+def allowed_networks(value: str) -> list:
+    """
+    Return networks from comma separated addresses and networks, for example
+    "127.0.0.1,10.0.0.0/8". Raise ValueError if some of them is wrong.
+    :param value: Addresses and networks separated by comma.
+    :return: list
+    """
+    return [ipaddress.ip_network(network.strip())
+            for network in value.split(',') if network.strip()]
+
+
+def internal_only(view: Callable) -> Callable:
+    """
+    Decorator of route that answers 404 to client whose address isn't in
+    INTERNAL_ALLOWED_NETWORKS.
+    :param view: Function of route.
+    :return: Callable
+    """
+    @functools.wraps(view)
+    def wrapper(*args, **kwargs):
+        try:
+            address = ipaddress.ip_address(request.remote_addr or '')
+        except ValueError:
+            abort(404)
+        if not any(address in network
+                   for network in current_app.config['INTERNAL_ALLOWED_NETWORKS']):
+            abort(404)
+        return view(*args, **kwargs)
+    return wrapper
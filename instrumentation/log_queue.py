@@ -0,0 +1,118 @@
+"""
+This module sets up logging of the application without blocking requests.
+
+Logger of the application has only QueueHandler, which puts records to queue.
+QueueListener writes them from background thread to console and to file that is rotated
+by size (or by time if LOG_ROTATE_WHEN is set), old files are compressed with gzip.
+Level of logger is taken from LOG_LEVEL, so in production DEBUG messages are not even
+formatted. By default it is DEBUG when FLASK_ENV is development and INFO otherwise.
+
+Environment variables: LOG_LEVEL, LOG_FILE, LOG_MAX_BYTES, LOG_BACKUP_COUNT,
+LOG_ROTATE_WHEN.
+
+This module includes functions: get_level(), gzip_namer(), gzip_rotator(), file_handler(),
+setup_logging().
+
+This module imports: atexit, gzip, logging, os, queue, shutil, logging.handlers.
+"""
+import atexit
+import gzip
+import logging
+import os
+import queue
+import shutil
+from logging.handlers import QueueHandler
+from logging.handlers import QueueListener
+from logging.handlers import RotatingFileHandler
+from logging.handlers import TimedRotatingFileHandler
+
+FORMAT = '%(asctime)s:%(name)s:%(message)s'
+
+
+def get_level() -> int:
+    """
+    Return level of logging from environment variable LOG_LEVEL or default level
+    for environment from FLASK_ENV. Raise ValueError if LOG_LEVEL is not name of level.
+    :return: int
+    """
+    default = 'DEBUG' if os.environ.get('FLASK_ENV') == 'development' else 'INFO'
+    name = os.environ.get('LOG_LEVEL', default).upper()
+    # getLevelName() returns string "Level NAME" for unknown names.
+    level = logging.getLevelName(name)
+    if not isinstance(level, int):
+        raise ValueError(f'LOG_LEVEL must be one of DEBUG, INFO, WARNING, ERROR, CRITICAL, '
+                         f'not {name!r}.')
+    return level
+
+
+def gzip_namer(name: str) -> str:
+    """
+    Return name of rotated file with extension ".gz".
+    :param name: Name of rotated file.
+    :return: str
+    """
+    return name + '.gz'
+
+
+def gzip_rotator(source: str, dest: str) -> None:
+    """
+    Compress full log file to rotated file and remove it.
+    :param source: Name of full log file.
+    :param dest: Name of rotated file.
+    :return: None
+    """
+    with open(source, 'rb') as source_file, gzip.open(dest, 'wb') as dest_file:
+        shutil.copyfileobj(source_file, dest_file)
+    os.remove(source)
+
+
+def file_handler(path: str) -> logging.Handler:
+    """
+    Return handler that writes to file and rotates it by time if LOG_ROTATE_WHEN is set
+    (for example "midnight") or by size of LOG_MAX_BYTES otherwise.
+    :param path: Path to log file.
+    :return: logging.Handler
+    """
+    backup_count = int(os.environ.get('LOG_BACKUP_COUNT', 5))
+    when = os.environ.get('LOG_ROTATE_WHEN')
+    if when:
+        handler = TimedRotatingFileHandler(path, when=when, backupCount=backup_count,
+                                           delay=True)
+    else:
+        handler = RotatingFileHandler(path, maxBytes=int(os.environ.get('LOG_MAX_BYTES',
+                                                                        10 * 1024 * 1024)),
+                                      backupCount=backup_count, delay=True)
+    handler.namer = gzip_namer
+    handler.rotator = gzip_rotator
+    return handler
+
+
+def setup_logging(logger: logging.Logger) -> QueueListener:
+    """
+    Send records of logger through queue to file and console handlers in background thread.
+    Listener is stopped at exit, so every record is written. After fork (for example
+    in gunicorn worker) queue and thread of listener are created again, because
+    thread of parent process doesn't exist in child process.
+    :param logger: Logger of the application.
+    :return: QueueListener
+    """
+    formatter = logging.Formatter(FORMAT)
+    handlers = [file_handler(os.environ.get('LOG_FILE', 'logging.txt')),
+                logging.StreamHandler()]
+    for handler in handlers:
+        handler.setFormatter(formatter)
+    records = queue.SimpleQueue()
+    queue_handler = QueueHandler(records)
+    listener = QueueListener(records, *handlers, respect_handler_level=True)
+    logger.setLevel(get_level())
+    logger.addHandler(queue_handler)
+    listener.start()
+    atexit.register(listener.stop)
+
+    def restart_listener():
+        queue_handler.queue = listener.queue = queue.SimpleQueue()
+        listener.start()
+
+    if hasattr(os, 'register_at_fork'):
+        os.register_at_fork(after_in_child=restart_listener)
+    return listener
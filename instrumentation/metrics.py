@@ -0,0 +1,143 @@
+"""
+This module exposes metrics of the application in Prometheus format on route /metrics.
+
+Number of requests, latency histogram and number of requests in progress are labeled
+by endpoint (for example "api.index" or "get_all_teachers"), method and status code.
+Gauges of SQLAlchemy connection pool show connections of every engine.
+Reads of caches from service.cache are counted by cache and result (hit or miss).
+
+When environment variable PROMETHEUS_MULTIPROC_DIR is set, every gunicorn worker writes
+its metrics to files in this directory and /metrics sums metrics of all workers, so it
+doesn't matter which worker answers. The directory is prepared in gunicorn.py.ini.
+
+This module includes functions: init_app(), request_labels(), start_request(),
+remember_status(), finish_request(), update_pool_gauges(), metrics().
+
+This module imports: os, time, flask.Flask, flask.Response, flask.current_app, flask.g,
+flask.request, prometheus_client, prometheus_client.multiprocess, sqlalchemy.pool.QueuePool,
+app.db, internal_only.
+"""
+import os
+import time
+from flask import Flask
+from flask import Response
+from flask import current_app
+from flask import g
+from flask import request
+from prometheus_client import CONTENT_TYPE_LATEST
+from prometheus_client import REGISTRY
+from prometheus_client import CollectorRegistry
+from prometheus_client import Counter
+from prometheus_client import Gauge
+from prometheus_client import Histogram
+from prometheus_client import generate_latest
+from prometheus_client import multiprocess
+from sqlalchemy.pool import QueuePool
+from app import db
+from instrumentation.internal import internal_only
+
+REQUEST_COUNT = Counter('http_requests_total', 'Number of HTTP requests.',
+                        ['method', 'endpoint', 'status'])
+REQUEST_LATENCY = Histogram('http_request_duration_seconds', 'Latency of HTTP requests.',
+                            ['method', 'endpoint', 'status'],
+                            buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10))
+REQUESTS_IN_PROGRESS = Gauge('http_requests_in_progress',
+                             'Number of HTTP requests in progress.',
+                             ['method', 'endpoint'], multiprocess_mode='livesum')
+POOL_CONNECTIONS = Gauge('db_pool_connections', 'Connections of SQLAlchemy pool by state.',
+                         ['bind', 'state'], multiprocess_mode='livesum')
+POOL_SIZE = Gauge('db_pool_size', 'Size of SQLAlchemy pool.', ['bind'],
+                  multiprocess_mode='livesum')
+CACHE_REQUESTS = Counter('cache_requests_total', 'Reads of in-process caches.',
+                         ['cache', 'result'])
+
+
+def init_app(app: Flask) -> None:
+    """
+    Start measuring requests of application and add route /metrics, which answers only
+    clients from INTERNAL_ALLOWED_NETWORKS.
+    :param app: Flask application.
+    :return: None
+    """
+    app.before_request(start_request)
+    app.after_request(remember_status)
+    app.teardown_request(finish_request)
+    app.add_url_rule('/metrics', 'metrics', internal_only(metrics))
+
+
+def request_labels() -> tuple:
+    """
+    Return method and endpoint of current request. Requests to unknown urls have
+    endpoint "unknown", so every wrong url doesn't make new metric.
+    :return: tuple
+    """
+    return request.method, request.endpoint or 'unknown'
+
+
+def start_request() -> None:
+    """
+    Remember start time of request and count it as request in progress.
+    :return: None
+    """
+    g.metrics_start = time.perf_counter()
+    REQUESTS_IN_PROGRESS.labels(*request_labels()).inc()
+
+
+def remember_status(response):
+    """
+    Remember status code of response for finish_request().
+    :param response: Response of request.
+    :return: Response
+    """
+    g.metrics_status = response.status_code
+    return response
+
+
+def finish_request(_) -> None:
+    """
+    Count finished request and its latency. It is called even if request failed
+    with exception, then status code is 500. Latency of streamed response includes
+    streaming of the body.
+    :return: None
+    """
+    if 'metrics_start' not in g:
+        return
+    method, endpoint = request_labels()
+    status = str(g.get('metrics_status', 500))
+    REQUESTS_IN_PROGRESS.labels(method, endpoint).dec()
+    REQUEST_COUNT.labels(method, endpoint, status).inc()
+    elapsed = time.perf_counter() - g.metrics_start
+    REQUEST_LATENCY.labels(method, endpoint, status).observe(elapsed)
+    update_pool_gauges()
+
+
+def update_pool_gauges() -> None:
+    """
+    Set gauges of connection pools of default engine and engines of binds.
+    Engines without pool of fixed size (for example SQLite) are skipped.
+    :return: None
+    """
+    binds = [None] + list(current_app.config.get('SQLALCHEMY_BINDS') or {})
+    for bind in binds:
+        pool = db.get_engine(current_app, bind).pool
+        if not isinstance(pool, QueuePool):
+            continue
+        name = bind or 'default'
+        POOL_SIZE.labels(name).set(pool.size())
+        POOL_CONNECTIONS.labels(name, 'checked_out').set(pool.checkedout())
+        POOL_CONNECTIONS.labels(name, 'checked_in').set(pool.checkedin())
+        POOL_CONNECTIONS.labels(name, 'overflow').set(max(pool.overflow(), 0))
+
+
+def metrics() -> Response:
+    """
+    Route returns metrics of every worker in Prometheus text format.
+    :return: Response
+    """
+    update_pool_gauges()
+    if 'PROMETHEUS_MULTIPROC_DIR' in os.environ:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return Response(generate_latest(registry), content_type=CONTENT_TYPE_LATEST)
@@ -0,0 +1,110 @@
+"""
+This module measures how long requests wait for connections of SQLAlchemy pool.
+
+TimedQueuePool is QueuePool that counts checkouts, time of getting connection (waiting
+for free connection or opening new one) and checkouts that failed with timeout.
+Route /internal/pool shows these numbers together with size, checked out connections
+and overflow of every engine, so pools can be sized from data. Every gunicorn worker has
+its own pools, so numbers are numbers of the worker that answered (its pid is shown).
+Numbers are reset when pool is recreated by engine.dispose().
+
+This module includes class TimedQueuePool and functions: init_app(), describe_pool(),
+pool_statistics().
+
+This module imports: os, threading, time, flask.Flask, flask.current_app, flask.jsonify,
+sqlalchemy.exc.TimeoutError, sqlalchemy.pool.QueuePool, internal_only.
+"""
+import os
+import threading
+import time
+from flask import Flask
+from flask import current_app
+from flask import jsonify
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import QueuePool
+from instrumentation.internal import internal_only
+
+
+class TimedQueuePool(QueuePool):
+    """
+    QueuePool that measures time of getting connections.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._stats_lock = threading.Lock()
+        self._getting = threading.local()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_time_total = 0.0
+        self.wait_time_max = 0.0
+
+    def _do_get(self):
+        # QueuePool._do_get() calls itself again, only the first call is measured.
+        if getattr(self._getting, 'active', False):
+            return super()._do_get()
+        self._getting.active = True
+        start = time.perf_counter()
+        timed_out = False
+        try:
+            return super()._do_get()
+        except PoolTimeoutError:
+            timed_out = True
+            raise
+        finally:
+            self._getting.active = False
+            elapsed = time.perf_counter() - start
+            with self._stats_lock:
+                self.checkouts += 1
+                self.timeouts += timed_out
+                self.wait_time_total += elapsed
+                self.wait_time_max = max(self.wait_time_max, elapsed)
+
+
+def init_app(app: Flask) -> None:
+    """
+    Add route /internal/pool to application, it answers only clients from
+    INTERNAL_ALLOWED_NETWORKS.
+    :param app: Flask application.
+    :return: None
+    """
+    app.add_url_rule('/internal/pool', 'pool_statistics', internal_only(pool_statistics))
+
+
+def describe_pool(pool) -> dict:
+    """
+    Return state of pool and statistics of waiting if pool is TimedQueuePool.
+    :param pool: Pool of engine.
+    :return: dict
+    """
+    description = {'pool': type(pool).__name__}
+    if not isinstance(pool, QueuePool):
+        return description
+    description.update({'size': pool.size(),
+                        'checked_out': pool.checkedout(),
+                        'checked_in': pool.checkedin(),
+                        'overflow': max(pool.overflow(), 0),
+                        'max_overflow': pool._max_overflow,
+                        'timeout': pool.timeout()})
+    if isinstance(pool, TimedQueuePool):
+        with pool._stats_lock:
+            checkouts = pool.checkouts
+            description.update({
+                'checkouts': checkouts,
+                'timeouts': pool.timeouts,
+                'wait_time_avg_ms': round(pool.wait_time_total / checkouts * 1000, 3)
+                if checkouts else 0,
+                'wait_time_max_ms': round(pool.wait_time_max * 1000, 3)})
+    return description
+
+
+def pool_statistics():
+    """
+    Route shows pools of default engine and engines of binds of this worker.
+    :return: Response
+    """
+    db = current_app.extensions['sqlalchemy'].db
+    binds = [None] + list(current_app.config.get('SQLALCHEMY_BINDS') or {})
+    pools = {bind or 'default': describe_pool(db.get_engine(current_app, bind).pool)
+             for bind in binds}
+    return jsonify({'pid': os.getpid(), 'pools': pools})
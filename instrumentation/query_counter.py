@@ -0,0 +1,121 @@
+"""
+This module counts SQL statements and time spent in database for every Flask request.
+
+Listeners of SQLAlchemy engine events are registered for every engine, so statements
+sent through binds are counted too. Numbers are returned in headers "X-DB-Queries" and
+"X-DB-Time" (milliseconds) and written to log. If one request runs the same statement
+more times than config value "N_PLUS_ONE_THRESHOLD", warning is written to log, because
+it usually means that related rows are loaded one by one (N+1 problem).
+Statements of streamed responses that are run after headers were sent are not counted.
+
+This module includes functions: init_app(), statement_shape(), start_counting(),
+before_cursor_execute(), after_cursor_execute(), handle_error(), add_query_headers().
+
+This module imports: re, time, collections.Counter, flask.Flask, flask.current_app, flask.g,
+flask.has_request_context, flask.request, sqlalchemy.event, sqlalchemy.engine.Engine,
+app.logger.
+"""
+import re
+import time
+from collections import Counter
+from flask import Flask
+from flask import current_app
+from flask import g
+from flask import has_request_context
+from flask import request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from app import logger
+
+# Lists of placeholders like "IN (?, ?, ?)" are different for every number of values.
+PLACEHOLDER_LIST = re.compile(r'\(\s*(\?|%s|%\(\w+\)s)(\s*,\s*(\?|%s|%\(\w+\)s))+\s*\)')
+
+
+def init_app(app: Flask) -> None:
+    """
+    Start counting statements of every request of application.
+    :param app: Flask application.
+    :return: None
+    """
+    app.config.setdefault('N_PLUS_ONE_THRESHOLD', 10)
+    if not event.contains(Engine, 'before_cursor_execute', before_cursor_execute):
+        event.listen(Engine, 'before_cursor_execute', before_cursor_execute)
+        event.listen(Engine, 'after_cursor_execute', after_cursor_execute)
+        event.listen(Engine, 'handle_error', handle_error)
+    app.before_request(start_counting)
+    app.after_request(add_query_headers)
+
+
+def statement_shape(statement: str) -> str:
+    """
+    Return statement where list of placeholders is replaced with one placeholder,
+    so the same query with different number of values has the same shape.
+    :param statement: SQL statement with placeholders.
+    :return: str
+    """
+    return PLACEHOLDER_LIST.sub('(?)', statement)
+
+
+def start_counting() -> None:
+    """
+    Reset counters of statements at the beginning of request.
+    :return: None
+    """
+    g.db_queries = 0
+    g.db_time = 0.0
+    g.db_statements = Counter()
+
+
+def before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    """
+    Remember time when statement was started.
+    :return: None
+    """
+    conn.info.setdefault('query_start', []).append(time.perf_counter())
+
+
+def after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    """
+    Count statement and time of its execution for current request.
+    :return: None
+    """
+    elapsed = time.perf_counter() - conn.info['query_start'].pop()
+    if not has_request_context() or 'db_statements' not in g:
+        return
+    g.db_queries += 1
+    g.db_time += elapsed
+    g.db_statements[statement_shape(statement)] += 1
+
+
+def handle_error(context) -> None:
+    """
+    Forget time when failed statement was started.
+    :param context: Context of exception.
+    :return: None
+    """
+    if context.connection is not None and context.connection.info.get('query_start'):
+        context.connection.info['query_start'].pop()
+
+
+def add_query_headers(response):
+    """
+    Add number of statements and time in database to response and write them to log.
+    Warn if some statement was repeated too many times.
+    :param response: Response of request.
+    :return: Response
+    """
+    if 'db_statements' not in g:
+        return response
+    db_time = g.db_time * 1000
+    response.headers['X-DB-Queries'] = str(g.db_queries)
+    response.headers['X-DB-Time'] = f'{db_time:.3f}'
+    logger.debug('%s %s: %d queries, %.3f ms in database.', request.method, request.path,
+                 g.db_queries, db_time)
+    threshold = current_app.config['N_PLUS_ONE_THRESHOLD']
+    for statement, count in g.db_statements.most_common():
+        if count <= threshold:
+            break
+        logger.warning('%s %s ran the same statement %d times, related rows may be loaded '
+                       'one by one: %s', request.method, request.path, count, statement)
+    return response
+
@@ -0,0 +1,33 @@
+"""Salary aggregates
+
+Revision ID: 5d1e2b7c9a40
+Revises: 9270b94c2c4e
+Create Date: 2026-10-18 10:12:41.203518
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5d1e2b7c9a40'
+down_revision = '9270b94c2c4e'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('university', sa.Column('salary_sum', sa.BigInteger(), nullable=False,
+                                          server_default='0'))
+    op.add_column('university', sa.Column('teacher_count', sa.Integer(), nullable=False,
+                                          server_default='0'))
+    op.execute('UPDATE university SET '
+               'salary_sum = (SELECT COALESCE(SUM(salary), 0) FROM teacher '
+               'WHERE teacher.university_id = university.id), '
+               'teacher_count = (SELECT COUNT(*) FROM teacher '
+               'WHERE teacher.university_id = university.id)')
+
+
+def downgrade():
+    op.drop_column('university', 'teacher_count')
+    op.drop_column('university', 'salary_sum')
@@ -0,0 +1,31 @@
+"""Teacher indexes
+
+Revision ID: a7c3e91f4b20
+Revises: 5d1e2b7c9a40
+Create Date: 2026-10-18 11:02:15.518204
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a7c3e91f4b20'
+down_revision = '5d1e2b7c9a40'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index(op.f('ix_teacher_birth_date'), 'teacher', ['birth_date'], unique=False)
+    op.create_index(op.f('ix_teacher_university_id'), 'teacher', ['university_id'],
+                    unique=False)
+
+
+def downgrade():
+    # MySQL drops its own index of the foreign key when ix_teacher_university_id
+    # is created and doesn't allow to drop the last index of the foreign key.
+    if op.get_bind().dialect.name == 'mysql':
+        op.create_index('teacher_university_id_fk', 'teacher', ['university_id'], unique=False)
+    op.drop_index(op.f('ix_teacher_university_id'), table_name='teacher')
+    op.drop_index(op.f('ix_teacher_birth_date'), table_name='teacher')
@@ -0,0 +1,27 @@
+"""Unique university name
+
+Revision ID: c4b8d2e6f013
+Revises: a7c3e91f4b20
+Create Date: 2026-10-18 11:04:52.107733
+
+Upgrade fails if there are universities with the same name,
+they have to be renamed or merged before.
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c4b8d2e6f013'
+down_revision = 'a7c3e91f4b20'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index(op.f('ix_university_name'), 'university', ['name'], unique=True)
+
+
+def downgrade():
+    op.drop_index(op.f('ix_university_name'), table_name='university')
@@ -0,0 +1,38 @@
+"""Table versions
+
+Revision ID: e1f7a3c5d920
+Revises: c4b8d2e6f013
+Create Date: 2026-10-18 15:42:10.381204
+
+Versions of tables teacher and university for ETag of list endpoints.
+They start from 1, so clients get new ETag after upgrade.
+
+"""
+import datetime
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e1f7a3c5d920'
+down_revision = 'c4b8d2e6f013'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    table_version = op.create_table(
+        'table_version',
+        sa.Column('table_name', sa.String(length=50), nullable=False),
+        sa.Column('version', sa.BigInteger(), server_default='0', nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('table_name')
+    )
+    now = datetime.datetime.utcnow().replace(microsecond=0)
+    op.bulk_insert(table_version, [{'table_name': 'teacher', 'version': 1, 'updated_at': now},
+                                   {'table_name': 'university', 'version': 1,
+                                    'updated_at': now}])
+
+
+def downgrade():
+    op.drop_table('table_version')
@@ -1,5 +1,5 @@
 """
 Module is made for handling models for website
 
-Module contains modules: teacher, university.
+Module contains modules: teacher, university, table_version.
 """
@@ -0,0 +1,46 @@
+"""
+This module represents model TableVersion.
+
+Every table that is shown by list endpoints has a row with version which is increased
+by CRUD functions in the same transaction as changes of the table, so version tells
+if table was changed without reading the table. Rows of tables teacher and university
+are added when table is created by migration or by create_all() (see seed_versions()).
+
+This module has class TableVersion and function seed_versions().
+This model imports such libraries like: datetime, sqlalchemy.event, app
+"""
+import datetime
+from sqlalchemy import event
+from app import db
+
+VERSIONED_TABLES = ('teacher', 'university')
+
+
+class TableVersion(db.Model):
+    """
+    The class represents version of other table.
+    Attributes :
+    table_name: str - name of table
+    version: int - number that is increased after every change of table
+    updated_at: datetime - when table was changed last time (UTC)
+    """
+    __tablename__ = 'table_version'
+    table_name = db.Column('table_name', db.String(50), primary_key=True)
+    version = db.Column('version', db.BigInteger, nullable=False, default=0,
+                        server_default='0')
+    updated_at = db.Column('updated_at', db.DateTime, nullable=True)
+
+
+@event.listens_for(TableVersion.__table__, 'after_create')
+def seed_versions(table, connection, **kwargs) -> None:
+    """
+    Add rows of versioned tables right after table_version is created by create_all(),
+    like migration does, so the first changes of tables don't have to make them.
+    :param table: Table table_version.
+    :param connection: Connection that created the table.
+    :return: None
+    """
+    now = datetime.datetime.utcnow().replace(microsecond=0)
+    connection.execute(table.insert(), [{'table_name': table_name, 'version': 1,
+                                         'updated_at': now}
+                                        for table_name in VERSIONED_TABLES])
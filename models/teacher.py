@@ -19,7 +19,8 @@ class Teacher(db.Model):
     birth_date: date - when teacher was born
     salary: int - how much teacher get in cash
     university_id: int - identification for university (made for ForeignKey relation)
-    university: University - object of university where teacher works
+    university: University - object of university where teacher works, it is read when it is
+    used, queries that need it use teachers_crud.teacher_query(with_university=True)
 
     Function :
     _init__() : constructor of class
@@ -30,10 +31,11 @@ class Teacher(db.Model):
     id = db.Column('teacher_id', db.Integer, primary_key=True)
     name = db.Column('name', db.String(50), nullable=False)
     last_name = db.Column('last_name', db.String(50), nullable=False)
-    birth_date = db.Column('birth_date', db.Date, nullable=False)
+    birth_date = db.Column('birth_date', db.Date, nullable=False, index=True)
     salary = db.Column('salary', db.Integer, nullable=False)
-    university_id = db.Column(db.Integer, db.ForeignKey("university.id", ondelete='CASCADE'))
-    university = db.relationship('University', backref='teacher', lazy='subquery')
+    university_id = db.Column(db.Integer, db.ForeignKey("university.id", ondelete='CASCADE'),
+                              index=True)
+    university = db.relationship('University', backref='teacher', lazy='select')
 
     def __init__(self, name, last_name, birth_date, salary, university) -> None:
         """
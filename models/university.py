@@ -18,15 +18,21 @@ class University(db.Model):
     name: str - name of university
     location: str - where university was built
     average_salary: int - average salary of university among all teachers
+    salary_sum: int - sum of salaries of all teachers in university
+    teacher_count: int - number of teachers in university
 
     Function :
     _init__() : constructor of class
     """
     __tablename__ = 'university'
     id = db.Column('id', db.Integer, primary_key=True)
-    name = db.Column('name', db.String(50))
+    name = db.Column('name', db.String(50), index=True, unique=True)
     location = db.Column('location', db.String(50))
     average_salary = db.Column('average_salary', db.Integer, nullable=True, default=0)
+    salary_sum = db.Column('salary_sum', db.BigInteger, nullable=False, default=0,
+                           server_default='0')
+    teacher_count = db.Column('teacher_count', db.Integer, nullable=False, default=0,
+                              server_default='0')
 
     def __init__(self, name, location, average_salary=0) -> None:
         """
@@ -38,6 +44,8 @@ class University(db.Model):
         self.name = name
         self.location = location
         self.average_salary = average_salary
+        self.salary_sum = 0
+        self.teacher_count = 0
 
 
 class UniversitySchema(ma.Schema):
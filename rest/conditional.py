@@ -0,0 +1,124 @@
+"""
+This module answers conditional GET requests of REST-API.
+
+Route decorated with conditional() gets ETag and Last-Modified made from versions
+of tables it shows. Versions are read before the route, so if client sends
+If-None-Match that still matches, it gets 304 Not Modified and route doesn't load models
+and doesn't serialize them. Last-Modified has whole seconds, two changes in one second
+have the same date, so If-Modified-Since alone never gives 304. If versions can't be
+read, route answers as usual without ETag.
+
+Other clients get response from shared cache of workers (see service.shared_cache) when
+some worker already made it for the same url and versions, so only the first request
+after change of table reads models. Only successful responses are stored: error dict
+(this API answers errors with status 200) or error raised by route isn't stored and
+doesn't get ETag. Route reads its rows in the same transaction as versions and not from
+in-process caches. Versions are read again before response is stored, so if table was
+changed while route read it, response isn't stored under versions it doesn't match.
+
+This module includes functions: make_etag(), cache_key(), load_response(), store_response(),
+conditional().
+
+This module imports: functools, hashlib, typing.Callable, flask.Response,
+flask.current_app, flask.make_response, flask.request, werkzeug.http.is_resource_modified,
+CACHE_REQUESTS, table_versions.
+"""
+import functools
+import hashlib
+from typing import Callable
+from flask import Response
+from flask import current_app
+from flask import make_response
+from flask import request
+from werkzeug.http import is_resource_modified
+from instrumentation.metrics import CACHE_REQUESTS
+from service import table_versions
+
+
+def make_etag(tables: tuple, versions: tuple) -> str:
+    """
+    Return value of ETag for versions of tables, for example "teacher.3-university.7".
+    :param tables: Names of tables.
+    :param versions: Versions of tables.
+    :return: str
+    """
+    return '-'.join(f'{table}.{version}' for table, version in zip(tables, versions))
+
+
+def cache_key(etag: str) -> str:
+    """
+    Return key of response of current url with given ETag in shared cache.
+    :param etag: ETag made from versions of tables.
+    :return: str
+    """
+    url_hash = hashlib.sha1(request.full_path.encode()).hexdigest()
+    return f'response:{etag}:{url_hash}'
+
+
+def load_response(key: str):
+    """
+    Return response from shared cache or None if it isn't there.
+    :param key: Key of response.
+    :return: Response or None
+    """
+    cache = current_app.extensions['response_cache']
+    if not cache.enabled:
+        return None
+    value = cache.get(key)
+    CACHE_REQUESTS.labels('response', 'miss' if value is None else 'hit').inc()
+    if value is None:
+        return None
+    content_type, _, body = value.partition(b'\n')
+    return Response(body, content_type=content_type.decode())
+
+
+def store_response(key: str, response: Response, tables: tuple, versions: tuple) -> None:
+    """
+    Keep body and content type of response in shared cache if versions of tables
+    are still the same as versions response was made for.
+    :param key: Key of response.
+    :param response: Response of route.
+    :param tables: Names of tables that route shows.
+    :param versions: Versions of tables that were read before route.
+    :return: None
+    """
+    cache = current_app.extensions['response_cache']
+    if not cache.enabled or response.is_streamed:
+        return
+    if table_versions.get_versions(*tables)[0] != versions:
+        return
+    cache.set(key, response.content_type.encode() + b'\n' + response.get_data())
+
+
+def conditional(*tables: str) -> Callable:
+    """
+    Decorator of GET route that shows data of given tables. ETag is weak, because
+    the same data can be written differently after the application is updated.
+    :param tables: Names of tables that route shows.
+    :return: Callable
+    """
+    def decorator(view: Callable) -> Callable:
+        @functools.wraps(view)
+        def wrapper(*args, **kwargs):
+            versions, last_modified = table_versions.get_versions(*tables)
+            if versions is None:
+                return view(*args, **kwargs)
+            etag = make_etag(tables, versions)
+            if not is_resource_modified(request.environ, etag=etag):
+                response = make_response('', 304)
+            else:
+                key = cache_key(etag)
+                response = load_response(key)
+                if response is None:
+                    result = view(*args, **kwargs)
+                    if isinstance(result, dict) and 'error' in result:
+                        return result
+                    response = make_response(result)
+                    if response.status_code != 200:
+                        return response
+                    store_response(key, response, tables, versions)
+            response.set_etag(etag, weak=True)
+            response.last_modified = last_modified
+            return response
+        return wrapper
+    return decorator
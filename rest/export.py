@@ -0,0 +1,57 @@
+"""
+This module converts rows of teachers to text formats for export in REST-API.
+
+Rows are converted lazily and joined into chunks, so export of any size
+uses the same amount of memory.
+
+This module includes functions: export_ndjson(), export_csv().
+
+This module imports: csv, io, json, typing.Iterable, typing.Iterator.
+"""
+import csv
+import io
+import json
+from typing import Iterable, Iterator
+
+EXPORT_COLUMNS = ('id', 'name', 'last_name', 'birth_date', 'salary', 'university')
+ROWS_PER_CHUNK = 500
+
+
+def export_ndjson(rows: Iterable[tuple]) -> Iterator[str]:
+    """
+    Convert rows of teachers to chunks of newline delimited JSON, one object per teacher.
+    :param rows: Tuples with values of EXPORT_COLUMNS.
+    :return: Iterator[str]
+    """
+    lines = []
+    for teacher_id, name, last_name, birth_date, salary, university in rows:
+        lines.append(json.dumps({'id': teacher_id, 'name': name, 'last_name': last_name,
+                                 'birth_date': birth_date.isoformat(), 'salary': salary,
+                                 'university': university}))
+        if len(lines) == ROWS_PER_CHUNK:
+            yield '\n'.join(lines) + '\n'
+            lines = []
+    if lines:
+        yield '\n'.join(lines) + '\n'
+
+
+def export_csv(rows: Iterable[tuple]) -> Iterator[str]:
+    """
+    Convert rows of teachers to chunks of CSV with header line.
+    :param rows: Tuples with values of EXPORT_COLUMNS.
+    :return: Iterator[str]
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(EXPORT_COLUMNS)
+    row_count = 0
+    for teacher_id, name, last_name, birth_date, salary, university in rows:
+        writer.writerow((teacher_id, name, last_name, birth_date.isoformat(), salary, university))
+        row_count += 1
+        if row_count == ROWS_PER_CHUNK:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+            row_count = 0
+    if buffer.tell():
+        yield buffer.getvalue()
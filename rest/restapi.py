@@ -1,23 +1,35 @@
 """
 This module works for RESTFULL-API in website.
 
-This module includes functions: index(), read_teacher(), add_teacher(), update_teacher(),
-delete_teacher(),
-search_by_date(), get_university(), get_university_by_id(), post_university(),
-update_university(), delete_university()
+This module includes functions: read_page_args(), read_field_args(), index(),
+export_teachers(), read_teacher(), add_teacher(), read_bulk_rows(), add_teachers_bulk(),
+update_teacher(), delete_teacher(), search_by_date(), get_university(),
+get_university_by_id(), post_university(), update_university(), delete_university()
 
-This module imports: flask.Blueprint, flask.request, flask.jsonify, service,
+This module imports: flask.Blueprint, flask.request, flask.jsonify, service, replica_read,
+conditional, serializers,
 TeacherSchema, UniversitySchema,
 University, Teacher
 """
 import datetime
+import json
+from typing import Union
 from flask import Blueprint, Response
 
 api = Blueprint('api', __name__)
+from flask import current_app
 from flask import request
 from flask import jsonify
+from flask import stream_with_context
 from app import logger
+from rest.export import export_csv, export_ndjson
+from service.validation import validate_teacher
+from database.replicas import replica_read
+from rest.conditional import conditional
+from rest.serializers import dump_university, json_response, teacher_dumper
+from service import table_versions
 from service import teachers_crud
+from service.teachers_crud import TEACHER_FIELDS
 from service import universities_crud
 from models.teacher import TeacherSchema
 from models.university import UniversitySchema
@@ -26,33 +38,124 @@ from models.teacher import Teacher
 
 teacher_schema = TeacherSchema()
 university_schema = UniversitySchema()
+PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+
+
+def read_page_args() -> Union[dict, tuple]:
+    """
+    Read pagination arguments "limit" and "after" from query string.
+    Return tuple (limit, after) or dict with error if arguments are wrong.
+    :return: Union[dict, tuple]
+    """
+    try:
+        limit = int(request.args.get('limit', PAGE_SIZE))
+        after = request.args.get('after')
+        if after is not None:
+            after = int(after)
+    except ValueError:
+        logger.debug("User entered pagination arguments that are not integers.")
+        return {'error': {'message': 'Limit and after must be integers.', 'status': 400}}
+    if limit < 1 or limit > MAX_PAGE_SIZE:
+        logger.debug("User entered limit out of range.")
+        return {'error': {'message': f'Limit must be between 1 and {MAX_PAGE_SIZE}.',
+                          'status': 400}}
+    return limit, after
+
+
+def read_field_args() -> Union[dict, tuple]:
+    """
+    Read arguments "fields" - comma separated columns of teacher and "include=university"
+    from query string. Without "fields" every column is shown, university is shown without
+    "fields" or with "include=university". Only shown columns are read from database and
+    university is joined only if it is shown.
+    Return tuple (fields, with_university) or dict with error if arguments are wrong.
+    :return: Union[dict, tuple]
+    """
+    fields = request.args.get('fields')
+    include = request.args.get('include')
+    if include not in (None, 'university'):
+        logger.debug("User entered wrong include.")
+        return {'error': {'message': 'Only university can be included.', 'status': 400}}
+    if fields is None:
+        return TEACHER_FIELDS, True
+    fields = tuple(dict.fromkeys(field.strip() for field in fields.split(',')))
+    unknown = [field for field in fields if field not in TEACHER_FIELDS]
+    if unknown:
+        logger.debug("User entered wrong fields.")
+        return {'error': {'message': f"Fields must be some of "
+                                     f"{','.join(TEACHER_FIELDS)}.",
+                          'status': 400}}
+    return fields, include == 'university'
 
 
 @api.route('/', methods=['GET'])
-def index() -> dict:
+@conditional(table_versions.TEACHER, table_versions.UNIVERSITY)
+def index() -> Union[dict, Response]:
     """
-    Show all teachers in json response.
-    :return: dict
+    Show teachers in json response page by page ordered by id.
+    Query string can contain "limit" - size of page and "after" - cursor that was returned
+    as "next" in previous page. Every teacher in one response is shown only with "all=true".
+    Shown columns are chosen by "fields" and "include" (see read_field_args()).
+    :return: Union[dict, Response]
     """
-    teacher_schema = TeacherSchema(many=True)
-    teachers = teachers_crud.get_all_teachers()
-    logger.debug("Api show all teachers in database.")
-    return teacher_schema.jsonify(teachers).data
+    field_args = read_field_args()
+    if isinstance(field_args, dict):
+        return field_args
+    fields, with_university = field_args
+    dump = teacher_dumper(fields, with_university)
+    if request.args.get('all') == 'true':
+        rows = teachers_crud.get_all_teacher_rows(fields, with_university)
+        logger.debug("Api show all teachers in database.")
+        return json_response([dump(row) for row in rows]).data
+    page_args = read_page_args()
+    if isinstance(page_args, dict):
+        return page_args
+    limit, after = page_args
+    rows, next_cursor = teachers_crud.get_teacher_rows_page(limit, after, fields,
+                                                            with_university)
+    logger.debug("Api show page of teachers in database.")
+    return json_response({'teachers': [dump(row) for row in rows], 'next': next_cursor})
+
+
+@api.route('/export', methods=['GET'])
+def export_teachers() -> Union[dict, Response]:
+    """
+    Export every teacher with name of university in format "ndjson" (by default) or "csv"
+    given in query string. Response is streamed while teachers are read from database.
+    :return: Union[dict, Response]
+    """
+    export_format = request.args.get('format', 'ndjson')
+    if export_format == 'ndjson':
+        export, mimetype = export_ndjson, 'application/x-ndjson'
+    elif export_format == 'csv':
+        export, mimetype = export_csv, 'text/csv'
+    else:
+        logger.debug("User entered wrong export format.")
+        return {'error': {'message': 'Format must be ndjson or csv.', 'status': 400}}
+    logger.debug("Api export all teachers in database.")
+    rows = teachers_crud.iter_teacher_rows()
+    return Response(stream_with_context(export(rows)), mimetype=mimetype)
 
 
 @api.route('/<int:teacher_id>', methods=['GET'])
-def read_teacher(teacher_id: int) -> Response:
+@conditional(table_versions.TEACHER, table_versions.UNIVERSITY)
+def read_teacher(teacher_id: int) -> Union[dict, Response]:
     """
-    Show teacher with given id in json response
+    Show teacher with given id in json response, shown columns are chosen by "fields"
+    and "include" (see read_field_args()).
     :param teacher_id: Id of teacher
-    :return: Response
+    :return: Union[dict, Response]
     """
-    teacher = teachers_crud.get_teacher(teacher_id)
-    if not teacher:
-        return jsonify({'error': {'message': 'No teacher was found with given id',
-                                  'status': 400}})
+    field_args = read_field_args()
+    if isinstance(field_args, dict):
+        return field_args
+    fields, with_university = field_args
+    row = teachers_crud.get_teacher_row(teacher_id, fields, with_university)
+    if not row:
+        return {'error': {'message': 'No teacher was found with given id', 'status': 400}}
     logger.debug("User get teacher with id {teacher_id} in REST-API")
-    return teacher_schema.jsonify(teacher).data
+    return json_response(teacher_dumper(fields, with_university)(row)).data
 
 
 @api.route('/', methods=['POST'])
@@ -62,32 +165,11 @@ def add_teacher() -> dict:
     :return: dict
     """
     logger.debug("User make post method  add_teacher in REST-API")
-    name = request.json.get('name')
-    last_name = request.json.get('last_name')
-    birth_date = request.json.get('birth_date')
-    salary = request.json.get('salary')
-    university = request.json.get('university')
-    if not name or not last_name or not birth_date or not salary or not university:
-        logger.debug("User did not entered some data")
-        return {'error': {'message': 'Some data was not written', 'status': 400}}
-    try:
-        university_db = University.query.filter_by(name=university).first()
-        if not university_db:
-            return {'error': {'message': 'Wrong university name.', 'status': 400}}
-    except Exception as ex:
-        logger.error(str(ex))
-        return {'error': {'message': 'Wrong university name.', 'status': 400}}
-
-    try:
-        birth_date = datetime.datetime.strptime(birth_date, "%Y-%m-%d")
-    except (TypeError, ValueError):
-        logger.debug('User entered date in incorrect format.')
-        return {'error': {'message': 'Incorrect date format.', 'status': 400}}
-    if not isinstance(salary, int):
-        logger.debug('User entered salary in incorrect format.')
-        return {'error': {'message': 'Incorrect salary format.'
-                                     ' Salary must be integer.', 'status': 400}}
-
+    res = validate_teacher(request.json,
+                           lambda name: University.query.filter_by(name=name).first())
+    if isinstance(res, dict):
+        return res
+    name, last_name, birth_date, salary, university_db = res
     new_teacher = Teacher(name, last_name, birth_date, salary, university_db)
     res = teachers_crud.create_teacher(new_teacher)
     if not res:
@@ -97,6 +179,82 @@ def add_teacher() -> dict:
     return teacher_schema.jsonify(new_teacher).data
 
 
+def read_bulk_rows() -> Union[dict, list]:
+    """
+    Read teachers from body of request that is JSON array or newline delimited JSON
+    (Content-Type application/x-ndjson). Line of NDJSON that is not valid JSON is read as None.
+    Return list of teachers or dict with error if body is wrong.
+    :return: Union[dict, list]
+    """
+    if request.mimetype == 'application/x-ndjson':
+        rows = []
+        for line in request.get_data(as_text=True).splitlines():
+            if not line.strip():
+                continue
+            try:
+                rows.append(json.loads(line))
+            except ValueError:
+                rows.append(None)
+        return rows
+    rows = request.get_json(silent=True)
+    if not isinstance(rows, list):
+        logger.debug("User sent body that is not JSON array.")
+        return {'error': {'message': 'Body must be JSON array or NDJSON.', 'status': 400}}
+    return rows
+
+
+@api.route('/bulk', methods=['POST'])
+def add_teachers_bulk() -> Union[dict, Response]:
+    """
+    Add many teachers to database. Teachers are validated the same way as in add_teacher(),
+    universities are found with one query and valid teachers are added in chunks of size
+    "chunk_size" from query string. Wrong teachers don't stop adding others, they are returned
+    in "errors" with their position "row" in request.
+    :return: Union[dict, Response]
+    """
+    logger.debug("User make post method add_teachers_bulk in REST-API")
+    rows = read_bulk_rows()
+    if isinstance(rows, dict):
+        return rows
+    try:
+        chunk_size = int(request.args.get('chunk_size', current_app.config['BULK_CHUNK_SIZE']))
+    except ValueError:
+        chunk_size = 0
+    if chunk_size < 1:
+        logger.debug("User entered wrong chunk size.")
+        return {'error': {'message': 'Chunk size must be positive integer.', 'status': 400}}
+    universities = universities_crud.get_universities_by_names(
+        row.get('university') for row in rows
+        if isinstance(row, dict) and isinstance(row.get('university'), str))
+    errors = []
+    teachers = []
+    for index, row in enumerate(rows):
+        if not isinstance(row, dict):
+            errors.append({'row': index, 'error': {'message': 'Teacher must be JSON object.',
+                                                   'status': 400}})
+            continue
+        res = validate_teacher(row, universities.get)
+        if isinstance(res, dict):
+            errors.append({'row': index, **res})
+            continue
+        name, last_name, birth_date, salary, university_db = res
+        teachers.append((index, {'name': name, 'last_name': last_name,
+                                 'birth_date': birth_date.date(), 'salary': salary,
+                                 'university_id': university_db.id}))
+    inserted = 0
+    for start in range(0, len(teachers), chunk_size):
+        chunk = teachers[start:start + chunk_size]
+        failed = teachers_crud.create_teachers_bulk([values for _, values in chunk])
+        for chunk_index in failed:
+            errors.append({'row': chunk[chunk_index][0],
+                           'error': {'message': 'Can\'t add teacher to database',
+                                     'status': 412}})
+        inserted += len(chunk) - len(failed)
+    errors.sort(key=lambda error: error['row'])
+    logger.debug("User make new teachers in REST-API")
+    return jsonify({'inserted': inserted, 'errors': errors})
+
+
 @api.route('/<int:teacher_id>', methods=['PATCH'])
 def update_teacher(teacher_id) -> Response:
     """
@@ -104,11 +262,7 @@ def update_teacher(teacher_id) -> Response:
     :param teacher_id:
     :return: Response
     """
-    logger.debug(f"User make patch method  update_teacher with id {teacher_id} in REST-API")
-    teacher = teachers_crud.get_teacher(teacher_id)
-    if not teacher:
-        logger.debug("User entered wrong teacher id.")
-        return {'error': {'message': f'Wrong teacher id.', 'status': 400}}
+    logger.debug("User make patch method  update_teacher with id %s in REST-API", teacher_id)
     name = request.json.get('name')
     last_name = request.json.get('last_name')
     birth_date = request.json.get('birth_date')
@@ -142,13 +296,22 @@ def delete_teacher(teacher_id) -> Response:
 
 
 @api.route('/search_by_date', methods=['POST'])
-def search_by_date() -> dict:
+@replica_read
+def search_by_date() -> Union[dict, Response]:
     """
-    Search teachers between given two dates
-    :return: dict
+    Search teachers between given two dates page by page ordered by birth date and id.
+    Body can contain "limit" - size of page, "after" - cursor that was returned as "next"
+    in previous page and "count": true to get number of all found teachers as "total".
+    Shown columns are chosen by "fields" and "include" in query string
+    (see read_field_args()).
+    :return: Union[dict, Response]
     """
     logger.debug("User make post method  search_by_date in REST-API")
-    teacher_schema = TeacherSchema(many=True)
+    field_args = read_field_args()
+    if isinstance(field_args, dict):
+        return field_args
+    fields, with_university = field_args
+    keys = ('id', 'birth_date')
     date_from = request.json.get('date_from')
     date_to = request.json.get('date_to')
     if not date_to or not date_from:
@@ -164,21 +327,46 @@ def search_by_date() -> dict:
         logger.debug("User entered date in wrong format should be year-month-day")
         return {'error': {'message': 'Date is in wrong format should be year-month-day',
                           'status': 400}}
-    teachers = Teacher.query.filter(Teacher.birth_date.between(date_from, date_to))
+    limit = request.json.get('limit', PAGE_SIZE)
+    after = request.json.get('after')
+    if not isinstance(limit, int) or isinstance(limit, bool) or not 1 <= limit <= MAX_PAGE_SIZE:
+        logger.debug("User entered wrong limit of search.")
+        return {'error': {'message': f'Limit must be integer between 1 and {MAX_PAGE_SIZE}.',
+                          'status': 400}}
+    if after is not None and not isinstance(after, str):
+        logger.debug("User entered cursor of search not in string form.")
+        return {'error': {'message': 'Wrong cursor.', 'status': 400}}
+    try:
+        rows, next_cursor, total = teachers_crud.search_by_date(
+            date_from.date(), date_to.date(), limit, after, request.json.get('count') is True,
+            teachers_crud.teacher_rows_query(fields, with_university, keys))
+    except ValueError:
+        logger.debug("User entered wrong cursor of search.")
+        return {'error': {'message': 'Wrong cursor.', 'status': 400}}
     logger.debug("Teachers between dates were shown")
-    return teacher_schema.jsonify(teachers).data
+    dump = teacher_dumper(fields, with_university, keys)
+    response = {'teachers': [dump(row) for row in rows], 'next': next_cursor}
+    if total is not None:
+        response['total'] = total
+    return json_response(response)
 
 
 @api.route('/university', methods=['GET'])
+@conditional(table_versions.UNIVERSITY)
 def get_university() -> dict:
     """
-    Get all universities from database.
+    Get all universities from database. They are not taken from cache of universities,
+    so response is made from rows of the version that conditional() has read.
     :return: dict
     """
-    university_schema = UniversitySchema(many=True)
-    universities = universities_crud.get_all_universities()
-    logger.debug(f"User get universities in REST-API")
-    return university_schema.jsonify(universities).data
+    try:
+        universities = universities_crud.get_all_universities(use_cache=False,
+                                                              raise_errors=True)
+    except Exception as ex:
+        logger.error(str(ex))
+        return {'error': {'message': 'Can\'t read universities from db', 'status': 412}}
+    logger.debug("User get universities in REST-API")
+    return json_response([dump_university(university) for university in universities]).data
 
 
 @api.route('/university/<int:university_id>', methods=["GET"])
@@ -188,7 +376,7 @@ def get_university_by_id(university_id) -> Response:
     :param university_id: Id of university to read from database
     :return: dict
     """
-    logger.debug(f"User get university with id {university_id} in REST-API")
+    logger.debug("User get university with id %s in REST-API", university_id)
     res = universities_crud.get_university(university_id)
     if res:
         logger.debug("User entered wrong id")
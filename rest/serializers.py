@@ -0,0 +1,112 @@
+"""
+This module converts rows of teachers and universities to JSON for hot routes of REST-API.
+
+Marshmallow schemas check every field of every object, so on long lists they take most
+of the time of request. Functions of this module make the same dicts as TeacherSchema
+and UniversitySchema straight from row tuples of teachers_crud.teacher_rows_query() and
+from universities, and json_body() writes them the same way as flask.jsonify, so
+responses are byte-identical (see benchmarks/serialization.py). Schemas are still used
+to read data of requests.
+
+If orjson is installed, json_body() uses it, it is several times faster than json module.
+orjson doesn't escape non-ASCII characters like flask.jsonify does, so such bodies are
+written by json module.
+
+Dumper of teachers is made once for asked fields (see teacher_dumper()), so making
+dict of row doesn't check which fields were asked.
+
+This module includes functions: dump_university(), dump_university_row(), teacher_dumper(),
+dump_teacher_row(), json_body(), json_response().
+
+This module imports: json, typing.Callable, flask.current_app, flask.jsonify,
+orjson (optional), teachers_crud.TEACHER_FIELDS.
+"""
+import json
+from typing import Callable
+from flask import current_app
+from flask import jsonify
+from service.teachers_crud import TEACHER_FIELDS
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def dump_university(university) -> dict:
+    """
+    Return university as UniversitySchema dumps it.
+    :param university: University.
+    :return: dict
+    """
+    return {'id': university.id, 'name': university.name, 'location': university.location,
+            'average_salary': university.average_salary}
+
+
+def dump_university_row(row: tuple) -> dict:
+    """
+    Return university as UniversitySchema dumps it.
+    :param row: Tuple with id, name, location and average salary of university.
+    :return: dict
+    """
+    university_id, name, location, average_salary = row
+    return {'id': university_id, 'name': name, 'location': location,
+            'average_salary': average_salary}
+
+
+def teacher_dumper(fields: tuple = TEACHER_FIELDS, with_university: bool = True,
+                   keys: tuple = ('id',)) -> Callable[[tuple], dict]:
+    """
+    Return function that makes dict of teacher from row of teacher_rows_query() with
+    the same fields, with_university and keys, as TeacherSchema(only=...) dumps it.
+    Teacher without university has None.
+    :param fields: Names of columns of teacher.
+    :param with_university: Row has columns of university.
+    :param keys: Keys of query, they are skipped if they are not in fields.
+    :return: Callable[[tuple], dict]
+    """
+    fields = tuple(fields)
+    start = len([key for key in keys if key not in fields])
+    end = start + len(fields)
+    has_birth_date = 'birth_date' in fields
+
+    def dump(row: tuple) -> dict:
+        teacher = dict(zip(fields, row[start:end]))
+        if has_birth_date and teacher['birth_date'] is not None:
+            teacher['birth_date'] = teacher['birth_date'].isoformat()
+        if with_university:
+            teacher['university'] = dump_university_row(row[end:]) \
+                if row[end] is not None else None
+        return teacher
+    return dump
+
+
+dump_teacher_row = teacher_dumper()
+
+
+def json_body(data) -> bytes:
+    """
+    Return data written as JSON like flask.jsonify writes it when application isn't
+    in debug mode: without spaces, with sorted keys, ASCII only and with new line at end.
+    :param data: Dicts, lists, strings, numbers and None.
+    :return: bytes
+    """
+    if orjson is not None:
+        body = orjson.dumps(data, option=orjson.OPT_SORT_KEYS | orjson.OPT_APPEND_NEWLINE)
+        if body.isascii():
+            return body
+    return (json.dumps(data, separators=(',', ':'), sort_keys=True) + '\n').encode()
+
+
+def json_response(data):
+    """
+    Return JSON response with data like flask.jsonify. If application writes JSON
+    differently (debug mode, pretty print, not sorted or not ASCII keys), flask.jsonify is used.
+    :param data: Dicts, lists, strings, numbers and None.
+    :return: Response
+    """
+    config = current_app.config
+    if current_app.debug or config['JSONIFY_PRETTYPRINT_REGULAR'] \
+            or not config['JSON_SORT_KEYS'] or not config['JSON_AS_ASCII']:
+        return jsonify(data)
+    return current_app.response_class(json_body(data), mimetype=config['JSONIFY_MIMETYPE'])
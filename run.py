@@ -1,9 +1,11 @@
 """
 This module is to run full application.
 
-It includes app from app
+It creates app with create_app from app, gunicorn runs it as "run:app".
 """
-from app import app
+from app import create_app
+
+app = create_app()
 
 if __name__ == '__main__':
     app.run(debug=True, host='0.0.0.0')
@@ -1,5 +1,6 @@
 """
 Module is made for handling with CRUD for teacher page and university page
 
-Module contains to moduls: teachers_crud, universities_crud
+Module contains to moduls: teachers_crud, universities_crud, validation,
+table_versions
 """
@@ -0,0 +1,111 @@
+"""
+This module contains in-process cache for data that is read often and changed rarely.
+
+LRUCache keeps values for "ttl" seconds and not more than "maxsize" values, when it is
+full the value that wasn't read for the longest time is removed. Every gunicorn worker
+has its own cache and reading it doesn't check database, so functions that change cached
+data clear the cache of their worker and other workers may return old values until
+their ttl is over. Readers that can't accept that must bypass the cache. Hits and misses
+are counted by the cache and by Prometheus counter cache_requests_total.
+
+This module includes class LRUCache.
+
+This module imports: threading, time, collections.OrderedDict, typing.Any,
+typing.Callable, instrumentation.metrics.CACHE_REQUESTS.
+"""
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable
+from instrumentation.metrics import CACHE_REQUESTS
+
+
+class LRUCache:
+    """
+    Thread safe cache with time to live and LRU eviction.
+    Cache with maxsize or ttl equal to 0 is turned off: it only counts misses.
+    """
+
+    def __init__(self, name: str, maxsize: int, ttl: float):
+        """
+        :param name: Name of cache in metrics.
+        :param maxsize: How many values are kept.
+        :param ttl: Seconds after which value is read again.
+        """
+        self.name = name
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._values = OrderedDict()
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        """
+        Return False if cache is turned off.
+        :return: bool
+        """
+        return self.maxsize > 0 and self.ttl > 0
+
+    def get_or_load(self, key, load: Callable[[], Any]) -> Any:
+        """
+        Return value of key from cache or load it and keep it in cache.
+        Value is loaded outside of lock, so slow loading doesn't block other keys.
+        Value loaded before clear() is returned but not kept, it can be old.
+        :param key: Key of value.
+        :param load: Function that returns value if it isn't in cache.
+        :return: Any
+        """
+        now = time.monotonic()
+        with self._lock:
+            item = self._values.get(key)
+            if item is not None and item[0] > now:
+                self._values.move_to_end(key)
+                self.hits += 1
+                CACHE_REQUESTS.labels(self.name, 'hit').inc()
+                return item[1]
+            self.misses += 1
+            generation = self._generation
+        CACHE_REQUESTS.labels(self.name, 'miss').inc()
+        value = load()
+        self.set(key, value, generation)
+        return value
+
+    def set(self, key, value: Any, generation: int = None) -> None:
+        """
+        Keep value of key and remove the least recently used values above maxsize.
+        :param key: Key of value.
+        :param value: Value to keep.
+        :param generation: Generation of cache when value was read, value is not kept
+        if cache was cleared after it.
+        :return: None
+        """
+        if not self.enabled:
+            return
+        with self._lock:
+            if generation is not None and generation != self._generation:
+                return
+            self._values[key] = (time.monotonic() + self.ttl, value)
+            self._values.move_to_end(key)
+            while len(self._values) > self.maxsize:
+                self._values.popitem(last=False)
+
+    def clear(self) -> None:
+        """
+        Remove every value from cache.
+        :return: None
+        """
+        with self._lock:
+            self._values.clear()
+            self._generation += 1
+
+    def stats(self) -> dict:
+        """
+        Return number of hits, misses and kept values.
+        :return: dict
+        """
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses, 'size': len(self._values),
+                    'maxsize': self.maxsize, 'ttl': self.ttl}
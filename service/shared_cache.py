@@ -0,0 +1,150 @@
+"""
+This module contains caches that are shared by all gunicorn workers.
+
+Cache is chosen by url from RESPONSE_CACHE_URL:
+"sqlite:///path/to/file.db" - SQLite file, shared by workers of one host;
+"redis://host:port/db" - Redis-compatible server, shared by hosts (install redis first);
+empty - cache is turned off.
+
+Values are bytes that expire after ttl seconds. Values are never changed: key of value
+contains versions of tables it was made from, so after change of table new key is used
+and old values just expire. Cache that doesn't work is like empty cache, errors are
+logged and requests are answered from database.
+
+This module includes classes NullCache, SQLiteCache, RedisCache and function make_cache().
+
+This module imports: os, random, sqlite3, threading, time, app.logger.
+"""
+import os
+import random
+import sqlite3
+import threading
+import time
+from app import logger
+
+# Part of writes that also delete expired values from SQLite file.
+PURGE_CHANCE = 0.01
+
+
+class NullCache:
+    """
+    Cache that keeps nothing, it is used when shared cache is turned off.
+    """
+    enabled = False
+
+    def get(self, key: str):
+        """
+        Return value of key or None if there is no value.
+        :param key: Key of value.
+        :return: bytes or None
+        """
+        return None
+
+    def set(self, key: str, value: bytes) -> None:
+        """
+        Keep value of key for ttl seconds.
+        :param key: Key of value.
+        :param value: Value to keep.
+        :return: None
+        """
+
+
+class SQLiteCache(NullCache):
+    """
+    Cache in SQLite file. Every thread of every worker has its own connection,
+    file is in WAL mode, so reads don't wait for writes.
+    """
+    enabled = True
+
+    def __init__(self, path: str, ttl: float):
+        """
+        :param path: Path of SQLite file, it is created if it doesn't exist.
+        :param ttl: Seconds after which value expires.
+        """
+        self.path = path
+        self.ttl = ttl
+        self._local = threading.local()
+
+    def connection(self) -> sqlite3.Connection:
+        """
+        Return connection of current thread. Connection is not reused after fork.
+        :return: sqlite3.Connection
+        """
+        if getattr(self._local, 'pid', None) != os.getpid():
+            connection = sqlite3.connect(self.path, timeout=1, isolation_level=None)
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.execute('PRAGMA synchronous=NORMAL')
+            connection.execute('CREATE TABLE IF NOT EXISTS cache '
+                               '(key TEXT PRIMARY KEY, value BLOB NOT NULL, expires REAL NOT NULL)')
+            self._local.connection = connection
+            self._local.pid = os.getpid()
+        return self._local.connection
+
+    def get(self, key: str):
+        try:
+            row = self.connection().execute(
+                'SELECT value FROM cache WHERE key = ? AND expires > ?',
+                (key, time.time())).fetchone()
+        except sqlite3.Error as ex:
+            logger.warning('Shared cache is not available: %s', ex)
+            return None
+        return row[0] if row else None
+
+    def set(self, key: str, value: bytes) -> None:
+        now = time.time()
+        try:
+            connection = self.connection()
+            connection.execute('INSERT OR REPLACE INTO cache (key, value, expires) '
+                               'VALUES (?, ?, ?)', (key, value, now + self.ttl))
+            if random.random() < PURGE_CHANCE:
+                connection.execute('DELETE FROM cache WHERE expires <= ?', (now,))
+        except sqlite3.Error as ex:
+            logger.warning('Shared cache is not available: %s', ex)
+
+
+class RedisCache(NullCache):
+    """
+    Cache in Redis or in server with the same protocol (Valkey, KeyDB, Dragonfly).
+    """
+    enabled = True
+
+    def __init__(self, url: str, ttl: float):
+        """
+        :param url: Url of server, for example "redis://localhost:6379/0".
+        :param ttl: Seconds after which value expires.
+        """
+        # redis is needed only with this cache, so it is not in requirements.txt.
+        import redis
+        self.client = redis.Redis.from_url(url, socket_timeout=1)
+        self.errors = redis.RedisError
+        self.ttl = ttl
+
+    def get(self, key: str):
+        try:
+            return self.client.get(key)
+        except self.errors as ex:
+            logger.warning('Shared cache is not available: %s', ex)
+            return None
+
+    def set(self, key: str, value: bytes) -> None:
+        try:
+            self.client.set(key, value, px=int(self.ttl * 1000))
+        except self.errors as ex:
+            logger.warning('Shared cache is not available: %s', ex)
+
+
+def make_cache(url: str, ttl: float) -> NullCache:
+    """
+    Return cache for url: "sqlite:///path", "redis://..." (or "rediss://", "unix://")
+    or NullCache if url is empty.
+    :param url: Url of cache.
+    :param ttl: Seconds after which value expires.
+    :return: NullCache
+    """
+    if not url:
+        return NullCache()
+    if url.startswith('sqlite:///'):
+        return SQLiteCache(url[len('sqlite:///'):], ttl)
+    if url.split('://')[0] in ('redis', 'rediss', 'unix'):
+        return RedisCache(url, ttl)
+    raise ValueError(f'Unknown shared cache: {url}')
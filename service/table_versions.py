@@ -0,0 +1,74 @@
+"""
+This module keeps versions of tables for conditional requests.
+
+CRUD functions call bump_versions() before commit, so version of table is changed
+in the same transaction as the table. Version is increased with one upsert statement,
+so concurrent first changes of table can't both try to add its row. get_versions()
+reads versions with one small query, so list endpoints know if their data changed
+without loading it.
+
+This module includes functions: bump_versions(), get_versions().
+
+This module imports: datetime, sqlalchemy.select, sqlalchemy.update,
+sqlalchemy.dialects.mysql.insert, sqlalchemy.dialects.sqlite.insert, app, TableVersion.
+"""
+import datetime
+from sqlalchemy import select
+from sqlalchemy import update
+from sqlalchemy.dialects.mysql import insert as mysql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from app import db
+from app import logger
+from models.table_version import TableVersion
+
+TEACHER = 'teacher'
+UNIVERSITY = 'university'
+
+
+def bump_versions(*tables: str) -> None:
+    """
+    Increase versions of given tables. Changes are made in current transaction,
+    so the caller has to commit them.
+    :param tables: Names of tables that were changed.
+    :return: None
+    """
+    table = TableVersion.__table__
+    now = datetime.datetime.utcnow().replace(microsecond=0)
+    dialect = db.session.get_bind(TableVersion.__mapper__).dialect.name
+    for table_name in tables:
+        row = {'table_name': table_name, 'version': 1, 'updated_at': now}
+        if dialect == 'mysql':
+            statement = mysql_insert(table).values(row).on_duplicate_key_update(
+                version=table.c.version + 1, updated_at=now)
+        elif dialect == 'sqlite':
+            statement = sqlite_insert(table).values(row).on_conflict_do_update(
+                index_elements=[table.c.table_name],
+                set_={'version': table.c.version + 1, 'updated_at': now})
+        else:
+            # Rows of versioned tables are added when table_version is created.
+            statement = (update(table).where(table.c.table_name == table_name)
+                         .values(version=table.c.version + 1, updated_at=now))
+        db.session.execute(statement)
+
+
+def get_versions(*tables: str) -> tuple:
+    """
+    Return versions of given tables in the same order and time of the last change
+    of any of them (None if they weren't changed since version table was made).
+    Return (None, None) if versions can't be read.
+    :param tables: Names of tables.
+    :return: tuple
+    """
+    table = TableVersion.__table__
+    try:
+        rows = db.session.execute(select(table.c.table_name, table.c.version,
+                                         table.c.updated_at)
+                                  .where(table.c.table_name.in_(tables))).all()
+    except Exception as ex:
+        db.session.rollback()
+        logger.error(str(ex))
+        return None, None
+    found = {row.table_name: row for row in rows}
+    versions = tuple(found[name].version if name in found else 0 for name in tables)
+    changes = [row.updated_at for row in rows if row.updated_at is not None]
+    return versions, max(changes) if changes else None
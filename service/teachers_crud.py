@@ -3,33 +3,310 @@ This module demonstrates CRUD operations for teacher model.
 
 It has CRUD functions for website application and for REST-API.
 
-This module includes functions: get_all_teachers(), get_teacher(), create_teacher(),
+This module includes functions: teacher_query(), get_all_teachers(), get_teachers_page(),
+stream_page(), iter_teachers_page(), teacher_rows_query(), get_all_teacher_rows(),
+get_teacher_rows_page(), get_teacher_row(), search_by_date(), iter_search_by_date(),
+after_date_cursor(), date_cursor(), parse_date_cursor(), iter_teacher_rows(),
+get_teacher(), create_teacher(), insert_teacher_rows(), create_teachers_bulk(),
 update_teacher(), delete_teacher(), update_teacher_api(), delete_teacher_api().
 
-This module imports: typing.Any, sqlalchemy.func, app, University, Teacher.
+University of teacher is loaded lazily by default, so functions that return teachers
+whose universities are shown ask for them with teacher_query(with_university=True).
+
+Every function that changes teachers also changes salary aggregates of universities
+and version of table teacher in the same transaction and clears cache of universities
+after commit.
+
+This module imports: datetime, collections.defaultdict, typing.Callable, typing.Iterator,
+sqlalchemy.and_, sqlalchemy.or_, sqlalchemy.orm.joinedload, app, University, Teacher,
+universities_crud, table_versions.
 """
 import datetime
+from collections import defaultdict
+from typing import Callable, Iterator
+from sqlalchemy import and_, or_
+from sqlalchemy.orm import joinedload
 from app import db
 from app import logger
 from models.teacher import Teacher
 from models.university import University
+from service import table_versions
+from service import universities_crud
+
+TEACHER_FIELDS = ('id', 'name', 'last_name', 'birth_date', 'salary')
+UNIVERSITY_ROW_COLUMNS = (University.id.label('university_id'),
+                          University.name.label('university_name'),
+                          University.location.label('university_location'),
+                          University.average_salary.label('university_average_salary'))
+
+
+def teacher_query(with_university: bool = False):
+    """
+    Return query of teachers. If with_university, university of every teacher is read
+    in the same statement (teacher has one university, so join doesn't repeat rows),
+    otherwise it is read by separate statement only when it is used.
+    :param with_university: Read university of teacher.
+    :return: Query
+    """
+    query = Teacher.query
+    if with_university:
+        query = query.options(joinedload(Teacher.university))
+    return query
 
 
 def get_all_teachers() -> list:
     """
-    Return all teachers from database.
+    Return all teachers from database with their universities.
+    :return: list
+    """
+    return teacher_query(with_university=True).all()
+
+
+def get_teachers_page(limit: int, after: int = None) -> tuple:
+    """
+    Return one page of teachers ordered by id and the cursor of the next page.
+    Page starts right after teacher with id "after", so it is found by primary key
+    and does not depend on how many teachers are before it.
+    Cursor is None if there are no more teachers. Teachers are read with universities.
+    :param limit: How many teachers to return.
+    :param after: Id of the last teacher from previous page.
+    :return: tuple
+    """
+    query = teacher_query(with_university=True).order_by(Teacher.id)
+    if after is not None:
+        query = query.filter(Teacher.id > after)
+    teachers = query.limit(limit + 1).all()
+    next_cursor = None
+    if len(teachers) > limit:
+        teachers = teachers[:limit]
+        next_cursor = teachers[-1].id
+    return teachers, next_cursor
+
+
+def stream_page(query, limit: int, cursor: Callable, batch_size: int = 100) -> dict:
+    """
+    Return page of query as dict with "teachers" - iterator of at most limit teachers
+    that are read with server side cursor batch by batch only when they are iterated,
+    and "next" - cursor of the next page made by function cursor from the last teacher.
+    "next" is known only after teachers were iterated to the end, before it is None.
+    :param query: Ordered query of teachers.
+    :param limit: How many teachers to return.
+    :param cursor: Function that returns cursor of teacher.
+    :param batch_size: How many rows are fetched from database at once.
+    :return: dict
+    """
+    page = {'next': None}
+
+    def read_teachers() -> Iterator[Teacher]:
+        last = None
+        rows = query.limit(limit + 1).execution_options(stream_results=True) \
+            .yield_per(batch_size)
+        # Extra teacher is read too, so the cursor of database is closed at the end.
+        for number, teacher in enumerate(rows):
+            if number < limit:
+                last = teacher
+                yield teacher
+            else:
+                page['next'] = cursor(last)
+    page['teachers'] = read_teachers()
+    return page
+
+
+def iter_teachers_page(limit: int, after: int = None) -> dict:
+    """
+    Return one page of teachers with universities like get_teachers_page(), but teachers
+    are read while they are iterated (see stream_page()).
+    :param limit: How many teachers to return.
+    :param after: Id of the last teacher from previous page.
+    :return: dict
+    """
+    query = teacher_query(with_university=True).order_by(Teacher.id)
+    if after is not None:
+        query = query.filter(Teacher.id > after)
+    return stream_page(query, limit, lambda teacher: teacher.id)
+
+
+def teacher_rows_query(fields: tuple = TEACHER_FIELDS, with_university: bool = True,
+                       keys: tuple = ('id',)):
+    """
+    Return query of teachers as tuples without creating objects, only asked columns are
+    read. Tuple has columns of keys that are not in fields (they are needed for cursors),
+    columns of fields and, if with_university, UNIVERSITY_ROW_COLUMNS (None for teacher
+    without university). Table university is joined only with_university.
+    :param fields: Names of columns of teacher from TEACHER_FIELDS.
+    :param with_university: Read university of teacher.
+    :param keys: Names of columns that are read even if they are not in fields.
+    :return: Query
+    """
+    names = [key for key in keys if key not in fields] + list(fields)
+    columns = [getattr(Teacher, name).label(name) for name in names]
+    if not with_university:
+        return db.session.query(*columns).select_from(Teacher)
+    return db.session.query(*columns, *UNIVERSITY_ROW_COLUMNS).select_from(Teacher) \
+        .outerjoin(University, Teacher.university_id == University.id)
+
+
+def get_all_teacher_rows(fields: tuple = TEACHER_FIELDS, with_university: bool = True) -> list:
+    """
+    Return every teacher as tuple of teacher_rows_query() ordered by id.
+    :param fields: Names of columns of teacher.
+    :param with_university: Read university of teacher.
     :return: list
     """
-    return Teacher.query.all()
+    return teacher_rows_query(fields, with_university).order_by(Teacher.id).all()
+
+
+def get_teacher_rows_page(limit: int, after: int = None, fields: tuple = TEACHER_FIELDS,
+                          with_university: bool = True) -> tuple:
+    """
+    Return one page of teachers as tuples of teacher_rows_query() like get_teachers_page().
+    :param limit: How many teachers to return.
+    :param after: Id of the last teacher from previous page.
+    :param fields: Names of columns of teacher.
+    :param with_university: Read university of teacher.
+    :return: tuple
+    """
+    query = teacher_rows_query(fields, with_university).order_by(Teacher.id)
+    if after is not None:
+        query = query.filter(Teacher.id > after)
+    rows = query.limit(limit + 1).all()
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = rows[-1].id
+    return rows, next_cursor
+
+
+def get_teacher_row(teacher_id, fields: tuple = TEACHER_FIELDS, with_university: bool = True):
+    """
+    Return teacher with given id as tuple of teacher_rows_query() or None.
+    :param teacher_id: Id of teacher.
+    :param fields: Names of columns of teacher.
+    :param with_university: Read university of teacher.
+    :return: tuple or None
+    """
+    return teacher_rows_query(fields, with_university).filter(Teacher.id == teacher_id).first()
 
 
-def get_teacher(teacher_id) -> Teacher:
+def search_by_date(date_from, date_to, limit: int, after: str = None,
+                   with_total: bool = False, query=None) -> tuple:
+    """
+    Return one page of teachers who were born between two dates ordered by birth date and id,
+    cursor of the next page and number of all found teachers. Page starts right after
+    teacher from cursor, so it is found by index on birth date. Cursor is None if there
+    are no more teachers. Number of teachers is counted only if with_total is True,
+    otherwise it is None. Teachers are objects with universities, or rows if query of rows
+    is given.
+    :param date_from: First date of interval.
+    :param date_to: Last date of interval.
+    :param limit: How many teachers to return.
+    :param after: Cursor that was returned with previous page.
+    :param with_total: Count all found teachers.
+    :param query: Query of teacher_rows_query() with keys id and birth_date.
+    :return: tuple
+    """
+    if query is None:
+        query = teacher_query(with_university=True)
+    query = query.filter(Teacher.birth_date.between(date_from, date_to))
+    total = query.count() if with_total else None
+    teachers = after_date_cursor(query, after).limit(limit + 1).all()
+    next_cursor = None
+    if len(teachers) > limit:
+        teachers = teachers[:limit]
+        next_cursor = date_cursor(teachers[-1])
+    return teachers, next_cursor, total
+
+
+def iter_search_by_date(date_from, date_to, limit: int, after: str = None,
+                        with_total: bool = False) -> dict:
+    """
+    Return one page of teachers with universities who were born between two dates like
+    search_by_date(), but teachers are read while they are iterated (see stream_page()).
+    Number of all found teachers is "total", it is counted at once if with_total is True.
+    Raise ValueError if cursor is wrong.
+    :param date_from: First date of interval.
+    :param date_to: Last date of interval.
+    :param limit: How many teachers to return.
+    :param after: Cursor that was returned with previous page.
+    :param with_total: Count all found teachers.
+    :return: dict
+    """
+    query = teacher_query(with_university=True) \
+        .filter(Teacher.birth_date.between(date_from, date_to))
+    total = query.count() if with_total else None
+    page = stream_page(after_date_cursor(query, after), limit, date_cursor)
+    page['total'] = total
+    return page
+
+
+def after_date_cursor(query, after: str = None):
+    """
+    Return query ordered by birth date and id that starts right after teacher from cursor
+    of search by date. Raise ValueError if cursor is wrong.
+    :param query: Query of teachers.
+    :param after: Cursor that was returned with previous page.
+    :return: Query
+    """
+    if after is not None:
+        birth_date, teacher_id = parse_date_cursor(after)
+        query = query.filter(or_(Teacher.birth_date > birth_date,
+                                 and_(Teacher.birth_date == birth_date, Teacher.id > teacher_id)))
+    return query.order_by(Teacher.birth_date, Teacher.id)
+
+
+def date_cursor(teacher) -> str:
+    """
+    Return cursor of search by date that points to teacher.
+    :param teacher: Teacher or row with birth_date and id.
+    :return: str
+    """
+    return f'{teacher.birth_date.isoformat()}_{teacher.id}'
+
+
+def parse_date_cursor(cursor: str) -> tuple:
+    """
+    Return birth date and id of teacher from cursor of search by date.
+    Raise ValueError if cursor is wrong.
+    :param cursor: Cursor in form "year-month-day_id".
+    :return: tuple
+    """
+    birth_date, _, teacher_id = cursor.partition('_')
+    return datetime.date.fromisoformat(birth_date), int(teacher_id)
+
+
+def iter_teacher_rows(batch_size: int = 1000) -> Iterator[tuple]:
+    """
+    Yield every teacher ordered by id as tuple (id, name, last_name, birth_date, salary,
+    university name). Rows are read with server side cursor batch by batch,
+    so used memory doesn't depend on number of teachers.
+    :param batch_size: How many rows are fetched from database at once.
+    :return: Iterator[tuple]
+    """
+    query = db.session.query(Teacher.id, Teacher.name, Teacher.last_name, Teacher.birth_date,
+                             Teacher.salary, University.name) \
+        .outerjoin(University, Teacher.university_id == University.id) \
+        .order_by(Teacher.id) \
+        .execution_options(stream_results=True) \
+        .yield_per(batch_size)
+    for row in query:
+        yield tuple(row)
+
+
+def get_teacher(teacher_id, with_university: bool = False,
+                for_update: bool = False) -> Teacher:
     """
     Return teacher with given id from database
     :param teacher_id: Id of teacher.
+    :param with_university: Read university of teacher in the same statement.
+    :param for_update: Lock row of teacher until the end of transaction and read it again
+        even if teacher is already in session, so salary and university are not changed
+        by other transaction before aggregates of universities are changed.
     :return: Teacher
     """
-    return Teacher.query.get(teacher_id)
+    query = teacher_query(with_university)
+    if for_update:
+        query = query.with_for_update(of=Teacher).populate_existing()
+    return query.get(teacher_id)
 
 
 def create_teacher(teacher) -> bool:
@@ -40,7 +317,11 @@ def create_teacher(teacher) -> bool:
     """
     try:
         db.session.add(teacher)
+        db.session.flush()
+        universities_crud.change_salary_aggregates(teacher.university_id, int(teacher.salary), 1)
+        table_versions.bump_versions(table_versions.TEACHER)
         db.session.commit()
+        universities_crud.invalidate_cache()
     except Exception as ex:
         db.session.rollback()
         logger.error(str(ex))
@@ -48,6 +329,58 @@ def create_teacher(teacher) -> bool:
     return True
 
 
+def insert_teacher_rows(rows: list, update_aggregates: bool = True) -> None:
+    """
+    Insert teachers with one executemany statement without creating Teacher objects
+    and change salary aggregates of their universities. Changes are made in current
+    transaction, so the caller has to commit them.
+    :param rows: Dicts with keys name, last_name, birth_date, salary, university_id.
+    :param update_aggregates: False if caller rebuilds aggregates itself after all inserts.
+    :return: None
+    """
+    if not rows:
+        return
+    db.session.execute(Teacher.__table__.insert(), rows)
+    table_versions.bump_versions(table_versions.TEACHER)
+    if not update_aggregates:
+        return
+    aggregates = defaultdict(lambda: [0, 0])
+    for row in rows:
+        aggregates[row['university_id']][0] += row['salary']
+        aggregates[row['university_id']][1] += 1
+    for university_id, (salary_sum, teacher_count) in aggregates.items():
+        universities_crud.change_salary_aggregates(university_id, salary_sum, teacher_count)
+
+
+def create_teachers_bulk(rows: list) -> list:
+    """
+    Add many teachers to database in one transaction. If transaction fails every teacher
+    is added separately, so only wrong teachers are not added.
+    Return indexes of rows that were not added.
+    :param rows: Dicts with keys name, last_name, birth_date, salary, university_id.
+    :return: list
+    """
+    try:
+        insert_teacher_rows(rows)
+        db.session.commit()
+        universities_crud.invalidate_cache()
+        return []
+    except Exception as ex:
+        db.session.rollback()
+        logger.error(str(ex))
+    failed = []
+    for index, row in enumerate(rows):
+        try:
+            insert_teacher_rows([row])
+            db.session.commit()
+            universities_crud.invalidate_cache()
+        except Exception as ex:
+            db.session.rollback()
+            logger.error(str(ex))
+            failed.append(index)
+    return failed
+
+
 def update_teacher(name, last_name, birth_date, salary, university, teacher_id: int) -> bool:
     """
     Update teacher from database to given teacher. Return true if teacher was successfully updated
@@ -62,7 +395,8 @@ def update_teacher(name, last_name, birth_date, salary, university, teacher_id:
     """
     is_changed = False
     try:
-        db_teacher = get_teacher(teacher_id)
+        db_teacher = get_teacher(teacher_id, with_university=bool(university), for_update=True)
+        old_university_id, old_salary = db_teacher.university_id, db_teacher.salary
         if name:
             if not name == db_teacher.name:
                 db_teacher.name = name
@@ -86,7 +420,11 @@ def update_teacher(name, last_name, birth_date, salary, university, teacher_id:
         if not is_changed:
             return False
         db.session.flush()
+        universities_crud.move_salary_aggregates(old_university_id, old_salary,
+                                                 db_teacher.university_id, int(db_teacher.salary))
+        table_versions.bump_versions(table_versions.TEACHER)
         db.session.commit()
+        universities_crud.invalidate_cache()
     except Exception as ex:
         db.session.rollback()
         logger.error(str(ex))
@@ -101,8 +439,15 @@ def delete_teacher(teacher_id) -> bool:
     :return: bool
     """
     try:
-        Teacher.query.filter(Teacher.id == teacher_id).delete()
+        query = Teacher.query.filter(Teacher.id == teacher_id)
+        teacher = query.with_entities(Teacher.university_id, Teacher.salary) \
+            .with_for_update().first()
+        if query.delete() and teacher:
+            universities_crud.change_salary_aggregates(teacher.university_id,
+                                                       -teacher.salary, -1)
+            table_versions.bump_versions(table_versions.TEACHER)
         db.session.commit()
+        universities_crud.invalidate_cache()
     except Exception as ex:
         db.session.rollback()
         logger.error(str(ex))
@@ -124,7 +469,11 @@ def update_teacher_api(teacher_id, name, last_name, birth_date, salary, universi
     if not name and not last_name and not birth_date and not salary and not university:
         logger.debug('No data was given')
         return {'error': {'message': f'No data was given.', 'status': 400}}
-    db_teacher = get_teacher(teacher_id)
+    db_teacher = get_teacher(teacher_id, with_university=True, for_update=True)
+    if not db_teacher:
+        logger.debug('Wrong teacher id')
+        return {'error': {'message': 'Wrong teacher id.', 'status': 400}}
+    old_university_id, old_salary = db_teacher.university_id, db_teacher.salary
     if university:
         university_db = University.query.filter_by(name=university).first()
         if not university_db:
@@ -159,7 +508,11 @@ def update_teacher_api(teacher_id, name, last_name, birth_date, salary, universi
             logger.debug('User entered date in incorrect format.')
             return {'error': {'message': 'Incorrect date format.', 'status': 400}}
     db.session.flush()
+    universities_crud.move_salary_aggregates(old_university_id, old_salary,
+                                             db_teacher.university_id, db_teacher.salary)
+    table_versions.bump_versions(table_versions.TEACHER)
     db.session.commit()
+    universities_crud.invalidate_cache()
     return db_teacher
 
 
@@ -170,11 +523,15 @@ def delete_teacher_api(teacher_id) -> dict:
     :return: Teacher
     """
     try:
-        teacher = Teacher.query.filter(Teacher.id == teacher_id).first()
+        teacher = teacher_query(with_university=True).filter(Teacher.id == teacher_id) \
+            .with_for_update(of=Teacher).first()
         res = Teacher.query.filter(Teacher.id == teacher_id).delete()
         if not res:
             return {'error': {'message': 'No teacher was found with given id', 'status': 400}}
+        universities_crud.change_salary_aggregates(teacher.university_id, -teacher.salary, -1)
+        table_versions.bump_versions(table_versions.TEACHER)
         db.session.commit()
+        universities_crud.invalidate_cache()
     except Exception as ex:
         logger.error(str(ex))
         db.session.rollback()
@@ -3,53 +3,251 @@ This module demonstrates CRUD operations for university model.
 
 It has CRUD functions for website application and for REST-API.
 
-This module includes functions: get_all_universities(), get_university(), create_university(),
+This module includes functions: get_cache(), invalidate_cache(), copy_university(),
+get_all_universities(), iter_universities(), change_salary_aggregates(),
+move_salary_aggregates(), rebuild_salary_aggregates(), get_university(),
+get_universities_by_names(), create_university(),
 update_university(),delete_university(), create_university_api(), delete_university_api(),
 update_university_api().
 
-This module imports: typing.Any, sqlalchemy.func, app, University, Teacher.
+Universities are read through in-process cache (see service.cache). Cache keeps copies
+of universities that don't belong to any session, so they are only for reading; functions
+that change universities load them from database. Every function that changes
+universities or their salary aggregates clears the cache of its worker after commit,
+other workers see the change after UNIVERSITY_CACHE_TTL at most. Routes that need data
+of current version of table (see rest.conditional) read universities with use_cache=False.
+
+Every function that changes universities also changes version of table university
+in the same transaction, deleting university changes version of table teacher too,
+because its teachers are deleted by cascade.
+
+This module imports: typing.Any, typing.Iterator, flask.current_app, sqlalchemy.case,
+sqlalchemy.func, sqlalchemy.text, app, University, Teacher, LRUCache, table_versions.
 """
-from typing import Any
+from typing import Any, Iterator
+from flask import current_app
+from sqlalchemy import case
 from sqlalchemy import func
+from sqlalchemy import text
 from app import db
 from app import logger
 from models.university import University
 from models.teacher import Teacher
+from service import table_versions
+from service.cache import LRUCache
+
+REBUILD_AGGREGATES_MYSQL = """
+UPDATE university
+LEFT JOIN (SELECT university_id, SUM(salary) AS salary_sum, COUNT(*) AS teacher_count,
+                  AVG(salary) AS average_salary
+           FROM teacher GROUP BY university_id) AS aggregates
+       ON aggregates.university_id = university.id
+SET university.salary_sum = COALESCE(aggregates.salary_sum, 0),
+    university.teacher_count = COALESCE(aggregates.teacher_count, 0),
+    university.average_salary = COALESCE(ROUND(aggregates.average_salary), 0)
+"""
+# SQLite doesn't support UPDATE with JOIN, so aggregates are read with correlated subqueries.
+REBUILD_AGGREGATES = """
+UPDATE university
+SET salary_sum = COALESCE((SELECT SUM(salary) FROM teacher
+                           WHERE teacher.university_id = university.id), 0),
+    teacher_count = (SELECT COUNT(*) FROM teacher
+                     WHERE teacher.university_id = university.id),
+    average_salary = COALESCE((SELECT ROUND(AVG(salary)) FROM teacher
+                               WHERE teacher.university_id = university.id), 0)
+"""
+
+
+def get_cache() -> LRUCache:
+    """
+    Return cache of universities of current application, it is made on first use
+    with size UNIVERSITY_CACHE_SIZE and time to live UNIVERSITY_CACHE_TTL from config.
+    :return: LRUCache
+    """
+    cache = current_app.extensions.get('university_cache')
+    if cache is None:
+        cache = current_app.extensions.setdefault('university_cache', LRUCache(
+            'university', current_app.config['UNIVERSITY_CACHE_SIZE'],
+            current_app.config['UNIVERSITY_CACHE_TTL']))
+    return cache
+
+
+def invalidate_cache() -> None:
+    """
+    Remove every university from cache. It is called after commit, so cache can't be
+    filled again with data from before the change.
+    :return: None
+    """
+    get_cache().clear()
 
 
-def get_all_universities() -> Any:
+def copy_university(university) -> University:
     """
-    Returns a list of all universities from database. READ method for CRUD controller.
-    It also updates average_salary of university where it changed.
+    Return copy of university for cache that doesn't belong to any session,
+    so it can be read by every thread. None is returned as None.
+    :param university: University from database.
+    :return: University
+    """
+    if university is None:
+        return None
+    copy = University(university.name, university.location, university.average_salary)
+    copy.id = university.id
+    copy.salary_sum = university.salary_sum
+    copy.teacher_count = university.teacher_count
+    return copy
+
+
+def get_all_universities(use_cache: bool = True, raise_errors: bool = False) -> Any:
+    """
+    Returns a list of all universities from cache or from database. READ method for CRUD
+    controller. Average salary of university is kept up to date by functions that change
+    teachers, so reading doesn't count it and doesn't write anything to database.
+    Universities from cache must not be changed.
+    :param use_cache: False to read universities from database in current transaction.
+    :param raise_errors: True to raise error of database instead of returning empty list.
     :return: Any
     """
+    cache = get_cache()
     try:
-        universities = University.query.all()
-        average_list = list(Teacher.query.with_entities(
-            Teacher.university_id, func.avg(Teacher.salary)).group_by(
-            Teacher.university_id).all())
-        for i in range(len(average_list)):
-            print(average_list[i])
+        if not use_cache or not cache.enabled:
+            return University.query.all()
+        return cache.get_or_load('all', lambda: [copy_university(university)
+                                                 for university in University.query.all()])
     except Exception as ex:
+        if raise_errors:
+            raise
         logger.error(str(ex))
         return []
-    for i in range(len(average_list)):
-        for j in range(len(universities)):
-            if universities[j].id == average_list[i][0]:
-                if universities[j].average_salary != average_list[i][1]:
-                    universities[j].average_salary = average_list[i][1]
-                db.session.flush()
-                db.session.commit()
-    return universities
 
 
-def get_university(university_id) -> University:
+def iter_universities(batch_size: int = 100) -> dict:
+    """
+    Return dict with key "universities" - iterator of every university and key "error".
+    If cache is turned on, universities are taken from it, otherwise they are read with
+    server side cursor batch by batch while they are iterated. Error of database is
+    written to log, stops iteration and sets "error" to True, so page that is already
+    sent can show that list isn't complete. Universities from cache must not be changed.
+    :param batch_size: How many rows are fetched from database at once.
+    :return: dict
+    """
+    page = {'error': False}
+
+    def read_universities() -> Iterator[University]:
+        if get_cache().enabled:
+            yield from get_all_universities()
+            return
+        try:
+            yield from University.query.execution_options(stream_results=True) \
+                .yield_per(batch_size)
+        except Exception as ex:
+            logger.error(str(ex))
+            page['error'] = True
+
+    page['universities'] = read_universities()
+    return page
+
+
+def change_salary_aggregates(university_id, salary_delta: int, count_delta: int) -> None:
     """
-    Get university with given id
+    Add salary_delta to sum of salaries and count_delta to number of teachers of university
+    with given id and recount its average salary. Changes are made in current transaction,
+    so the caller has to commit them.
     :param university_id: Id of university.
+    :param salary_delta: How much sum of salaries has changed.
+    :param count_delta: How much number of teachers has changed.
+    :return: None
+    """
+    if university_id is None:
+        return
+    university_query = University.query.filter(University.id == university_id)
+    university_query.update({University.salary_sum: University.salary_sum + salary_delta,
+                             University.teacher_count: University.teacher_count + count_delta},
+                            synchronize_session=False)
+    # Average salary is counted in separate statement because MySQL uses already updated
+    # values in SET clause and other databases use old ones.
+    university_query.update({University.average_salary: case(
+        (University.teacher_count > 0,
+         func.round(University.salary_sum * 1.0 / University.teacher_count)),
+        else_=0)}, synchronize_session=False)
+    table_versions.bump_versions(table_versions.UNIVERSITY)
+
+
+def move_salary_aggregates(old_university_id, old_salary: int,
+                           new_university_id, new_salary: int) -> None:
+    """
+    Change aggregates of universities after teacher's salary or university was updated.
+    Changes are made in current transaction, so the caller has to commit them.
+    :param old_university_id: Id of university where teacher worked before update.
+    :param old_salary: Teacher's salary before update.
+    :param new_university_id: Id of university where teacher works after update.
+    :param new_salary: Teacher's salary after update.
+    :return: None
+    """
+    if old_university_id == new_university_id:
+        if old_salary != new_salary:
+            change_salary_aggregates(new_university_id, new_salary - old_salary, 0)
+        return
+    change_salary_aggregates(old_university_id, -old_salary, -1)
+    change_salary_aggregates(new_university_id, new_salary, 1)
+
+
+def rebuild_salary_aggregates() -> int:
+    """
+    Count sum of salaries, number of teachers and average salary of every university
+    from scratch with one UPDATE statement in one transaction. It is used to repair
+    aggregates if teachers were changed not through CRUD functions.
+    Return number of universities.
+    :return: int
+    """
+    if db.engine.dialect.name == 'mysql':
+        statement = REBUILD_AGGREGATES_MYSQL
+    else:
+        statement = REBUILD_AGGREGATES
+    try:
+        result = db.session.execute(text(statement))
+        table_versions.bump_versions(table_versions.UNIVERSITY)
+        db.session.commit()
+    except Exception as ex:
+        db.session.rollback()
+        logger.error(str(ex))
+        raise
+    invalidate_cache()
+    return result.rowcount
+
+
+def get_university(university_id, use_cache: bool = True) -> University:
+    """
+    Get university with given id from cache or from database. University from cache
+    must not be changed, functions that change university use use_cache=False.
+    :param university_id: Id of university.
+    :param use_cache: False to get university from current session.
     :return: University
     """
-    return University.query.get(university_id)
+    cache = get_cache()
+    if not use_cache or not cache.enabled:
+        return University.query.get(university_id)
+    return cache.get_or_load(('id', university_id),
+                             lambda: copy_university(University.query.get(university_id)))
+
+
+def get_universities_by_names(names, chunk_size: int = None) -> dict:
+    """
+    Get universities with given names with one query for every chunk of names, so list
+    of names in statement doesn't exceed limits of database for any number of names.
+    Return dict where key is name of university and value is university.
+    :param names: Names of universities.
+    :param chunk_size: How many names are in one query, BULK_CHUNK_SIZE from config
+        by default.
+    :return: dict
+    """
+    names = sorted(set(names))
+    chunk_size = chunk_size or current_app.config['BULK_CHUNK_SIZE']
+    universities = {}
+    for start in range(0, len(names), chunk_size):
+        chunk = names[start:start + chunk_size]
+        universities.update((university.name, university) for university in
+                            University.query.filter(University.name.in_(chunk)))
+    return universities
 
 
 def create_university(university) -> bool:
@@ -61,11 +259,13 @@ def create_university(university) -> bool:
     """
     try:
         db.session.add(university)
+        table_versions.bump_versions(table_versions.UNIVERSITY)
         db.session.commit()
     except Exception as ex:
         db.session.rollback()
         logger.error(str(ex))
         return False
+    invalidate_cache()
     return True
 
 
@@ -78,7 +278,7 @@ def update_university(university, university_id) -> bool:
     """
     is_changed = False
     try:
-        db_university = get_university(university_id)
+        db_university = get_university(university_id, use_cache=False)
         if university.name:
             if not university.name == db_university.name:
                 db_university.name = university.name
@@ -90,11 +290,13 @@ def update_university(university, university_id) -> bool:
         if not is_changed:
             return False
         db.session.flush()
+        table_versions.bump_versions(table_versions.UNIVERSITY)
         db.session.commit()
     except Exception as ex:
         db.session.rollback()
         logger.error(str(ex))
         return False
+    invalidate_cache()
     return True
 
 
@@ -106,11 +308,13 @@ def delete_university(university_id) -> bool:
     """
     try:
         University.query.filter(University.id == university_id).delete()
+        table_versions.bump_versions(table_versions.UNIVERSITY, table_versions.TEACHER)
         db.session.commit()
     except Exception as ex:
         db.session.rollback()
         logger.error(str(ex))
         return False
+    invalidate_cache()
     return True
 
 
@@ -133,12 +337,14 @@ def create_university_api(name, location) -> dict:
     university = University(name, location)
     try:
         db.session.add(university)
+        table_versions.bump_versions(table_versions.UNIVERSITY)
         db.session.commit()
     except Exception as ex:
         db.session.rollback()
         logger.error(str(ex))
         return {'error': {'message': 'Error of adding to db',
                           'status': 412}}
+    invalidate_cache()
     return university
 
 
@@ -154,12 +360,14 @@ def delete_university_api(university_id) -> dict:
         if not university:
             return {'error': {'message': 'No university was found with given id.',
                               'status': 412}}
+        table_versions.bump_versions(table_versions.UNIVERSITY, table_versions.TEACHER)
         db.session.commit()
     except Exception as ex:
         db.session.rollback()
         logger.error(str(ex))
         return {'error': {'message': 'Error of adding to db',
                           'status': 412}}
+    invalidate_cache()
     return university
 
 
@@ -172,7 +380,7 @@ def update_university_api(university_id, name, location) -> dict:
     :return: dict
     """
     try:
-        university = get_university(university_id)
+        university = get_university(university_id, use_cache=False)
         if not university:
             return {'error': {'message': 'No university was found with given id', 'status': 400}}
         is_changed = False
@@ -200,9 +408,11 @@ def update_university_api(university_id, name, location) -> dict:
         if not is_changed:
             return {'error': {'message': 'No new data was given', 'status': 400}}
         db.session.flush()
+        table_versions.bump_versions(table_versions.UNIVERSITY)
         db.session.commit()
     except Exception as ex:
         db.session.rollback()
         logger.error(str(ex))
         return {'error': {'message': 'Error to update university to db', 'status': 412}}
+    invalidate_cache()
     return university
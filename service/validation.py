@@ -0,0 +1,49 @@
+"""
+This module validates data of teachers that is sent to REST-API.
+
+Validation is shared by endpoints that create one teacher and many teachers at once,
+so the same rules are applied everywhere.
+
+This module includes functions: validate_teacher().
+
+This module imports: datetime, typing.Callable, typing.Union, app.
+"""
+import datetime
+from typing import Callable, Union
+from app import logger
+
+
+def validate_teacher(data: dict, find_university: Callable) -> Union[dict, tuple]:
+    """
+    Validate data of new teacher. Return dict with error or tuple (name, last_name,
+    birth_date, salary, university) with values that are ready for database.
+    :param data: Dict with keys name, last_name, birth_date, salary, university.
+    :param find_university: Function that returns university by its name or None.
+    :return: Union[dict, tuple]
+    """
+    name = data.get('name')
+    last_name = data.get('last_name')
+    birth_date = data.get('birth_date')
+    salary = data.get('salary')
+    university = data.get('university')
+    if not name or not last_name or not birth_date or not salary or not university:
+        logger.debug("User did not entered some data")
+        return {'error': {'message': 'Some data was not written', 'status': 400}}
+    try:
+        university_db = find_university(university)
+        if not university_db:
+            return {'error': {'message': 'Wrong university name.', 'status': 400}}
+    except Exception as ex:
+        logger.error(str(ex))
+        return {'error': {'message': 'Wrong university name.', 'status': 400}}
+
+    try:
+        birth_date = datetime.datetime.strptime(birth_date, "%Y-%m-%d")
+    except (TypeError, ValueError):
+        logger.debug('User entered date in incorrect format.')
+        return {'error': {'message': 'Incorrect date format.', 'status': 400}}
+    if not isinstance(salary, int):
+        logger.debug('User entered salary in incorrect format.')
+        return {'error': {'message': 'Incorrect salary format.'
+                                     ' Salary must be integer.', 'status': 400}}
+    return name, last_name, birth_date, salary, university_db
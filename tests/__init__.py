@@ -2,4 +2,15 @@
 This module contains all test for the website
 
 Module include a module test.
+
+Application for tests uses in-memory SQLite database, so tests never change
+real database. Cache of universities is turned off, so tests always read database,
+it is tested in test_university_cache.
 """
+from app import create_app, db
+
+app = create_app({'TESTING': True, 'SQLALCHEMY_DATABASE_URI': 'sqlite://',
+                  'UNIVERSITY_CACHE_SIZE': 0})
+
+with app.app_context():
+    db.create_all()
@@ -0,0 +1,116 @@
+"""
+This module run tests for modules rest.conditional and service.table_versions.
+
+This module contains class TestConditional.
+
+This module imports: tests.app, unittest.TestCase, unittest.mock.patch,
+sqlalchemy.create_engine, db, TableVersion, table_versions, universities_crud
+"""
+from tests import app
+from unittest import TestCase
+from unittest.mock import patch
+from sqlalchemy import create_engine
+from app import db
+from models.table_version import TableVersion
+from service import table_versions
+from service import universities_crud
+
+
+class TestConditional(TestCase):
+    """
+    This class runs all tests for conditional GET requests.
+
+    It includes: setUp, test_bump_versions, test_not_modified, test_changed_table,
+    test_if_modified_since
+
+    It inherited from class TestCase
+    """
+
+    def setUp(self) -> None:
+        """
+        Set up client of application.
+        :return: None
+        """
+        self.client = app.test_client()
+
+    def test_bump_versions(self) -> None:
+        """
+        Test that versions are increased and missing versions are made, versions
+        of teacher and university are added with table.
+        :return: None
+        """
+        engine = create_engine('sqlite://')
+        db.metadata.create_all(engine)
+        with engine.connect() as connection:
+            rows = connection.execute(TableVersion.__table__.select()).all()
+        self.assertEqual([(row.table_name, row.version) for row in rows],
+                         [('teacher', 1), ('university', 1)])
+        with app.app_context():
+            self.assertEqual(table_versions.get_versions('test_table'), ((0,), None))
+            table_versions.bump_versions('test_table')
+            table_versions.bump_versions('test_table')
+            db.session.commit()
+            versions, last_modified = table_versions.get_versions('test_table', 'missing')
+            self.assertEqual(versions, (2, 0))
+            self.assertIsNotNone(last_modified)
+
+    @patch('rest.restapi.universities_crud')
+    def test_not_modified(self, u_crud) -> None:
+        """
+        Test that client with the same ETag gets 304 without reading universities.
+        :param u_crud: Mock universities_crud
+        :return: None
+        """
+        u_crud.get_all_universities.return_value = []
+        response = self.client.get('/api/university')
+        self.assertEqual(response.status_code, 200)
+        etag = response.headers['ETag']
+        self.assertRegex(etag, r'^W/"university\.\d+"$')
+        u_crud.reset_mock()
+        response = self.client.get('/api/university', headers={'If-None-Match': etag})
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.data, b'')
+        self.assertEqual(response.headers['ETag'], etag)
+        u_crud.get_all_universities.assert_not_called()
+        # Test if ETag of other data is sent
+        response = self.client.get('/api/university', headers={'If-None-Match': 'W/"other"'})
+        self.assertEqual(response.status_code, 200)
+
+    def test_changed_table(self) -> None:
+        """
+        Test that change of table made by CRUD function changes ETag.
+        :return: None
+        """
+        teachers_etag = self.client.get('/api/').headers['ETag']
+        self.assertRegex(teachers_etag, r'^W/"teacher\.\d+-university\.\d+"$')
+        etag = self.client.get('/api/university').headers['ETag']
+        with app.app_context():
+            universities_crud.create_university_api('Conditional', 'Test')
+        response = self.client.get('/api/university', headers={'If-None-Match': etag})
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response.headers['ETag'], etag)
+        self.assertIn(b'Conditional', response.data)
+        response = self.client.get('/api/', headers={'If-None-Match': teachers_etag})
+        self.assertEqual(response.status_code, 200)
+
+    def test_if_modified_since(self) -> None:
+        """
+        Test that date of the last change is sent, but client gets 304 only by ETag,
+        because date of change made in the same second is the same.
+        :return: None
+        """
+        with app.app_context():
+            table_versions.bump_versions(table_versions.UNIVERSITY)
+            db.session.commit()
+        response = self.client.get('/api/university')
+        last_modified = response.headers['Last-Modified']
+        response = self.client.get('/api/university',
+                                   headers={'If-Modified-Since': last_modified})
+        self.assertEqual(response.status_code, 200)
+        with app.app_context():
+            table_versions.bump_versions(table_versions.UNIVERSITY)
+            db.session.commit()
+        response = self.client.get('/api/university',
+                                   headers={'If-Modified-Since': last_modified,
+                                            'If-None-Match': response.headers['ETag']})
+        self.assertEqual(response.status_code, 200)
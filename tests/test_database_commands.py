@@ -0,0 +1,56 @@
+"""
+This module run tests for commands in module commands.database.
+
+This module contains class TestDatabaseCommands. Commands are run on SQLite file
+in temporary directory.
+
+This module imports: os, tempfile, unittest.TestCase, app, University, Teacher
+"""
+import os
+import tempfile
+from unittest import TestCase
+from app import create_app
+from models.university import University
+from models.teacher import Teacher
+
+
+class TestDatabaseCommands(TestCase):
+    """
+    This class runs all tests for the module commands.database.
+
+    It includes: setUp, test_create_db_and_seed
+
+    It inherited from class TestCase
+    """
+
+    def setUp(self) -> None:
+        """
+        Set up application with SQLite file that doesn't exist yet.
+        :return: None
+        """
+        path = os.path.join(tempfile.mkdtemp(), 'test.db')
+        self.app = create_app({'TESTING': True, 'SQLALCHEMY_DATABASE_URI': f'sqlite:///{path}'})
+        self.runner = self.app.test_cli_runner()
+
+    def test_create_db_and_seed(self) -> None:
+        """
+        Test that database is created only by commands and example data is added once.
+        :return: None
+        """
+        # Test if database doesn't exist
+        result = self.runner.invoke(args=['create-db'])
+        self.assertEqual(result.exit_code, 0)
+        self.assertIn('Database was created', result.output)
+        # Test if database exists
+        result = self.runner.invoke(args=['create-db'])
+        self.assertEqual(result.output, 'Tables were created.\n')
+        # Test if database is empty
+        result = self.runner.invoke(args=['seed'])
+        self.assertEqual(result.exit_code, 0)
+        with self.app.app_context():
+            self.assertEqual(University.query.count(), 5)
+            self.assertEqual(Teacher.query.count(), 10)
+        # Test if database is not empty
+        result = self.runner.invoke(args=['seed'])
+        self.assertEqual(result.exit_code, 1)
+        self.assertIn('Database is not empty', result.output)
@@ -0,0 +1,80 @@
+"""
+This module run tests for functions in module commands.generate_data.
+
+This module contains class TestGenerateData.
+
+This module imports: app, os, random, tempfile, unittest.TestCase, unittest.mock.patch,
+db, University, generate_data
+"""
+import os
+import random
+import tempfile
+from unittest import TestCase
+from unittest.mock import patch
+from tests import app
+from app import create_app, db
+from models.university import University
+from commands import generate_data
+
+app.testing = True
+
+
+class TestGenerateData(TestCase):
+    """
+    This class runs all tests for the module commands.generate_data.
+
+    It includes: test_generate_universities, test_generate_teachers,
+    test_generate_after_delete
+
+    It inherited from class TestCase
+    """
+
+    def test_generate_universities(self) -> None:
+        """
+        Test that names of generated universities are unique and allowed in REST-API.
+        :return: None
+        """
+        universities = generate_data.generate_universities(500, random.Random(1))
+        names = [university['name'] for university in universities]
+        self.assertEqual(len(set(names)), 500)
+        self.assertTrue(all(name.isalnum() for name in names))
+
+    def test_generate_teachers(self) -> None:
+        """
+        Test that teachers are generated in chunks, with the same seed they are the same
+        and their values are in allowed ranges.
+        :return: None
+        """
+        chunks = list(generate_data.generate_teachers(2500, [1, 2, 3], random.Random(1), 1000))
+        self.assertEqual([len(chunk) for chunk in chunks], [1000, 1000, 500])
+        same_chunks = list(generate_data.generate_teachers(2500, [1, 2, 3],
+                                                           random.Random(1), 1000))
+        self.assertEqual(chunks, same_chunks)
+        teachers = [teacher for chunk in chunks for teacher in chunk]
+        self.assertTrue(all(500 <= teacher['salary'] <= 10000 for teacher in teachers))
+        self.assertTrue(all(teacher['university_id'] in (1, 2, 3) for teacher in teachers))
+        self.assertTrue(all(1946 <= teacher['birth_date'].year <= 1999 for teacher in teachers))
+
+    def test_generate_after_delete(self) -> None:
+        """
+        Test that command generates new names when some universities were deleted.
+        :return: None
+        """
+        url = f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'test.db')}"
+        file_app = create_app({'TESTING': True, 'SQLALCHEMY_DATABASE_URI': url})
+        with file_app.app_context():
+            db.create_all()
+        runner = file_app.test_cli_runner()
+        arguments = ['generate-data', '--universities', '3', '--teachers', '0']
+        self.assertEqual(runner.invoke(args=arguments).exit_code, 0)
+        with file_app.app_context():
+            University.query.filter(University.id == 1).delete()
+            db.session.commit()
+        with patch('commands.generate_data.generate_universities',
+                   wraps=generate_data.generate_universities) as generate:
+            result = runner.invoke(args=arguments)
+        self.assertEqual(result.exit_code, 0, result.output)
+        # Numbers of names continue after the greatest id, not after number of rows
+        self.assertEqual(generate.call_args[0][2], 4)
+        with file_app.app_context():
+            self.assertEqual(University.query.count(), 5)
@@ -0,0 +1,98 @@
+"""
+This module run tests for command in module commands.import_teachers.
+
+This module contains class TestImportTeachers.
+
+This module imports: app, datetime, os, tempfile, unittest.TestCase, unittest.mock.patch,
+University, import_teachers
+"""
+import datetime
+import os
+import tempfile
+from unittest import TestCase
+from unittest.mock import patch
+from tests import app
+from models.university import University
+from commands import import_teachers
+
+university1 = University('Test1', 'Test1')
+university1.id = 1
+app.testing = True
+
+
+class TestImportTeachers(TestCase):
+    """
+    This class runs all tests for the module commands.import_teachers.
+
+    It includes: test_read_teacher_file, test_import_teachers
+
+    It inherited from class TestCase
+    """
+
+    def write_file(self, suffix: str, text: str) -> str:
+        """
+        Write text to temporary file that is deleted after test.
+        :param suffix: Extension of file.
+        :param text: Text of file.
+        :return: str
+        """
+        descriptor, path = tempfile.mkstemp(suffix=suffix)
+        with os.fdopen(descriptor, 'w') as file:
+            file.write(text)
+        self.addCleanup(os.remove, path)
+        return path
+
+    def test_read_teacher_file(self) -> None:
+        """
+        Test to read teachers from CSV and JSON lines files.
+        :return: None
+        """
+        # Test if file is CSV
+        path = self.write_file('.csv', 'name,last_name,birth_date,salary,university\n'
+                                       'Name1,Last1,2011-11-01,1000,Test1\n'
+                                       'Name2,Last2,2011-11-01,10a0,Test1\n')
+        result = list(import_teachers.read_teacher_file(path))
+        self.assertEqual(result, [
+            (2, {'name': 'Name1', 'last_name': 'Last1', 'birth_date': '2011-11-01',
+                 'salary': 1000, 'university': 'Test1'}),
+            (3, {'name': 'Name2', 'last_name': 'Last2', 'birth_date': '2011-11-01',
+                 'salary': '10a0', 'university': 'Test1'})])
+        # Test if file is JSON lines
+        path = self.write_file('.jsonl', '{"name": "Name1"}\n\nnot json\n')
+        result = list(import_teachers.read_teacher_file(path))
+        self.assertEqual(result, [(1, {'name': 'Name1'}), (3, None)])
+
+    @patch('commands.import_teachers.db')
+    @patch('commands.import_teachers.teachers_crud')
+    @patch('commands.import_teachers.University')
+    def test_import_teachers(self, university, t_crud, db) -> None:
+        """
+        Test to import teachers in chunks.
+        :param university: Mock class University
+        :param t_crud: Mock teachers_crud
+        :param db: Mock class SQLAlchemy
+        :return: None
+        """
+        university.query.all.return_value = [university1]
+        path = self.write_file('.csv', 'name,last_name,birth_date,salary,university\n'
+                                       'Name1,Last1,2011-11-01,1000,Test1\n'
+                                       'Name2,Last2,2011-11-01,900,Wrong\n'
+                                       'Name3,Last3,2011-11-01,800,Test1\n'
+                                       'Name4,Last4,2011-11-01,700,Test1\n')
+        runner = app.test_cli_runner(mix_stderr=False)
+        # Test if everything is correct
+        result = runner.invoke(args=['import-teachers', path, '--chunk-size', '2'])
+        self.assertEqual(result.exit_code, 0)
+        self.assertIn('Imported 3 teachers, skipped 1', result.output)
+        self.assertIn('Line 3 was skipped: Wrong university name.', result.stderr)
+        self.assertEqual(t_crud.insert_teacher_rows.call_count, 2)
+        t_crud.insert_teacher_rows.assert_called_with([
+            {'name': 'Name4', 'last_name': 'Last4', 'birth_date': datetime.date(2011, 11, 1),
+             'salary': 700, 'university_id': 1}])
+        self.assertEqual(db.session.commit.call_count, 2)
+        # Test if chunk can't be inserted
+        t_crud.insert_teacher_rows.side_effect = Exception('error')
+        result = runner.invoke(args=['import-teachers', path])
+        self.assertEqual(result.exit_code, 1)
+        self.assertIn('Import was stopped after 0 teachers: error', result.stderr)
+        db.session.rollback.assert_called_once()
@@ -0,0 +1,69 @@
+"""
+This module run tests for function in module commands.indexes.
+
+This module contains class TestIndexes. Plans are read from in-memory SQLite database
+with tables of models, so it checks indexes that are declared in models.
+
+This module imports: app, sqlalchemy.create_engine, sqlalchemy.text, unittest.TestCase,
+unittest.mock.MagicMock, db, indexes
+"""
+from unittest import TestCase
+from unittest.mock import MagicMock
+from sqlalchemy import create_engine
+from sqlalchemy import text
+from app import db
+from tests import app
+from commands import indexes
+
+app.testing = True
+
+
+class TestIndexes(TestCase):
+    """
+    This class runs all tests for the module commands.indexes.
+
+    It includes: test_explain_index_usage, test_explain_index_usage_mysql
+
+    It inherited from class TestCase
+    """
+
+    def test_explain_index_usage(self) -> None:
+        """
+        Test that SQLite uses indexes from models for hot queries and that query
+        without index is found.
+        :return: None
+        """
+        engine = create_engine('sqlite://')
+        db.metadata.create_all(engine)
+        # Test if every index exists
+        with engine.connect() as connection:
+            results = indexes.explain_index_usage(connection)
+        self.assertEqual([(name, used_index) for name, _, used_index, _ in results],
+                         [('search_by_date', 'ix_teacher_birth_date'),
+                          ('teachers_of_university', 'ix_teacher_university_id'),
+                          ('university_by_name', 'ix_university_name')])
+        # Test if index doesn't exist
+        engine = create_engine('sqlite://')
+        db.metadata.create_all(engine)
+        with engine.connect() as connection:
+            connection.execute(text('DROP INDEX ix_teacher_birth_date'))
+            results = indexes.explain_index_usage(connection)
+        self.assertIsNone(results[0][2])
+        self.assertIn('SCAN', results[0][3])
+
+    def test_explain_index_usage_mysql(self) -> None:
+        """
+        Test that on MySQL query is OK only if plan uses expected index.
+        :return: None
+        """
+        connection = MagicMock()
+        connection.dialect.name = 'mysql'
+        connection.execute.return_value.mappings.return_value.all.side_effect = [
+            [{'table': 'teacher', 'type': 'range', 'key': 'ix_teacher_birth_date'}],
+            [{'table': 'teacher', 'type': 'ref', 'key': 'PRIMARY'}],
+            [{'table': 'university', 'type': 'ALL', 'key': None}],
+        ]
+        results = indexes.explain_index_usage(connection)
+        self.assertEqual([used_index for _, _, used_index, _ in results],
+                         ['ix_teacher_birth_date', None, None])
+        self.assertEqual(results[1][3], 'teacher: type=ref key=PRIMARY')
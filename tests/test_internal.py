@@ -0,0 +1,60 @@
+"""
+This module run tests for function in module instrumentation.internal.
+
+This module contains class TestInternal.
+
+This module imports: ipaddress, os, tempfile, unittest.TestCase, app, internal
+"""
+import ipaddress
+import os
+import tempfile
+from unittest import TestCase
+from app import create_app
+from instrumentation import internal
+
+
+class TestInternal(TestCase):
+    """
+    This class runs all tests for the module instrumentation.internal.
+
+    It includes: make_app, test_allowed_networks, test_internal_routes
+
+    It inherited from class TestCase
+    """
+
+    @staticmethod
+    def make_app(networks: str):
+        """
+        Return application whose internal routes answer given networks.
+        :param networks: Addresses and networks separated by comma.
+        :return: Flask
+        """
+        url = f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'test.db')}"
+        return create_app({'TESTING': True, 'SQLALCHEMY_DATABASE_URI': url,
+                           'INTERNAL_ALLOWED_NETWORKS': internal.allowed_networks(networks)})
+
+    def test_allowed_networks(self) -> None:
+        """
+        Test that addresses and networks are parsed and wrong value is not accepted.
+        :return: None
+        """
+        self.assertEqual(internal.allowed_networks('127.0.0.1, 10.0.0.0/8,'),
+                         [ipaddress.ip_network('127.0.0.1'), ipaddress.ip_network('10.0.0.0/8')])
+        self.assertEqual(internal.allowed_networks(''), [])
+        with self.assertRaises(ValueError):
+            internal.allowed_networks('localhost')
+
+    def test_internal_routes(self) -> None:
+        """
+        Test that /metrics and /internal/pool answer only allowed clients.
+        :return: None
+        """
+        client = self.make_app('127.0.0.1,::1').test_client()
+        outside = {'REMOTE_ADDR': '203.0.113.5'}
+        for url in ('/metrics', '/internal/pool'):
+            self.assertEqual(client.get(url).status_code, 200, url)
+            self.assertEqual(client.get(url, environ_base=outside).status_code, 404, url)
+        # Test if network of monitoring is allowed
+        client = self.make_app('203.0.113.0/24').test_client()
+        self.assertEqual(client.get('/metrics', environ_base=outside).status_code, 200)
+        self.assertEqual(client.get('/metrics').status_code, 404)
@@ -0,0 +1,66 @@
+"""
+This module run tests for function in module instrumentation.log_queue.
+
+This module contains class TestLogQueue. Log files are written to temporary directory.
+
+This module imports: atexit, gzip, logging, os, tempfile, unittest.TestCase, unittest.mock.patch,
+log_queue
+"""
+import atexit
+import gzip
+import logging
+import os
+import tempfile
+from unittest import TestCase
+from unittest.mock import patch
+from instrumentation import log_queue
+
+
+class TestLogQueue(TestCase):
+    """
+    This class runs all tests for the module instrumentation.log_queue.
+
+    It includes: test_get_level, test_setup_logging
+
+    It inherited from class TestCase
+    """
+
+    def test_get_level(self) -> None:
+        """
+        Test level of logging for different environments.
+        :return: None
+        """
+        with patch.dict(os.environ, {'FLASK_ENV': 'development'}, clear=True):
+            self.assertEqual(log_queue.get_level(), logging.DEBUG)
+        with patch.dict(os.environ, {}, clear=True):
+            self.assertEqual(log_queue.get_level(), logging.INFO)
+        with patch.dict(os.environ, {'FLASK_ENV': 'development', 'LOG_LEVEL': 'warning'}):
+            self.assertEqual(log_queue.get_level(), logging.WARNING)
+        with patch.dict(os.environ, {'LOG_LEVEL': 'verbose'}):
+            with self.assertRaisesRegex(ValueError, 'LOG_LEVEL'):
+                log_queue.get_level()
+
+    def test_setup_logging(self) -> None:
+        """
+        Test that records are written by listener and full file is rotated and compressed.
+        :return: None
+        """
+        directory = tempfile.mkdtemp()
+        path = os.path.join(directory, 'test_log.txt')
+        logger = logging.getLogger('test_log_queue')
+        logger.propagate = False
+        environ = {'LOG_FILE': path, 'LOG_MAX_BYTES': '200', 'LOG_LEVEL': 'INFO'}
+        with patch.dict(os.environ, environ):
+            listener = log_queue.setup_logging(logger)
+        for number in range(10):
+            logger.info('Record number %d', number)
+        logger.debug('Record that is not written')
+        listener.stop()
+        atexit.unregister(listener.stop)
+        with gzip.open(path + '.1.gz', 'rt') as file:
+            rotated = file.read()
+        with open(path) as file:
+            current = file.read()
+        self.assertIn('Record number 9', current)
+        self.assertIn('test_log_queue:Record number', rotated)
+        self.assertNotIn('Record that is not written', rotated + current)
@@ -0,0 +1,51 @@
+"""
+This module run tests for function in module instrumentation.metrics.
+
+This module contains class TestMetrics
+
+This module imports: unittest.TestCase, unittest.mock.patch, app, University
+"""
+from unittest import TestCase
+from unittest.mock import patch
+from tests import app
+from models.university import University
+
+app.testing = True
+
+
+class TestMetrics(TestCase):
+    """
+    This class runs all tests for the module instrumentation.metrics.
+
+    It includes: setUp, test_metrics
+
+    It inherited from class TestCase
+    """
+
+    def setUp(self) -> None:
+        """
+        Set up for app for testing
+        :return: None
+        """
+        self.app = app.test_client()
+
+    @patch('rest.restapi.universities_crud')
+    def test_metrics(self, u_crud) -> None:
+        """
+        Test that requests are counted by endpoint and status code.
+        :param u_crud: Mock universities_crud
+        :return: None
+        """
+        u_crud.get_all_universities.return_value = [University('Test1', 'Test1')]
+        self.app.get('/api/university')
+        self.app.get('/wrong_url')
+        response = self.app.get('/metrics')
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('text/plain', response.content_type)
+        text = response.get_data(as_text=True)
+        self.assertIn('http_requests_total{endpoint="api.get_university",method="GET",'
+                      'status="200"}', text)
+        self.assertIn('http_requests_total{endpoint="unknown",method="GET",status="404"}', text)
+        self.assertIn('http_request_duration_seconds_bucket{endpoint="api.get_university",'
+                      'le="0.005",method="GET",status="200"}', text)
+        self.assertIn('http_requests_in_progress{endpoint="metrics",method="GET"} 1.0', text)
@@ -0,0 +1,68 @@
+"""
+This module run tests for function in module instrumentation.pool_stats.
+
+This module contains class TestPoolStats. Pool is made for SQLite file in temporary
+directory.
+
+This module imports: os, tempfile, unittest.TestCase, sqlalchemy.create_engine,
+sqlalchemy.exc.TimeoutError, app, pool_stats
+"""
+import os
+import tempfile
+from unittest import TestCase
+from sqlalchemy import create_engine
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from app import create_app
+from instrumentation import pool_stats
+
+
+class TestPoolStats(TestCase):
+    """
+    This class runs all tests for the module instrumentation.pool_stats.
+
+    It includes: setUp, test_timed_queue_pool, test_pool_statistics
+
+    It inherited from class TestCase
+    """
+
+    def setUp(self) -> None:
+        """
+        Set up path to SQLite file.
+        :return: None
+        """
+        self.url = f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'test.db')}"
+
+    def test_timed_queue_pool(self) -> None:
+        """
+        Test that checkouts and timeouts of pool are counted.
+        :return: None
+        """
+        engine = create_engine(self.url, poolclass=pool_stats.TimedQueuePool, pool_size=1,
+                               max_overflow=0, pool_timeout=0.05)
+        connection = engine.connect()
+        with self.assertRaises(PoolTimeoutError):
+            engine.connect()
+        connection.close()
+        engine.connect().close()
+        description = pool_stats.describe_pool(engine.pool)
+        self.assertEqual(description['checkouts'], 3)
+        self.assertEqual(description['timeouts'], 1)
+        self.assertEqual(description['checked_out'], 0)
+        self.assertGreaterEqual(description['wait_time_max_ms'], 50)
+
+    def test_pool_statistics(self) -> None:
+        """
+        Test route with statistics of pools.
+        :return: None
+        """
+        app = create_app({'TESTING': True, 'SQLALCHEMY_DATABASE_URI': self.url,
+                          'SQLALCHEMY_ENGINE_OPTIONS': {'poolclass': pool_stats.TimedQueuePool,
+                                                        'pool_size': 2}})
+        client = app.test_client()
+        client.get('/api/university')
+        response = client.get('/internal/pool')
+        self.assertEqual(response.json['pid'], os.getpid())
+        default = response.json['pools']['default']
+        self.assertEqual(default['pool'], 'TimedQueuePool')
+        self.assertEqual(default['size'], 2)
+        self.assertGreaterEqual(default['checkouts'], 1)
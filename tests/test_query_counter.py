@@ -0,0 +1,80 @@
+"""
+This module run tests for function in module instrumentation.query_counter.
+
+This module contains class TestQueryCounter. Statements are run on in-memory SQLite
+database from route of separate Flask application.
+
+This module imports: unittest.TestCase, unittest.mock.patch, flask.Flask,
+sqlalchemy.create_engine, sqlalchemy.text, app, query_counter
+"""
+from unittest import TestCase
+from unittest.mock import patch
+from flask import Flask
+from sqlalchemy import create_engine
+from sqlalchemy import text
+from tests import app
+from instrumentation import query_counter
+
+app.testing = True
+
+
+class TestQueryCounter(TestCase):
+    """
+    This class runs all tests for the module instrumentation.query_counter.
+
+    It includes: setUp, test_statement_shape, test_add_query_headers
+
+    It inherited from class TestCase
+    """
+
+    def setUp(self) -> None:
+        """
+        Set up application with route that runs given number of the same statements.
+        :return: None
+        """
+        engine = create_engine('sqlite://')
+        test_app = Flask(__name__)
+        test_app.config['N_PLUS_ONE_THRESHOLD'] = 3
+        query_counter.init_app(test_app)
+
+        @test_app.route('/<int:count>')
+        def run_statements(count):
+            with engine.connect() as connection:
+                for number in range(count):
+                    connection.execute(text('SELECT :number'), {'number': number})
+            return 'ok'
+
+        self.client = test_app.test_client()
+
+    def test_statement_shape(self) -> None:
+        """
+        Test that lists of placeholders have the same shape.
+        :return: None
+        """
+        self.assertEqual(query_counter.statement_shape('SELECT * FROM t WHERE id IN (?, ?, ?)'),
+                         'SELECT * FROM t WHERE id IN (?)')
+        self.assertEqual(query_counter.statement_shape('SELECT * FROM t WHERE id IN (%s,%s)'),
+                         'SELECT * FROM t WHERE id IN (?)')
+        self.assertEqual(query_counter.statement_shape('SELECT * FROM t WHERE id = ?'),
+                         'SELECT * FROM t WHERE id = ?')
+
+    def test_add_query_headers(self) -> None:
+        """
+        Test headers with number of statements and warning about repeated statement.
+        :return: None
+        """
+        # Test if statement is not repeated too many times
+        with patch('instrumentation.query_counter.logger') as logger:
+            response = self.client.get('/3')
+        logger.warning.assert_not_called()
+        self.assertEqual(response.headers['X-DB-Queries'], '3')
+        self.assertGreater(float(response.headers['X-DB-Time']), 0)
+        # Test if statement is repeated too many times
+        with patch('instrumentation.query_counter.logger') as logger:
+            response = self.client.get('/4')
+        self.assertEqual(response.headers['X-DB-Queries'], '4')
+        message, *args = logger.warning.call_args[0]
+        self.assertIn('ran the same statement 4 times', message % tuple(args))
+        # Test if there are no statements
+        response = self.client.get('/0')
+        self.assertEqual(response.headers['X-DB-Queries'], '0')
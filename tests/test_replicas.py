@@ -0,0 +1,150 @@
+"""
+This module run tests for module database.replicas.
+
+This module contains class TestReplicas. Primary database and replicas are SQLite files
+in temporary directory, every file has university with its own name, so responses show
+which database was read.
+
+This module imports: json, os, tempfile, unittest.TestCase, sqlalchemy.create_engine,
+sqlalchemy.event, app, db, University
+"""
+import json
+import os
+import tempfile
+from unittest import TestCase
+from sqlalchemy import create_engine
+from sqlalchemy import event
+from app import create_app, db
+from models.university import University
+
+
+class TestReplicas(TestCase):
+    """
+    This class runs all tests for the module database.replicas.
+
+    It includes: setUp, make_app, university_names, test_round_robin, test_read_your_writes,
+    test_replica_read, test_fallback_to_primary, test_replica_is_not_probed
+
+    It inherited from class TestCase
+    """
+
+    def setUp(self) -> None:
+        """
+        Create primary database and two replicas.
+        :return: None
+        """
+        directory = tempfile.mkdtemp()
+        self.urls = {}
+        for name in ('Primary', 'ReplicaA', 'ReplicaB'):
+            self.urls[name] = f"sqlite:///{os.path.join(directory, name + '.db')}"
+            engine = create_engine(self.urls[name])
+            db.metadata.create_all(engine)
+            with engine.begin() as connection:
+                connection.execute(University.__table__.insert(),
+                                   {'name': name, 'location': 'Test', 'average_salary': 0,
+                                    'salary_sum': 0, 'teacher_count': 0})
+            engine.dispose()
+        self.missing_url = f"sqlite:///{os.path.join(directory, 'missing', 'replica.db')}"
+
+    def make_app(self, replica_urls: list):
+        """
+        Return application with primary database and given replicas.
+        :param replica_urls: Urls of replicas.
+        :return: Flask
+        """
+        return create_app({'TESTING': True, 'SQLALCHEMY_DATABASE_URI': self.urls['Primary'],
+                           'DATABASE_REPLICA_URLS': replica_urls, 'UNIVERSITY_CACHE_SIZE': 0})
+
+    @staticmethod
+    def university_names(response) -> list:
+        """
+        Return names of universities from response of REST-API.
+        :param response: Response of test client.
+        :return: list
+        """
+        return [university['name'] for university in json.loads(response.data)]
+
+    def test_round_robin(self) -> None:
+        """
+        Test that GET requests read from replicas in turn.
+        :return: None
+        """
+        app = self.make_app([self.urls['ReplicaA'], self.urls['ReplicaB']])
+        client = app.test_client()
+        names = [self.university_names(client.get('/api/university')) for _ in range(3)]
+        self.assertEqual(names, [['ReplicaA'], ['ReplicaB'], ['ReplicaA']])
+        # Test if there is no request, for example in commands
+        with app.app_context():
+            self.assertEqual([university.name for university in University.query.all()],
+                             ['Primary'])
+
+    def test_read_your_writes(self) -> None:
+        """
+        Test that write goes to primary and next reads of the same client read primary.
+        :return: None
+        """
+        app = self.make_app([self.urls['ReplicaA']])
+        client = app.test_client()
+        response = client.post('/api/university', json={'name': 'New', 'location': 'Test'})
+        self.assertEqual(json.loads(response.data)['name'], 'New')
+        self.assertIn('db_primary_until', response.headers['Set-Cookie'])
+        self.assertEqual(self.university_names(client.get('/api/university')),
+                         ['Primary', 'New'])
+        # Test if other client reads replica
+        other_client = app.test_client()
+        self.assertEqual(self.university_names(other_client.get('/api/university')),
+                         ['ReplicaA'])
+
+    def test_replica_read(self) -> None:
+        """
+        Test that POST route marked with replica_read reads from replica.
+        :return: None
+        """
+        app = self.make_app([self.urls['ReplicaA']])
+        client = app.test_client()
+        response = client.post('/api/search_by_date',
+                               json={'date_from': '2000-01-01', 'date_to': '2001-01-01'})
+        self.assertEqual(response.json['teachers'], [])
+        self.assertNotIn('Set-Cookie', response.headers)
+
+    def test_fallback_to_primary(self) -> None:
+        """
+        Test that replica that can't be opened is skipped.
+        :return: None
+        """
+        app = self.make_app([self.missing_url, self.urls['ReplicaB']])
+        client = app.test_client()
+        names = [self.university_names(client.get('/api/university')) for _ in range(3)]
+        # Request that was sent to replica that failed reads primary
+        self.assertEqual(names, [['Primary'], ['ReplicaB'], ['ReplicaB']])
+        # Test if no replica works
+        app = self.make_app([self.missing_url])
+        client = app.test_client()
+        self.assertEqual(self.university_names(client.get('/api/university')), ['Primary'])
+
+    def test_replica_is_not_probed(self) -> None:
+        """
+        Test that replica that works is connected only to run statements and replica
+        that failed is connected again after retry time.
+        :return: None
+        """
+        app = self.make_app([self.urls['ReplicaA']])
+        connects = []
+        with app.app_context():
+            event.listen(db.get_engine(app, bind='replica_0'), 'engine_connect',
+                         lambda connection, branch: connects.append(connection))
+        client = app.test_client()
+        for _ in range(2):
+            self.assertEqual(self.university_names(client.get('/api/university')),
+                             ['ReplicaA'])
+        self.assertEqual(len(connects), 2)
+        # Test if replica that failed works again
+        app = self.make_app([self.missing_url])
+        app.extensions['replicas'].retry = 0
+        client = app.test_client()
+        self.assertEqual(self.university_names(client.get('/api/university')), ['Primary'])
+        os.makedirs(os.path.dirname(self.missing_url[len('sqlite:///'):]))
+        engine = create_engine(self.missing_url)
+        db.metadata.create_all(engine)
+        engine.dispose()
+        self.assertEqual(self.university_names(client.get('/api/university')), [])
@@ -3,17 +3,19 @@ This module run tests for function in module views.teacher_view.
 
 This module contains class TestRestApi. It tests all functions that teacher_view.py file has.
 
-This module imports: app,datetime, unittest.TestCase, unittest.mock.patch,
-University, University, teacher_crude
+This module imports: app,datetime, json, unittest.TestCase, unittest.mock.patch,
+University, University, teacher_crude, TEACHER_FIELDS
 """
 
-from app import app
+from tests import app
 import datetime
+import json
 from flask import jsonify
 from unittest import TestCase
 from unittest.mock import patch
 from models.university import University, UniversitySchema
 from models.teacher import Teacher, TeacherSchema
+from service.teachers_crud import TEACHER_FIELDS
 
 university1 = University('Test1', 'Test1')
 university2 = University('Test2', 'Test2')
@@ -27,6 +29,36 @@ teacher4 = Teacher('Name4', 'Last_name4', datetime.date(2011, 5, 5), 200, univer
 teacher_list = [teacher1, teacher2, teacher3, teacher4]
 
 
+def saved_teachers() -> list:
+    """
+    Return teachers with ids like teachers from database, the last one has no university.
+    :return: list
+    """
+    teachers = []
+    for number, teacher in enumerate(teacher_list, start=1):
+        university = University(teacher.university.name, teacher.university.location, 1000)
+        university.id = number * 10
+        saved = Teacher(teacher.name, teacher.last_name, teacher.birth_date, teacher.salary,
+                        university if number < len(teacher_list) else None)
+        saved.id = number
+        teachers.append(saved)
+    return teachers
+
+
+def teacher_row(teacher: Teacher) -> tuple:
+    """
+    Return teacher as row of teachers_crud.teacher_rows_query().
+    :param teacher: Teacher with id.
+    :return: tuple
+    """
+    university = teacher.university
+    if university is None:
+        return teacher.id, teacher.name, teacher.last_name, teacher.birth_date, \
+               teacher.salary, None, None, None, None
+    return teacher.id, teacher.name, teacher.last_name, teacher.birth_date, teacher.salary, \
+        university.id, university.name, university.location, university.average_salary
+
+
 class TestRestApi(TestCase):
     """
     This class runs all tests for the restapi.py file.
@@ -51,16 +83,87 @@ class TestRestApi(TestCase):
     @patch('rest.restapi.teachers_crud')
     def test_index(self, t_crud) -> None:
         """
-        Test get all teachers for REST-API
+        Test get teachers page by page for REST-API
         :param t_crud: Mock teachers_crud
         :return: None
         """
         # Test if everything is correct.
-        t_crud.get_all_teachers.return_value = teacher_list
+        teachers = saved_teachers()
+        t_crud.get_teacher_rows_page.return_value = ([teacher_row(teachers[0]),
+                                                      teacher_row(teachers[1])], 2)
         with app.app_context():
             teacher_scheme = TeacherSchema(many=True)
-            true_response = teacher_scheme.jsonify(teacher_list).data
+            true_response = jsonify({'teachers': teacher_scheme.dump(teachers[:2]),
+                                     'next': 2}).data
+        response = self.app.get('/api/?limit=2&after=0')
+        self.assertEqual(true_response, response.data)
+        t_crud.get_teacher_rows_page.assert_called_with(2, 0, TEACHER_FIELDS, True)
+        # Test if default page size is used
         response = self.app.get('/api/')
+        t_crud.get_teacher_rows_page.assert_called_with(100, None, TEACHER_FIELDS, True)
+        # Test if only some fields were asked
+        t_crud.get_teacher_rows_page.return_value = ([(1, 'Name1'), (2, 'Name2')], None)
+        response = self.app.get('/api/?fields=id,name')
+        self.assertEqual(response.json, {'teachers': [{'id': 1, 'name': 'Name1'},
+                                                      {'id': 2, 'name': 'Name2'}],
+                                         'next': None})
+        t_crud.get_teacher_rows_page.assert_called_with(100, None, ('id', 'name'), False)
+        # Test if field is wrong
+        response = self.app.get('/api/?fields=name,password')
+        self.assertEqual(response.json['error']['message'],
+                         'Fields must be some of id,name,last_name,birth_date,salary.')
+        response = self.app.get('/api/?include=teachers')
+        self.assertEqual(response.json['error']['message'], 'Only university can be included.')
+        # Test if every teacher was asked, the last one has no university
+        t_crud.get_all_teacher_rows.return_value = [teacher_row(teacher) for teacher in teachers]
+        with app.app_context():
+            true_response = teacher_scheme.jsonify(teachers).data
+        response = self.app.get('/api/?all=true')
+        self.assertEqual(true_response, response.data)
+        # Test if limit is not integer
+        response = self.app.get('/api/?limit=ten')
+        with app.app_context():
+            true_response = jsonify({'error': {'message': 'Limit and after must be integers.',
+                                               'status': 400}}).data
+        self.assertEqual(true_response, response.data)
+        # Test if limit is too big
+        response = self.app.get('/api/?limit=100000')
+        with app.app_context():
+            true_response = jsonify({'error': {'message': 'Limit must be between 1 and 1000.',
+                                               'status': 400}}).data
+        self.assertEqual(true_response, response.data)
+
+    @patch('rest.restapi.teachers_crud')
+    def test_export_teachers(self, t_crud) -> None:
+        """
+        Test export of all teachers for REST-API
+        :param t_crud: Mock teachers_crud
+        :return: None
+        """
+        rows = [(1, 'Name1', 'Last_name1', datetime.date(2011, 11, 1), 1000, 'Test1'),
+                (2, 'Name2', 'Last_name2', datetime.date(2010, 8, 21), 800, None)]
+        # Test if format is ndjson
+        t_crud.iter_teacher_rows.return_value = iter(rows)
+        response = self.app.get('/api/export')
+        true_response = '{"id": 1, "name": "Name1", "last_name": "Last_name1", ' \
+                        '"birth_date": "2011-11-01", "salary": 1000, "university": "Test1"}\n' \
+                        '{"id": 2, "name": "Name2", "last_name": "Last_name2", ' \
+                        '"birth_date": "2010-08-21", "salary": 800, "university": null}\n'
+        self.assertEqual(true_response, response.get_data(as_text=True))
+        self.assertEqual('application/x-ndjson', response.mimetype)
+        # Test if format is csv
+        t_crud.iter_teacher_rows.return_value = iter(rows)
+        response = self.app.get('/api/export?format=csv')
+        true_response = 'id,name,last_name,birth_date,salary,university\r\n' \
+                        '1,Name1,Last_name1,2011-11-01,1000,Test1\r\n' \
+                        '2,Name2,Last_name2,2010-08-21,800,\r\n'
+        self.assertEqual(true_response, response.get_data(as_text=True))
+        self.assertEqual('text/csv', response.mimetype)
+        # Test if format is wrong
+        response = self.app.get('/api/export?format=xml')
+        with app.app_context():
+            true_response = jsonify({'error': {'message': 'Format must be ndjson or csv.',
+                                               'status': 400}}).data
         self.assertEqual(true_response, response.data)
 
     @patch('rest.restapi.teachers_crud')
@@ -71,16 +174,26 @@ class TestRestApi(TestCase):
         :return: None
         """
         # Test if everything is okay
-        t_crud.get_teacher.return_value = teacher1
+        teacher = saved_teachers()[0]
+        t_crud.get_teacher_row.return_value = teacher_row(teacher)
         with app.app_context():
             teacher_scheme = TeacherSchema()
-            true_response = teacher_scheme.jsonify(teacher1).data
+            true_response = teacher_scheme.jsonify(teacher).data
         response = self.app.get('/api/1')
         self.assertEqual(true_response, response.data)
+        t_crud.get_teacher_row.assert_called_with(1, TEACHER_FIELDS, True)
+        # Test if id is not asked but is read as key, university is included
+        t_crud.get_teacher_row.return_value = (1, 'Last_name1', 10, 'Test1', 'Test1', 1000)
+        response = self.app.get('/api/1?fields=last_name&include=university')
+        self.assertEqual(json.loads(response.data), {'last_name': 'Last_name1',
+                                         'university': {'id': 10, 'name': 'Test1',
+                                                        'location': 'Test1',
+                                                        'average_salary': 1000}})
+        t_crud.get_teacher_row.assert_called_with(1, ('last_name',), True)
         # Test if no university was found
         true_response = {'error': {'message': 'No teacher was found with given id',
                                    'status': 400}}
-        t_crud.get_teacher.return_value = None
+        t_crud.get_teacher_row.return_value = None
         response = self.app.get('/api/1')
         with app.app_context():
             true_response = jsonify(true_response).data
@@ -181,6 +294,62 @@ class TestRestApi(TestCase):
             true_response = jsonify(true_response).data
         self.assertEqual(true_response, response.data)
 
+    @patch('rest.restapi.universities_crud')
+    @patch('rest.restapi.teachers_crud')
+    def test_add_teachers_bulk(self, t_crud, u_crud) -> None:
+        """
+        Test creation of many teachers with REST-API
+        :param t_crud: Mock teachers_crud
+        :param u_crud: Mock universities_crud
+        :return: None
+        """
+        university1.id = 1
+        u_crud.get_universities_by_names.return_value = {university1.name: university1}
+        t_crud.create_teachers_bulk.return_value = []
+        teachers = [{'name': 'Name1', 'last_name': 'Last1', 'birth_date': '2011-09-01',
+                     'salary': 1000, 'university': university1.name},
+                    {'name': 'Name2', 'last_name': 'Last2', 'birth_date': '2011-09-01',
+                     'salary': 1000, 'university': 'Wrong'},
+                    {'name': 'Name3', 'last_name': 'Last3', 'birth_date': '2011-09-01',
+                     'salary': '1000', 'university': university1.name},
+                    {'name': 'Name4', 'last_name': 'Last4', 'birth_date': '2011-09-01',
+                     'salary': 900, 'university': university1.name}]
+        # Test if some teachers are wrong
+        response = self.app.post('/api/bulk?chunk_size=1', json=teachers)
+        true_response = {'inserted': 2, 'errors': [
+            {'row': 1, 'error': {'message': 'Wrong university name.', 'status': 400}},
+            {'row': 2, 'error': {'message': 'Incorrect salary format. Salary must be integer.',
+                                 'status': 400}}]}
+        self.assertEqual(true_response, response.get_json())
+        self.assertEqual(t_crud.create_teachers_bulk.call_count, 2)
+        t_crud.create_teachers_bulk.assert_called_with([{
+            'name': 'Name4', 'last_name': 'Last4', 'birth_date': datetime.date(2011, 9, 1),
+            'salary': 900, 'university_id': 1}])
+        u_crud.get_universities_by_names.assert_called_once()
+        # Test if body is NDJSON and teacher can't be added to database
+        t_crud.create_teachers_bulk.reset_mock()
+        t_crud.create_teachers_bulk.return_value = [1]
+        body = '{"name": "Name1", "last_name": "Last1", "birth_date": "2011-09-01", ' \
+               '"salary": 1000, "university": "Test1"}\n' \
+               'not json\n' \
+               '{"name": "Name1", "last_name": "Last1", "birth_date": "2011-09-01", ' \
+               '"salary": 1000, "university": "Test1"}\n'
+        response = self.app.post('/api/bulk', data=body, content_type='application/x-ndjson')
+        true_response = {'inserted': 1, 'errors': [
+            {'row': 1, 'error': {'message': 'Teacher must be JSON object.', 'status': 400}},
+            {'row': 2, 'error': {'message': 'Can\'t add teacher to database', 'status': 412}}]}
+        self.assertEqual(true_response, response.get_json())
+        t_crud.create_teachers_bulk.assert_called_once()
+        # Test if body is not array
+        response = self.app.post('/api/bulk', json=teachers[0])
+        true_response = {'error': {'message': 'Body must be JSON array or NDJSON.', 'status': 400}}
+        self.assertEqual(true_response, response.get_json())
+        # Test if chunk size is wrong
+        response = self.app.post('/api/bulk?chunk_size=0', json=teachers)
+        true_response = {'error': {'message': 'Chunk size must be positive integer.',
+                                   'status': 400}}
+        self.assertEqual(true_response, response.get_json())
+
     @patch('rest.restapi.teachers_crud')
     def test_update_teacher(self, t_crud) -> None:
         """
@@ -189,7 +358,6 @@ class TestRestApi(TestCase):
         :return: None
         """
         # Test if everything is correct
-        t_crud.get_teacher.return_value = teacher1
         t_crud.update_teacher_api.return_value = teacher2
         response = self.app.patch('/api/1',
                                   json={'name': teacher2.name,
@@ -202,7 +370,6 @@ class TestRestApi(TestCase):
             true_response = teacher_scheme.jsonify(teacher2).data
         self.assertEqual(true_response, response.data)
         # Test if wrong data given
-        t_crud.get_teacher.return_value = teacher1
         t_crud.update_teacher_api.return_value = {'error': {'message': f'No data was given.',
                                                             'status': 400}}
         true_response = {'error': {'message': 'No data was given.', 'status': 400}}
@@ -216,7 +383,8 @@ class TestRestApi(TestCase):
             true_response = jsonify(true_response).data
         self.assertEqual(true_response, response.data)
         # Test if wrong teacher id was given
-        t_crud.get_teacher.return_value = None
+        t_crud.update_teacher_api.return_value = {'error': {'message': 'Wrong teacher id.',
+                                                            'status': 400}}
         true_response = {'error': {'message': 'Wrong teacher id.', 'status': 400}}
         response = self.app.patch('/api/1',
                                   json={'name': teacher2.name,
@@ -251,22 +419,59 @@ class TestRestApi(TestCase):
             true_response = jsonify(true_response).data
         self.assertEqual(true_response, response.data)
 
-    @patch('rest.restapi.Teacher')
-    def test_search_by_date(self, teacher) -> None:
+    @patch('rest.restapi.teachers_crud')
+    def test_search_by_date(self, t_crud) -> None:
         """
         Test search by date for REST-API
-        :param teacher: Mock Teacher class
+        :param t_crud: Mock teachers_crud
         :return: None
         """
         # Test if everything is okay
-        teacher.query.filter.return_value = teacher_list
+        teachers = saved_teachers()
+        query = t_crud.teacher_rows_query.return_value
+        t_crud.search_by_date.return_value = ([teacher_row(teacher) for teacher in teachers],
+                                              '2011-05-05_4', None)
         response = self.app.post('/api/search_by_date',
                                  json={"date_from": '2011-01-01',
                                        "date_to": '2012-01-01'})
         with app.app_context():
             teacher_schema = TeacherSchema(many=True)
-            return_response = teacher_schema.jsonify(teacher_list).data
+            return_response = jsonify({'teachers': teacher_schema.dump(teachers),
+                                       'next': '2011-05-05_4'}).data
         self.assertEqual(return_response, response.data)
+        t_crud.search_by_date.assert_called_with(datetime.date(2011, 1, 1),
+                                                 datetime.date(2012, 1, 1), 100, None, False,
+                                                 query)
+        t_crud.teacher_rows_query.assert_called_with(TEACHER_FIELDS, True, ('id', 'birth_date'))
+        # Test if only name was asked, keys of cursor are not shown
+        t_crud.search_by_date.return_value = ([(4, datetime.date(2011, 5, 5), 'Name4')],
+                                              None, None)
+        response = self.app.post('/api/search_by_date?fields=name',
+                                 json={"date_from": '2011-01-01', "date_to": '2012-01-01'})
+        self.assertEqual(response.json, {'teachers': [{'name': 'Name4'}], 'next': None})
+        t_crud.teacher_rows_query.assert_called_with(('name',), False, ('id', 'birth_date'))
+        # Test next page with total number of teachers
+        t_crud.search_by_date.return_value = ([teacher_row(teachers[0])], None, 5)
+        response = self.app.post('/api/search_by_date',
+                                 json={"date_from": '2011-01-01', "date_to": '2012-01-01',
+                                       "limit": 4, "after": '2011-05-05_4', "count": True})
+        self.assertEqual(response.json['total'], 5)
+        self.assertIsNone(response.json['next'])
+        t_crud.search_by_date.assert_called_with(datetime.date(2011, 1, 1),
+                                                 datetime.date(2012, 1, 1), 4,
+                                                 '2011-05-05_4', True, query)
+        # Test if limit is wrong
+        response = self.app.post('/api/search_by_date',
+                                 json={"date_from": '2011-01-01', "date_to": '2012-01-01',
+                                       "limit": 0})
+        self.assertEqual(response.json['error']['message'],
+                         'Limit must be integer between 1 and 1000.')
+        # Test if cursor is wrong
+        t_crud.search_by_date.side_effect = ValueError
+        response = self.app.post('/api/search_by_date',
+                                 json={"date_from": '2011-01-01', "date_to": '2012-01-01',
+                                       "after": 'wrong'})
+        self.assertEqual(response.json['error']['message'], 'Wrong cursor.')
         # Test if some date was not writen
         response = self.app.post('/api/search_by_date',
                                  json={"date_from": None, "date_to": '2012-01-01'})
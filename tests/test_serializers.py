@@ -0,0 +1,108 @@
+"""
+This module run tests for module rest.serializers.
+
+This module contains class TestSerializers.
+
+This module imports: tests.app, datetime, unittest.TestCase, unittest.mock.patch,
+flask.jsonify, db, serializers, TeacherSchema, UniversitySchema, Teacher, University,
+teachers_crud
+"""
+from tests import app
+import datetime
+from unittest import TestCase
+from unittest.mock import patch
+from flask import jsonify
+from app import db
+from rest import serializers
+from models.teacher import Teacher, TeacherSchema
+from models.university import University, UniversitySchema
+from service import teachers_crud
+
+
+class TestSerializers(TestCase):
+    """
+    This class runs all tests for the module rest.serializers.
+
+    It includes: setUp, test_rows_from_database, test_projection, test_json_body, test_debug
+
+    It inherited from class TestCase
+    """
+
+    def setUp(self) -> None:
+        """
+        Push application context.
+        :return: None
+        """
+        context = app.app_context()
+        context.push()
+        self.addCleanup(context.pop)
+
+    def test_rows_from_database(self) -> None:
+        """
+        Test that rows of teachers are written like marshmallow writes teachers.
+        :return: None
+        """
+        university = University('Serialized', 'Kharkiv')
+        teachers = [Teacher('Ivan', 'Petrenko', datetime.date(1980, 1, 2), 1200, university),
+                    Teacher('Олена', 'Без', datetime.date(1990, 3, 4), 900, None)]
+        db.session.add_all(teachers)
+        db.session.commit()
+        self.addCleanup(db.session.commit)
+        self.addCleanup(University.query.filter(University.id == university.id).delete)
+        self.addCleanup(Teacher.query.filter(Teacher.id.in_([t.id for t in teachers])).delete)
+        rows = [teachers_crud.get_teacher_row(teacher.id) for teacher in teachers]
+        body = serializers.json_response([serializers.dump_teacher_row(row)
+                                          for row in rows]).data
+        self.assertEqual(body, jsonify(TeacherSchema(many=True).dump(teachers)).data)
+        body = serializers.json_response(serializers.dump_university(university)).data
+        self.assertEqual(body, jsonify(UniversitySchema().dump(university)).data)
+
+    def test_projection(self) -> None:
+        """
+        Test that only asked columns are read, university is joined only if it is asked
+        and rows are written like TeacherSchema(only=...) writes teachers.
+        :return: None
+        """
+        university = University('Projected', 'Lviv')
+        teacher = Teacher('Petro', 'Sydor', datetime.date(1985, 6, 7), 1100, university)
+        db.session.add(teacher)
+        db.session.commit()
+        self.addCleanup(db.session.commit)
+        self.addCleanup(University.query.filter(University.id == university.id).delete)
+        self.addCleanup(Teacher.query.filter(Teacher.id == teacher.id).delete)
+        query = teachers_crud.teacher_rows_query(('name', 'birth_date'), False)
+        sql = str(query.statement.compile()).lower()
+        self.assertNotIn('join', sql)
+        self.assertNotIn('salary', sql)
+        self.assertNotIn('last_name', sql)
+        row = teachers_crud.get_teacher_row(teacher.id, ('name', 'birth_date'), False)
+        dump = serializers.teacher_dumper(('name', 'birth_date'), False)
+        self.assertEqual(dump(row), TeacherSchema(only=('name', 'birth_date')).dump(teacher))
+        row = teachers_crud.get_teacher_row(teacher.id, ('salary',), True)
+        dump = serializers.teacher_dumper(('salary',), True)
+        self.assertEqual(dump(row), TeacherSchema(only=('salary', 'university')).dump(teacher))
+        rows, _, _ = teachers_crud.search_by_date(
+            datetime.date(1985, 6, 7), datetime.date(1985, 6, 7), 10,
+            query=teachers_crud.teacher_rows_query(('id',), False, ('id', 'birth_date')))
+        self.assertIn((teacher.birth_date, teacher.id), [tuple(row) for row in rows])
+
+    def test_json_body(self) -> None:
+        """
+        Test that body is the same with and without orjson.
+        :return: None
+        """
+        data = {'teachers': [{'name': 'Тарас', 'salary': 10, 'birth_date': None}], 'next': 2}
+        for orjson in (serializers.orjson, None):
+            with patch('rest.serializers.orjson', orjson):
+                self.assertEqual(serializers.json_body(data), jsonify(data).data)
+                self.assertEqual(serializers.json_body({'a': 'b'}), jsonify({'a': 'b'}).data)
+
+    def test_debug(self) -> None:
+        """
+        Test that pretty JSON of debug mode is written by flask.jsonify.
+        :return: None
+        """
+        with patch.dict(app.config, {'JSONIFY_PRETTYPRINT_REGULAR': True}):
+            response = serializers.json_response({'a': [1, 2]})
+            self.assertEqual(response.data, jsonify({'a': [1, 2]}).data)
+            self.assertIn(b'\n  ', response.data)
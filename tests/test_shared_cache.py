@@ -0,0 +1,178 @@
+"""
+This module run tests for module service.shared_cache and shared cache of responses
+in module rest.conditional.
+
+This module contains class TestSharedCache.
+
+This module imports: os, tempfile, unittest.TestCase, unittest.mock.patch,
+sqlalchemy.create_engine, sqlalchemy.text, sqlalchemy.exc.OperationalError, app, db,
+conditional, shared_cache, universities_crud
+"""
+import os
+import tempfile
+from unittest import TestCase
+from unittest.mock import patch
+from sqlalchemy import create_engine
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+from app import create_app, db
+from rest import conditional
+from service import shared_cache
+from service import universities_crud
+
+
+class TestSharedCache(TestCase):
+    """
+    This class runs all tests for shared cache.
+
+    It includes: setUp, make_app, test_sqlite_cache, test_make_cache,
+    test_shared_responses, test_changed_while_read, test_errors_are_not_stored
+
+    It inherited from class TestCase
+    """
+
+    def setUp(self) -> None:
+        """
+        Set up paths of database and of cache.
+        :return: None
+        """
+        directory = tempfile.mkdtemp()
+        self.database_url = f"sqlite:///{os.path.join(directory, 'test.db')}"
+        self.cache_path = os.path.join(directory, 'cache.db')
+
+    def make_app(self, university_cache_size: int = 0):
+        """
+        Return application that shares cache file with other applications of test,
+        like gunicorn workers.
+        :param university_cache_size: Size of in-process cache of universities.
+        :return: Flask
+        """
+        return create_app({'TESTING': True, 'SQLALCHEMY_DATABASE_URI': self.database_url,
+                           'RESPONSE_CACHE_URL': f'sqlite:///{self.cache_path}',
+                           'UNIVERSITY_CACHE_SIZE': university_cache_size})
+
+    @patch('service.shared_cache.time.time')
+    def test_sqlite_cache(self, now) -> None:
+        """
+        Test that values are shared by caches of the same file and expire.
+        :param now: Mock time.time
+        :return: None
+        """
+        now.return_value = 1000
+        first = shared_cache.SQLiteCache(self.cache_path, 10)
+        second = shared_cache.SQLiteCache(self.cache_path, 10)
+        self.assertIsNone(first.get('key'))
+        first.set('key', b'value')
+        self.assertEqual(second.get('key'), b'value')
+        now.return_value = 1011
+        self.assertIsNone(second.get('key'))
+        # Test if file can't be opened
+        broken = shared_cache.SQLiteCache(os.path.join(self.cache_path, 'missing'), 10)
+        with patch('service.shared_cache.logger') as logger:
+            broken.set('key', b'value')
+            self.assertIsNone(broken.get('key'))
+            self.assertEqual(logger.warning.call_count, 2)
+
+    def test_make_cache(self) -> None:
+        """
+        Test that cache is chosen by url.
+        :return: None
+        """
+        self.assertFalse(shared_cache.make_cache('', 10).enabled)
+        self.assertIsInstance(shared_cache.make_cache(f'sqlite:///{self.cache_path}', 10),
+                              shared_cache.SQLiteCache)
+        with self.assertRaises(ValueError):
+            shared_cache.make_cache('memcached://localhost', 10)
+
+    def test_shared_responses(self) -> None:
+        """
+        Test that response made by one application is given by another one until
+        table is changed.
+        :return: None
+        """
+        first_worker = self.make_app()
+        second_worker = self.make_app()
+        with first_worker.app_context():
+            db.create_all()
+            universities_crud.create_university_api('Shared', 'Test')
+        response = first_worker.test_client().get('/api/university')
+        self.assertIn(b'Shared', response.data)
+        with patch('rest.restapi.universities_crud') as u_crud:
+            cached = second_worker.test_client().get('/api/university')
+            u_crud.get_all_universities.assert_not_called()
+        self.assertEqual(cached.data, response.data)
+        self.assertEqual(cached.content_type, response.content_type)
+        self.assertEqual(cached.headers['ETag'], response.headers['ETag'])
+        # Test if other url has its own response
+        self.assertNotEqual(second_worker.test_client().get('/api/?limit=1').data,
+                            response.data)
+        with second_worker.app_context():
+            universities_crud.create_university_api('Added', 'Test')
+        response = first_worker.test_client().get('/api/university')
+        self.assertIn(b'Added', response.data)
+
+    def test_changed_while_read(self) -> None:
+        """
+        Test that response isn't stored if table was changed while route read it and
+        that route doesn't show universities from in-process cache of its worker.
+        :return: None
+        """
+        first_worker = self.make_app(university_cache_size=16)
+        second_worker = self.make_app()
+        with first_worker.app_context():
+            db.create_all()
+            universities_crud.create_university_api('Shared', 'Test')
+            universities_crud.get_all_universities()
+        read = universities_crud.get_all_universities
+
+        def read_and_change(*args, **kwargs):
+            universities = read(*args, **kwargs)
+            engine = create_engine(self.database_url)
+            with engine.begin() as connection:
+                connection.execute(text("UPDATE university SET name = 'Changed'"))
+                connection.execute(text("UPDATE table_version SET version = version + 1 "
+                                        "WHERE table_name = 'university'"))
+            engine.dispose()
+            return universities
+
+        with patch('rest.restapi.universities_crud.get_all_universities',
+                   side_effect=read_and_change):
+            response = first_worker.test_client().get('/api/university')
+        self.assertIn(b'Shared', response.data)
+        self.assertEqual(response.headers['ETag'], 'W/"university.2"')
+        with first_worker.test_request_context('/api/university'):
+            key = conditional.cache_key('university.2')
+        self.assertIsNone(first_worker.extensions['response_cache'].get(key))
+        # Test if other worker changes university that is in cache of the first one
+        with second_worker.app_context():
+            university_id = universities_crud.get_all_universities()[0].id
+            universities_crud.update_university_api(university_id, 'Renamed', None)
+        response = first_worker.test_client().get('/api/university')
+        self.assertIn(b'Renamed', response.data)
+
+    def test_errors_are_not_stored(self) -> None:
+        """
+        Test that error of database and error dict of route are not given to other
+        workers as responses of current versions.
+        :return: None
+        """
+        first_worker = self.make_app()
+        second_worker = self.make_app()
+        with first_worker.app_context():
+            db.create_all()
+            universities_crud.create_university_api('Shared', 'Test')
+        with patch('service.universities_crud.University') as university:
+            university.query.all.side_effect = OperationalError('SELECT', {}, Exception('gone'))
+            response = first_worker.test_client().get('/api/university')
+        self.assertIn(b'error', response.data)
+        self.assertNotIn('ETag', response.headers)
+        response = second_worker.test_client().get('/api/university')
+        self.assertIn(b'Shared', response.data)
+        self.assertIn('ETag', response.headers)
+        # Test if teacher wasn't found
+        response = first_worker.test_client().get('/api/100')
+        self.assertIn(b'No teacher was found', response.data)
+        with patch('rest.restapi.teachers_crud') as t_crud:
+            t_crud.get_teacher_row.return_value = None
+            second_worker.test_client().get('/api/100')
+            t_crud.get_teacher_row.assert_called_once()
@@ -0,0 +1,87 @@
+"""
+This module run tests that pin number of SQL statements of routes, so loading of
+universities of teachers one by one is noticed.
+
+This module contains class TestStatementCounts.
+
+This module imports: datetime, os, tempfile, unittest.TestCase, app, Teacher, University,
+teachers_crud
+"""
+import datetime
+import os
+import tempfile
+from unittest import TestCase
+from app import create_app, db
+from models.teacher import Teacher
+from models.university import University
+from service import teachers_crud
+
+
+class TestStatementCounts(TestCase):
+    """
+    This class counts statements of routes with header "X-DB-Queries".
+
+    It includes: setUp, assert_statements, test_read_routes, test_write_routes
+
+    It inherited from class TestCase
+    """
+
+    def setUp(self) -> None:
+        """
+        Set up application with database of six teachers in two universities.
+        Pages are not streamed, because statements of streamed pages are not counted.
+        :return: None
+        """
+        directory = tempfile.mkdtemp()
+        test_app = create_app({'TESTING': True, 'UNIVERSITY_CACHE_SIZE': 0,
+                               'STREAM_TEMPLATES': False,
+                               'SQLALCHEMY_DATABASE_URI':
+                                   f"sqlite:///{os.path.join(directory, 'test.db')}"})
+        with test_app.app_context():
+            db.create_all()
+            universities = [University('First', 'Kyiv'), University('Second', 'Lviv')]
+            db.session.add_all(universities)
+            db.session.commit()
+            for number in range(6):
+                teachers_crud.create_teacher(Teacher(f'Name{number}', 'Last',
+                                                     datetime.date(1980, 1, number + 1),
+                                                     1000, universities[number % 2]))
+        self.client = test_app.test_client()
+
+    def assert_statements(self, count: int, method: str, url: str, **kwargs) -> None:
+        """
+        Make request and check number of statements it ran.
+        :param count: Expected number of statements.
+        :param method: Method of request.
+        :param url: Url of request.
+        :param kwargs: Arguments of request like json or data.
+        :return: None
+        """
+        response = self.client.open(url, method=method, **kwargs)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.headers['X-DB-Queries'], str(count), f'{method} {url}')
+
+    def test_read_routes(self) -> None:
+        """
+        Test that teachers are read with their universities in one statement.
+        :return: None
+        """
+        self.assert_statements(1, 'GET', '/')
+        self.assert_statements(2, 'GET', '/update_teacher%1')
+        self.assert_statements(1, 'POST', '/search_by_date',
+                               data={'date_from': '1980-01-01', 'date_to': '1980-12-31'})
+        # Routes of REST-API read versions of tables first
+        self.assert_statements(2, 'GET', '/api/?limit=3')
+        self.assert_statements(2, 'GET', '/api/?fields=id,name')
+        self.assert_statements(2, 'GET', '/api/1')
+        self.assert_statements(1, 'POST', '/api/search_by_date',
+                               json={'date_from': '1980-01-01', 'date_to': '1980-12-31'})
+
+    def test_write_routes(self) -> None:
+        """
+        Test that teacher is read once with university and lock before change (PATCH)
+        and read once after commit.
+        :return: None
+        """
+        self.assert_statements(7, 'PATCH', '/api/1', json={'salary': 1200})
+        self.assert_statements(7, 'DELETE', '/api/2')
@@ -3,13 +3,16 @@ This module run tests for function in module service.teachers_crude.
 
 This module contains class TestTeacherCrud
 
-This module imports: app,datetime,unittest.TestCase, unittest.mock.patch, Teacher, University, teacher_crude
+This module imports: app,datetime,unittest.TestCase, unittest.mock.patch,
+sqlalchemy.dialects.mysql, db, Teacher, University, teacher_crude
 """
 
 import datetime
 from unittest import TestCase
 from unittest.mock import patch
-from app import app
+from sqlalchemy.dialects import mysql
+from tests import app
+from app import db
 from models.teacher import Teacher
 from models.university import University
 from service import teachers_crud
@@ -29,23 +32,150 @@ class TestTeacherCrud(TestCase):
     """
     This class runs all tests for the module service.teachers_crud.
 
-    It includes: test test_get_all_teachers, test_get_teacher, test_create_teacher,
-    test_update_teacher, test_delete_teacher, test_update_teacher_api,
+    It includes: setUp, test_teacher_query, test_get_all_teachers, test_get_teachers_page,
+    test_search_by_date, test_stream_page, test_get_teacher_for_update, test_get_teacher,
+    test_create_teacher, test_update_teacher, test_delete_teacher, test_update_teacher_api,
     test_delete_teacher_api,test_teacher_str
 
     It inherited from class TestCase
     """
 
-    @patch('service.teachers_crud.Teacher')
-    def test_get_all_teachers(self, teacher) -> None:
+    def setUp(self) -> None:
+        """
+        Push application context, so functions can use database session.
+        :return: None
+        """
+        context = app.app_context()
+        context.push()
+        self.addCleanup(context.pop)
+
+    def test_teacher_query(self) -> None:
+        """
+        Test that university is joined only if it is asked.
+        :return: None
+        """
+        self.assertNotIn('JOIN', str(teachers_crud.teacher_query()))
+        self.assertIn('LEFT OUTER JOIN university',
+                      str(teachers_crud.teacher_query(with_university=True)))
+
+    @patch('service.teachers_crud.teacher_query')
+    def test_get_all_teachers(self, teacher_query) -> None:
         """
         Test to get all teachers on website.
-        :param teacher: Mock teacher class
+        :param teacher_query: Mock teacher_query() function
         :return: None
         """
-        teacher.query.all.return_value = teacher_list
+        teacher_query.return_value.all.return_value = teacher_list
         result = teachers_crud.get_all_teachers()
         self.assertEqual(result, teacher_list)
+        teacher_query.assert_called_with(with_university=True)
+
+    @patch('service.teachers_crud.teacher_query')
+    def test_get_teachers_page(self, teacher_query) -> None:
+        """
+        Test to get one page of teachers with cursor of the next page.
+        :param teacher_query: Mock teacher_query() function
+        :return: None
+        """
+        query = teacher_query.return_value.order_by.return_value
+        # Test if there are more teachers after the page
+        query.limit.return_value.all.return_value = teacher_list[:3]
+        result = teachers_crud.get_teachers_page(2)
+        self.assertEqual(result, (teacher_list[:2], teacher_list[1].id))
+        query.limit.assert_called_with(3)
+        # Test if it is the last page
+        query.filter.return_value.limit.return_value.all.return_value = teacher_list[2:]
+        result = teachers_crud.get_teachers_page(2, after=2)
+        self.assertEqual(result, (teacher_list[2:], None))
+
+    @patch('service.teachers_crud.teacher_query')
+    def test_search_by_date(self, teacher_query) -> None:
+        """
+        Test to search one page of teachers between two dates with cursor of the next page.
+        :param teacher_query: Mock teacher_query() function
+        :return: None
+        """
+        found = [Teacher(f'Test{i}', 'Test', datetime.date(2011, 1, i), 1000, university1)
+                 for i in range(1, 4)]
+        for teacher_id, found_teacher in enumerate(found, start=1):
+            found_teacher.id = teacher_id
+        query = teacher_query.return_value.filter.return_value
+        # Test if there are more teachers after the page and total is not needed
+        query.order_by.return_value.limit.return_value.all.return_value = found
+        result = teachers_crud.search_by_date(datetime.date(2011, 1, 1),
+                                              datetime.date(2012, 1, 1), 2)
+        self.assertEqual(result, (found[:2], '2011-01-02_2', None))
+        query.order_by.return_value.limit.assert_called_with(3)
+        query.count.assert_not_called()
+        # Test if it is the last page and total is needed
+        query.count.return_value = 3
+        query.filter.return_value.order_by.return_value.limit.return_value.all.return_value = \
+            found[2:]
+        result = teachers_crud.search_by_date(datetime.date(2011, 1, 1),
+                                              datetime.date(2012, 1, 1), 2,
+                                              after='2011-01-02_2', with_total=True)
+        self.assertEqual(result, (found[2:], None, 3))
+        # Test if cursor is wrong
+        with self.assertRaises(ValueError):
+            teachers_crud.search_by_date(datetime.date(2011, 1, 1), datetime.date(2012, 1, 1),
+                                         2, after='wrong')
+
+    def test_stream_page(self) -> None:
+        """
+        Test pages of teachers that are read while they are iterated.
+        :return: None
+        """
+        last_id = max([teacher.id for teacher in Teacher.query.all()], default=0)
+        university = University('Streamed', 'Odesa')
+        teachers = [Teacher(f'Stream{number}', 'Test', datetime.date(1901, 1, number), 900,
+                            university) for number in range(1, 4)]
+        db.session.add_all(teachers)
+        db.session.commit()
+        self.addCleanup(db.session.commit)
+        self.addCleanup(University.query.filter(University.id == university.id).delete)
+        self.addCleanup(Teacher.query.filter(Teacher.id.in_([t.id for t in teachers])).delete)
+        # Test if cursor of the next page is known after teachers were read
+        page = teachers_crud.iter_teachers_page(2, last_id)
+        self.assertIsNone(page['next'])
+        self.assertEqual([teacher.name for teacher in page['teachers']], ['Stream1', 'Stream2'])
+        self.assertEqual(page['next'], teachers[1].id)
+        page = teachers_crud.iter_teachers_page(2, teachers[1].id)
+        self.assertEqual([teacher.university.name for teacher in page['teachers']],
+                         ['Streamed'])
+        self.assertIsNone(page['next'])
+        # Test search with total and cursor
+        page = teachers_crud.iter_search_by_date(datetime.date(1901, 1, 1),
+                                                 datetime.date(1901, 12, 31), 2, with_total=True)
+        self.assertEqual(page['total'], 3)
+        self.assertEqual(len(list(page['teachers'])), 2)
+        self.assertEqual(page['next'], f'1901-01-02_{teachers[1].id}')
+        page = teachers_crud.iter_search_by_date(datetime.date(1901, 1, 1),
+                                                 datetime.date(1901, 12, 31), 2, page['next'])
+        self.assertEqual([teacher.id for teacher in page['teachers']], [teachers[2].id])
+        self.assertIsNone(page['total'])
+        with self.assertRaises(ValueError):
+            teachers_crud.iter_search_by_date(datetime.date(1901, 1, 1),
+                                              datetime.date(1901, 12, 31), 2, 'wrong')
+
+    def test_get_teacher_for_update(self) -> None:
+        """
+        Test that locked teacher is read again from database even if it is in session.
+        :return: None
+        """
+        teacher = Teacher('Locked', 'Test', datetime.date(1902, 1, 1), 700, None)
+        db.session.add(teacher)
+        db.session.commit()
+        self.addCleanup(db.session.commit)
+        self.addCleanup(Teacher.query.filter(Teacher.id == teacher.id).delete)
+        self.assertEqual(teachers_crud.get_teacher(teacher.id).salary, 700)
+        # Salary is changed by other transaction after teacher was read
+        db.session.execute(Teacher.__table__.update()
+                           .where(Teacher.__table__.c.teacher_id == teacher.id)
+                           .values(salary=900))
+        self.assertEqual(teachers_crud.get_teacher(teacher.id).salary, 700)
+        self.assertEqual(teachers_crud.get_teacher(teacher.id, for_update=True).salary, 900)
+        query = teachers_crud.teacher_query(with_university=True).with_for_update(of=Teacher)
+        self.assertIn('FOR UPDATE', str(query.statement.compile(dialect=mysql.dialect())))
 
     @patch('service.teachers_crud.Teacher')
     def test_get_teacher(self, teacher) -> None:
@@ -58,27 +188,85 @@ class TestTeacherCrud(TestCase):
         result = teachers_crud.get_teacher(-1)
         self.assertEqual(result, teacher1)
 
+    @patch('service.teachers_crud.universities_crud')
     @patch('service.teachers_crud.db.session')
-    def test_create_teacher(self, session) -> None:
+    def test_create_teacher(self, session, u_crud) -> None:
         """
         Test to create new teacher on website.
         :param session: Mock session class
+        :param u_crud: Mock universities_crud
         :return: None
         """
         session.add.return_value = 1
         result = teachers_crud.create_teacher(teacher1)
         self.assertEqual(result, True)
+        u_crud.change_salary_aggregates.assert_called_once_with(teacher1.university_id,
+                                                                teacher1.salary, 1)
         session.add.side_effect = Exception
         result = teachers_crud.create_teacher(teacher1)
         self.assertEqual(result, False)
 
+    @patch('service.teachers_crud.table_versions')
+    @patch('service.teachers_crud.universities_crud')
+    @patch('service.teachers_crud.db.session')
+    def test_insert_teacher_rows(self, session, u_crud, versions) -> None:
+        """
+        Test to insert many teachers with one statement.
+        :param session: Mock session class
+        :param u_crud: Mock universities_crud
+        :param versions: Mock table_versions
+        :return: None
+        """
+        rows = [{'name': 'Test1', 'last_name': 'Test1', 'birth_date': datetime.date(2011, 11, 1),
+                 'salary': 1000, 'university_id': 1},
+                {'name': 'Test2', 'last_name': 'Test2', 'birth_date': datetime.date(2010, 8, 21),
+                 'salary': 800, 'university_id': 2},
+                {'name': 'Test3', 'last_name': 'Test3', 'birth_date': datetime.date(2011, 2, 17),
+                 'salary': 1500, 'university_id': 1}]
+        teachers_crud.insert_teacher_rows(rows)
+        session.execute.assert_called_once()
+        self.assertEqual(session.execute.call_args[0][1], rows)
+        versions.bump_versions.assert_called_once_with(versions.TEACHER)
+        u_crud.change_salary_aggregates.assert_any_call(1, 2500, 2)
+        u_crud.change_salary_aggregates.assert_any_call(2, 800, 1)
+        # Test if there are no rows
+        session.execute.reset_mock()
+        teachers_crud.insert_teacher_rows([])
+        session.execute.assert_not_called()
+
+    @patch('service.teachers_crud.db.session')
+    @patch('service.teachers_crud.insert_teacher_rows')
+    def test_create_teachers_bulk(self, insert, session) -> None:
+        """
+        Test to add many teachers in one transaction.
+        :param insert: Mock function insert_teacher_rows
+        :param session: Mock session class
+        :return: None
+        """
+        rows = [{'name': 'Test1'}, {'name': 'Test2'}, {'name': 'Test3'}]
+        # Test if everything is correct
+        result = teachers_crud.create_teachers_bulk(rows)
+        self.assertEqual(result, [])
+        insert.assert_called_once_with(rows)
+        # Test if second teacher can't be added
+        def insert_rows(chunk):
+            if rows[1] in chunk:
+                raise Exception
+
+        insert.side_effect = insert_rows
+        result = teachers_crud.create_teachers_bulk(rows)
+        self.assertEqual(result, [1])
+        self.assertEqual(session.commit.call_count, 3)
+
+    @patch('service.teachers_crud.universities_crud')
     @patch('service.teachers_crud.db.session')
     @patch('service.teachers_crud.get_teacher')
-    def test_update_teacher(self,get_teacher, session) -> None:
+    def test_update_teacher(self,get_teacher, session, u_crud) -> None:
         """
         Test to update teacher on website.
         :param get_teacher: Mock teacher class.
         :param session: Mock session class.
+        :param u_crud: Mock universities_crud
         :return: None
         """
         # Test if everything is correct
@@ -90,6 +278,8 @@ class TestTeacherCrud(TestCase):
         session.commit.return_value = 1
         result = teachers_crud.update_teacher(name, last_name, birth_date, salary, university, 1)
         self.assertEqual(result, True)
+        u_crud.move_salary_aggregates.assert_called_once()
+        get_teacher.assert_called_with(1, with_university=True, for_update=True)
         # Test if no new data
         result = teachers_crud.update_teacher(name, last_name, birth_date, salary, university, 1)
         self.assertEqual(result, False)
@@ -99,30 +289,38 @@ class TestTeacherCrud(TestCase):
         result = teachers_crud.update_teacher(name, last_name, birth_date, salary, university, 1)
         self.assertEqual(result, False)
 
+    @patch('service.teachers_crud.universities_crud')
     @patch('service.teachers_crud.db.session')
     @patch('service.teachers_crud.Teacher')
-    def test_delete_teacher(self, teacher, session) -> None:
+    def test_delete_teacher(self, teacher, session, u_crud) -> None:
         """
         Test to delete teacher from db on website.
         :param teacher: Mock teacher class
         :param session: Mock session class
+        :param u_crud: Mock universities_crud
         :return: None
         """
         teacher.query.filter.return_value.delete.return_value = True
+        teacher.query.filter.return_value.with_entities.return_value.with_for_update \
+            .return_value.first.return_value = teacher1
         result = teachers_crud.delete_teacher(1000)
         self.assertEqual(result, True)
+        u_crud.change_salary_aggregates.assert_called_once_with(teacher1.university_id,
+                                                                -teacher1.salary, -1)
         teacher.query.filter.return_value.delete.side_effect = Exception
         session.rollback.return_value = 1
         result = teachers_crud.delete_teacher(1000)
         self.assertEqual(result, False)
 
+    @patch('service.teachers_crud.universities_crud')
     @patch('service.teachers_crud.get_teacher')
     @patch('service.teachers_crud.University')
-    def test_update_teacher_api(self, university, get) -> None:
+    def test_update_teacher_api(self, university, get, u_crud) -> None:
         """
         Test to update teacher on api.
         :param university: Mock university class
         :param get: Mock get_teacher() function
+        :param u_crud: Mock universities_crud
         :return: None
         """
         response1 = {'error': {'message': 'No data was given.', 'status': 400}}
@@ -160,6 +358,7 @@ class TestTeacherCrud(TestCase):
         self.assertEqual(result.name, teacher2.name)
         self.assertEqual(result.last_name, teacher2.last_name)
         self.assertEqual(result.university, teacher2.university)
+        get.assert_called_with(0, with_university=True, for_update=True)
         # Test if Name has wrong symbols
         result = teachers_crud.update_teacher_api(teacher_id=0, name="#$%^&", last_name=teacher2.last_name,
                                                   birth_date=str(teacher2.birth_date),
@@ -174,17 +373,27 @@ class TestTeacherCrud(TestCase):
                                                   university="Test1")
         true_response = {'error': {'message': 'Symbols in last name are not allowed.', 'status': 400}}
         self.assertEqual(true_response, result)
+        # Test if teacher with given id doesn't exist
+        get.return_value = None
+        result = teachers_crud.update_teacher_api(teacher_id=0, name=teacher2.name, last_name=None,
+                                                  birth_date=None, salary=None, university=None)
+        self.assertEqual({'error': {'message': 'Wrong teacher id.', 'status': 400}}, result)
 
+    @patch('service.teachers_crud.universities_crud')
     @patch('service.teachers_crud.db')
+    @patch('service.teachers_crud.teacher_query')
     @patch('service.teachers_crud.Teacher')
-    def test_delete_teacher_api(self, teacher, db) -> None:
+    def test_delete_teacher_api(self, teacher, teacher_query, db, u_crud) -> None:
         """
         Test to delete teacher in api
         :param teacher: Mock teacher class
+        :param teacher_query: Mock teacher_query() function
         :param db: Mock db class
+        :param u_crud: Mock universities_crud
         :return: None
         """
-        teacher.query.filter.return_value.first.return_value = teacher1
+        teacher_query.return_value.filter.return_value.with_for_update.return_value.first \
+            .return_value = teacher1
         teacher.query.filter.return_value.delete.return_value = True
         db.session.commit.return_value = 1
         result = teachers_crud.delete_teacher_api(1)
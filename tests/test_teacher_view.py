@@ -3,12 +3,12 @@ This module run tests for function in module views.teacher_view.
 
 This module contains class TestTeacherView. It tests all functions that teacher_view.py file has.
 
-This module imports: app,datetime, unittest.TestCase, unittest.mock.patch, University,
-University, teacher_crude
+This module imports: app,datetime, unittest.TestCase, unittest.mock.ANY, unittest.mock.patch,
+University, University, teacher_crude
 """
 from unittest import TestCase
-from unittest.mock import patch
-from app import app
+from unittest.mock import ANY, patch
+from tests import app
 import datetime
 from models.university import University
 
@@ -77,16 +77,38 @@ class TestTeacherView(TestCase):
         :return: None
         """
         # Test for status code
+        teachers_crud.iter_teachers_page.return_value = {'teachers': [], 'next': None}
         response = self.app.get('/', content_type='html/text')
         self.assertEqual(response.status_code, 200)
+        response.close()
 
-        # Test for data in response
-        teachers_crud.get_all_teachers.return_value = teacher_list
+        # Test for data in response, page is streamed and cursor is known after teachers
+        page = {'next': None}
+
+        def read_teachers():
+            yield from teacher_list
+            page['next'] = 4
+        page['teachers'] = read_teachers()
+        teachers_crud.iter_teachers_page.return_value = page
         response = self.app.get('/', content_type='html/text')
+        self.assertTrue(response.is_streamed)
         data = response.get_data(as_text=str)
         self.assertIn(teacher1.name, data)
         self.assertIn(teacher2.last_name, data)
         self.assertIn(str(teacher3.salary), data)
+        teachers_crud.iter_teachers_page.assert_called_with(100, None)
+        # Test that every row shares one modal and the next page is linked
+        self.assertEqual(data.count('class="modal fade"'), 1)
+        self.assertEqual(data.count('data-target="#deleteModal"'), len(teacher_list))
+        self.assertIn('href="/?after=4"', data)
+        self.assertNotIn('First page', data)
+        # Test the last page
+        teachers_crud.iter_teachers_page.return_value = {'teachers': teacher_list[:1],
+                                                         'next': None}
+        data = self.app.get('/?after=4').get_data(as_text=True)
+        teachers_crud.iter_teachers_page.assert_called_with(100, 4)
+        self.assertIn('First page', data)
+        self.assertNotIn('Next page', data)
 
     def test_get_add_teacher(self) -> None:
         """
@@ -119,6 +141,16 @@ class TestTeacherView(TestCase):
                                  follow_redirects=True)
         true_response = 'Teacher was added'
         self.assertIn(true_response, response.get_data(as_text=True))
+        teacher.assert_called_with('name', 'last_name', teacher1.birth_date,
+                                   str(teacher1.salary), ANY)
+        # Test if date of birth is in wrong format
+        response = self.app.post('/add_teacher',
+                                 data=dict(name='name', last_name='last_name',
+                                           birth_date='2011-13-01', salary=1000,
+                                           university='Test1'),
+                                 follow_redirects=True)
+        true_response = 'Please enter date of birth in format year-month-day'
+        self.assertIn(true_response, response.get_data(as_text=True))
         # Test if some fields weren't given
         response = self.app.post('/add_teacher',
                                  data=dict(last_name='last_name',
@@ -166,6 +198,7 @@ class TestTeacherView(TestCase):
         :param t_crud: Mock teachers_crud
         :return: None
         """
+        t_crud.iter_teachers_page.return_value = {'teachers': [], 'next': None}
         # Test if everything is correct
         university.query.filter_by.return_value.first.return_value = university1
         t_crud.update_teacher.return_value = True
@@ -205,22 +238,35 @@ class TestTeacherView(TestCase):
         true_response = 'Incorrect data or any new changes, please enter valid data'
         self.assertIn(true_response, response.get_data(as_text=True))
 
-    @patch('views.teacher_view.Teacher')
-    def test_search_by_date(self, teacher) -> None:
+    @patch('views.teacher_view.teachers_crud')
+    def test_search_by_date(self, t_crud) -> None:
         """
         Test option 'search by date' in teachers.html page
-        :param teacher: Mock Teacher class
+        :param t_crud: Mock teachers_crud
         :return: None
         """
+        t_crud.iter_teachers_page.return_value = {'teachers': [], 'next': None}
         # Test of filtering dates
-        teacher.query.filter.return_value = teacher_list
+        t_crud.iter_search_by_date.return_value = {'teachers': teacher_list,
+                                                   'next': '2011-05-05_4', 'total': 7}
         response = self.app.post('search_by_date', data=dict(
             date_from=teacher1.birth_date,
-            date_to=teacher1.birth_date),
+            date_to=teacher1.birth_date,
+            count='on'),
                                  follow_redirects=True)
         self.assertIn(f'{teacher1.name}', response.get_data(as_text=True))
         self.assertIn(f'{teacher2.name}', response.get_data(as_text=True))
         self.assertIn(f'{teacher3.name}', response.get_data(as_text=True))
+        self.assertIn('Found teachers: 7', response.get_data(as_text=True))
+        self.assertIn('value="2011-05-05_4"', response.get_data(as_text=True))
+        t_crud.iter_search_by_date.assert_called_with(teacher1.birth_date, teacher1.birth_date,
+                                                      100, None, True)
+        # Test if dates are in wrong format
+        response = self.app.post('search_by_date', data=dict(
+            date_from='2011-13-01',
+            date_to='2012-01-01'), follow_redirects=True)
+        true_response = 'Please enter dates in format year-month-day'
+        self.assertIn(true_response, response.get_data(as_text=True))
         # Test if some dates were not entered
         response = self.app.post('search_by_date', data=dict(
             date_from=None,
@@ -235,11 +281,15 @@ class TestTeacherView(TestCase):
         :param t_crud: Mock teachers_crud
         :return: None
         """
+        t_crud.iter_teachers_page.return_value = {'teachers': [], 'next': None}
         # Test if everything is correct
         t_crud.delete_teacher.return_value = True
         response = self.app.post('/delete_teacher/1', follow_redirects=True)
         true_response = 'Teacher was deleted'
         self.assertIn(true_response, response.get_data(as_text=True))
+        # Test that message is not shown again by streamed page
+        response = self.app.get('/')
+        self.assertNotIn(true_response, response.get_data(as_text=True))
         # Test if exception was raised
         t_crud.delete_teacher.return_value = False
         response = self.app.post('/delete_teacher/1', follow_redirects=True)
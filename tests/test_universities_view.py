@@ -7,7 +7,7 @@ This module imports: app,datetime,unittest.TestCase, unittest.mock.patch, Teache
 University, teacher_crude
 """
 
-from app import app
+from tests import app
 from unittest import TestCase
 from unittest.mock import patch
 
@@ -64,13 +64,30 @@ class TestUniversitiesView(TestCase):
         :return: None
         """
         # Test for 200 response
-        u_crud.get_all_universities.return_value = university_list
+        u_crud.iter_universities.return_value = {'universities': iter(university_list),
+                                                 'error': False}
         response = self.app.get('/universities', content_type='html/text')
         self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.is_streamed)
+        data = response.get_data(as_text=True)
+        for university in university_list:
+            self.assertIn(university.name, data)
+        self.assertNotIn('list is not complete', data)
+        # Test if error stopped reading after page was started
+        page = {'error': False}
+
+        def read_universities():
+            yield university_list[0]
+            page['error'] = True
+        page['universities'] = read_universities()
+        u_crud.iter_universities.return_value = page
+        data = self.app.get('/universities').get_data(as_text=True)
+        self.assertIn(university_list[0].name, data)
+        self.assertIn('list is not complete', data)
         # Test if exception was raised
         true_response = "Error of reading Universities from db,please check " \
                         "if you have table &#39;University&#39; "
-        u_crud.get_all_universities.return_value = None
+        u_crud.iter_universities.return_value = {'universities': iter([]), 'error': True}
         response = self.app.get('/universities', content_type='html/text', follow_redirects=True)
         self.assertIn(true_response, response.get_data(as_text=True))
 
@@ -0,0 +1,182 @@
+"""
+This module run tests for module service.cache and cache of universities
+in service.universities_crud.
+
+This module contains classes TestLRUCache and TestUniversityCache.
+
+This module imports: datetime, os, tempfile, unittest.TestCase, unittest.mock.patch, app,
+db, LRUCache, Teacher, University, teachers_crud, universities_crud
+"""
+import datetime
+import os
+import tempfile
+from unittest import TestCase
+from unittest.mock import patch
+from app import create_app, db
+from models.teacher import Teacher
+from models.university import University
+from service import teachers_crud
+from service import universities_crud
+from service.cache import LRUCache
+
+
+class TestLRUCache(TestCase):
+    """
+    This class runs all tests for class LRUCache.
+
+    It includes: test_hits_and_misses, test_lru_eviction, test_ttl, test_clear, test_disabled
+
+    It inherited from class TestCase
+    """
+
+    def test_hits_and_misses(self) -> None:
+        """
+        Test that value is loaded once and hits and misses are counted.
+        :return: None
+        """
+        cache = LRUCache('test', 10, 60)
+        self.assertEqual(cache.get_or_load('key', lambda: 1), 1)
+        self.assertEqual(cache.get_or_load('key', lambda: 2), 1)
+        self.assertEqual(cache.stats(), {'hits': 1, 'misses': 1, 'size': 1,
+                                         'maxsize': 10, 'ttl': 60})
+
+    def test_lru_eviction(self) -> None:
+        """
+        Test that the least recently used value is removed when cache is full.
+        :return: None
+        """
+        cache = LRUCache('test', 2, 60)
+        cache.set('a', 1)
+        cache.set('b', 2)
+        cache.get_or_load('a', lambda: None)
+        cache.set('c', 3)
+        self.assertEqual(cache.get_or_load('a', lambda: 'new'), 1)
+        self.assertEqual(cache.get_or_load('b', lambda: 'new'), 'new')
+
+    @patch('service.cache.time.monotonic')
+    def test_ttl(self, monotonic) -> None:
+        """
+        Test that value is loaded again after ttl.
+        :param monotonic: Mock time.monotonic
+        :return: None
+        """
+        monotonic.return_value = 100
+        cache = LRUCache('test', 10, 5)
+        cache.set('key', 'old')
+        monotonic.return_value = 104
+        self.assertEqual(cache.get_or_load('key', lambda: 'new'), 'old')
+        monotonic.return_value = 106
+        self.assertEqual(cache.get_or_load('key', lambda: 'new'), 'new')
+
+    def test_clear(self) -> None:
+        """
+        Test that clear removes values and value loaded before clear is not kept.
+        :return: None
+        """
+        cache = LRUCache('test', 10, 60)
+        cache.set('key', 'old')
+        cache.clear()
+
+        def load_while_cleared():
+            cache.clear()
+            return 'loaded'
+
+        self.assertEqual(cache.get_or_load('key', load_while_cleared), 'loaded')
+        self.assertEqual(cache.get_or_load('key', lambda: 'new'), 'new')
+
+    def test_disabled(self) -> None:
+        """
+        Test that cache with size 0 doesn't keep values.
+        :return: None
+        """
+        cache = LRUCache('test', 0, 60)
+        self.assertFalse(cache.enabled)
+        cache.get_or_load('key', lambda: 1)
+        self.assertEqual(cache.get_or_load('key', lambda: 2), 2)
+        self.assertEqual(cache.stats()['misses'], 2)
+
+
+class TestUniversityCache(TestCase):
+    """
+    This class runs tests for cache of universities.
+
+    It includes: setUp, test_read_through, test_invalidation,
+    test_other_worker_ttl
+
+    It inherited from class TestCase
+    """
+
+    def setUp(self) -> None:
+        """
+        Create application with SQLite file and cache of universities, push its context.
+        :return: None
+        """
+        self.url = f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'test.db')}"
+        self.app = create_app({'TESTING': True, 'SQLALCHEMY_DATABASE_URI': self.url,
+                               'UNIVERSITY_CACHE_SIZE': 16, 'UNIVERSITY_CACHE_TTL': 60})
+        context = self.app.app_context()
+        context.push()
+        self.addCleanup(context.pop)
+        db.create_all()
+        universities_crud.create_university(University('Cached', 'Test'))
+
+    def test_read_through(self) -> None:
+        """
+        Test that universities are read from database once.
+        :return: None
+        """
+        universities = universities_crud.get_all_universities()
+        self.assertEqual([university.name for university in universities], ['Cached'])
+        university_id = universities[0].id
+        with patch.object(University, 'query') as query:
+            self.assertIs(universities_crud.get_all_universities(), universities)
+            query.all.assert_not_called()
+        self.assertEqual(universities_crud.get_university(university_id).name, 'Cached')
+        self.assertIsNone(universities_crud.get_university(university_id + 100))
+        with patch.object(University, 'query') as query:
+            self.assertEqual(universities_crud.get_university(university_id).name, 'Cached')
+            self.assertIsNone(universities_crud.get_university(university_id + 100))
+            query.get.assert_not_called()
+        self.assertEqual(universities_crud.get_cache().stats()['hits'], 3)
+        self.assertEqual(universities_crud.get_cache().stats()['misses'], 3)
+
+    def test_invalidation(self) -> None:
+        """
+        Test that functions that change universities and salaries clear cache.
+        :return: None
+        """
+        university_id = universities_crud.get_all_universities()[0].id
+        universities_crud.update_university_api(university_id, 'Renamed', None)
+        self.assertEqual(universities_crud.get_university(university_id).name, 'Renamed')
+        universities_crud.create_university_api('Second', 'Test')
+        self.assertEqual(len(universities_crud.get_all_universities()), 2)
+        university = universities_crud.get_university(university_id, use_cache=False)
+        self.assertTrue(teachers_crud.create_teacher(
+            Teacher('Name', 'Last', datetime.date(2000, 1, 1), 1000, university)))
+        self.assertEqual(universities_crud.get_university(university_id).average_salary, 1000)
+        universities_crud.delete_university_api(university_id)
+        self.assertIsNone(universities_crud.get_university(university_id))
+        self.assertEqual([university.name
+                          for university in universities_crud.get_all_universities()],
+                         ['Second'])
+
+    @patch('service.cache.time.monotonic')
+    def test_other_worker_ttl(self, monotonic) -> None:
+        """
+        Test that cached read doesn't query database and change made by other worker
+        (application with its own cache and the same database) is seen after TTL.
+        :param monotonic: Mock time.monotonic
+        :return: None
+        """
+        monotonic.return_value = 100
+        university_id = universities_crud.get_all_universities()[0].id
+        self.assertEqual(universities_crud.get_university(university_id).name, 'Cached')
+        other_worker = create_app({'TESTING': True, 'SQLALCHEMY_DATABASE_URI': self.url,
+                                   'UNIVERSITY_CACHE_SIZE': 16, 'UNIVERSITY_CACHE_TTL': 60})
+        with other_worker.app_context():
+            universities_crud.update_university_api(university_id, 'Renamed', None)
+        with patch.object(University, 'query') as query:
+            self.assertEqual(universities_crud.get_university(university_id).name, 'Cached')
+            query.get.assert_not_called()
+        monotonic.return_value = 161
+        self.assertEqual(universities_crud.get_university(university_id).name, 'Renamed')
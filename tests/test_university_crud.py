@@ -3,13 +3,14 @@ This module run tests for  function in module service.universities_crud.
 
 This module contains class Test
 
-This module imports: app,datetime,unittest.TestCase, unittest.mock.patch, Teacher,
+This module imports: app,datetime,unittest.TestCase, unittest.mock.patch, db, Teacher,
 University, teacher_crude
 """
 
-from app import app
+from tests import app
 from unittest import TestCase
 from unittest.mock import patch
+from app import db
 from models.university import University
 from service import universities_crud
 
@@ -24,7 +25,10 @@ class TestUniversityCrud(TestCase):
     """
     This class runs all tests for the module service.universities_crud.
 
-    It includes: test test_get_all_universities, test_get_university,
+    It includes: setUp, test_get_all_universities, test_get_universities_by_names,
+    test_iter_universities,
+    test_change_salary_aggregates, test_move_salary_aggregates,
+    test_rebuild_salary_aggregates, test_get_university,
     test_create_university, test_update_university,
     test_delete_university, test_create_university_api,
     test_delete_university_api, test_update_university_api
@@ -32,6 +36,15 @@ class TestUniversityCrud(TestCase):
     It inherited from class TestCase
     """
 
+    def setUp(self) -> None:
+        """
+        Push application context, so functions can use database session.
+        :return: None
+        """
+        context = app.app_context()
+        context.push()
+        self.addCleanup(context.pop)
+
     @patch('service.universities_crud.University')
     def test_get_all_universities(self, university) -> None:
         """
@@ -47,6 +60,105 @@ class TestUniversityCrud(TestCase):
         result = universities_crud.get_all_universities()
         self.assertEqual(result, [])
 
+    def test_get_universities_by_names(self) -> None:
+        """
+        Test that universities are read by chunks of names.
+        :return: None
+        """
+        universities = [University(f'Chunked{number}', 'Test') for number in range(5)]
+        db.session.add_all(universities)
+        db.session.commit()
+        self.addCleanup(db.session.commit)
+        self.addCleanup(University.query.filter(University.name.like('Chunked%')).delete,
+                        synchronize_session=False)
+        names = [university.name for university in universities] + ['Missing']
+        with patch.object(University, 'query', wraps=University.query) as query:
+            result = universities_crud.get_universities_by_names(names, chunk_size=2)
+        self.assertEqual(query.filter.call_count, 3)
+        self.assertEqual(sorted(result), sorted(names[:-1]))
+        self.assertEqual(universities_crud.get_universities_by_names([]), {})
+
+    @patch('service.universities_crud.University')
+    def test_iter_universities(self, university) -> None:
+        """
+        Test to read universities while they are iterated.
+        :param university: Mock class University
+        :return: None
+        """
+        query = university.query.execution_options.return_value
+        query.yield_per.return_value = iter(list_university)
+        page = universities_crud.iter_universities()
+        self.assertEqual(list(page['universities']), list_university)
+        self.assertFalse(page['error'])
+        university.query.execution_options.assert_called_with(stream_results=True)
+        # Test if exception was raised
+        query.yield_per.side_effect = Exception
+        page = universities_crud.iter_universities()
+        with patch('service.universities_crud.logger') as logger:
+            self.assertEqual(list(page['universities']), [])
+        logger.error.assert_called_once()
+        self.assertTrue(page['error'])
+
+    @patch.object(University, 'query')
+    def test_change_salary_aggregates(self, query) -> None:
+        """
+        Test to change sum of salaries and number of teachers of university
+        :param query: Mock query of class University
+        :return: None
+        """
+        university_query = query.filter.return_value
+        universities_crud.change_salary_aggregates(1, 1000, 1)
+        self.assertEqual(university_query.update.call_count, 2)
+        # Test if teacher has no university
+        university_query.update.reset_mock()
+        universities_crud.change_salary_aggregates(None, 1000, 1)
+        university_query.update.assert_not_called()
+
+    @patch('service.universities_crud.change_salary_aggregates')
+    def test_move_salary_aggregates(self, change) -> None:
+        """
+        Test to change aggregates of universities after teacher was updated
+        :param change: Mock function change_salary_aggregates
+        :return: None
+        """
+        # Test if only salary was changed
+        universities_crud.move_salary_aggregates(1, 1000, 1, 1500)
+        change.assert_called_once_with(1, 500, 0)
+        # Test if nothing was changed
+        change.reset_mock()
+        universities_crud.move_salary_aggregates(1, 1000, 1, 1000)
+        change.assert_not_called()
+        # Test if university was changed
+        universities_crud.move_salary_aggregates(1, 1000, 2, 1500)
+        change.assert_any_call(1, -1000, -1)
+        change.assert_any_call(2, 1500, 1)
+
+    @patch('service.universities_crud.db')
+    def test_rebuild_salary_aggregates(self, db) -> None:
+        """
+        Test to count aggregates of every university from scratch
+        :param db: Mock class SQLAlchemy
+        :return: None
+        """
+        # Test if database is MySQL
+        db.engine.dialect.name = 'mysql'
+        db.session.execute.return_value.rowcount = 5
+        result = universities_crud.rebuild_salary_aggregates()
+        self.assertEqual(result, 5)
+        statement = db.session.execute.call_args[0][0]
+        self.assertEqual(statement.text, universities_crud.REBUILD_AGGREGATES_MYSQL)
+        db.session.commit.assert_called_once()
+        # Test if database is SQLite
+        db.engine.dialect.name = 'sqlite'
+        universities_crud.rebuild_salary_aggregates()
+        statement = db.session.execute.call_args[0][0]
+        self.assertEqual(statement.text, universities_crud.REBUILD_AGGREGATES)
+        # Test if exception was raised
+        db.session.execute.side_effect = Exception
+        with self.assertRaises(Exception):
+            universities_crud.rebuild_salary_aggregates()
+        db.session.rollback.assert_called_once()
+
     @patch('service.universities_crud.University')
     def test_get_university(self, university) -> None:
         """
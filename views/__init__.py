@@ -1,9 +1,13 @@
 """
 Module is made for rendering templates to the webpage.
 
-Module contains: teacher_view and university_view
+Routes of pages are registered in blueprint "views".
 
-Module import: app, db
+Module contains: teacher_view, university_view and streaming
+
+Module import: flask.Blueprint
 """
-from app import db, app
-from views import universities_view
+from flask import Blueprint
+
+views = Blueprint('views', __name__)
+from views import teacher_view, universities_view
@@ -0,0 +1,45 @@
+"""
+This module renders templates of long pages as streams.
+
+render_template() makes the whole page in memory before anything is sent. With
+stream_template() page is sent in parts while template is rendered, so if template
+iterates teachers or universities that are read from database while they are iterated,
+neither the first byte nor used memory waits for every row. Streaming is turned on by
+config value "STREAM_TEMPLATES", otherwise render_template() is used.
+
+Headers and session cookie are sent before template is rendered, so statements of
+streamed page are not counted in header "X-DB-Queries" and flashed messages are read
+before the response starts.
+
+This module includes functions: stream_template().
+
+This module imports: typing.Union, flask.Response, flask.current_app,
+flask.get_flashed_messages, flask.render_template, flask.stream_with_context.
+"""
+from typing import Union
+from flask import Response
+from flask import current_app
+from flask import get_flashed_messages
+from flask import render_template
+from flask import stream_with_context
+
+# Number of rendered parts of template that are sent at once.
+BUFFER_SIZE = 50
+
+
+def stream_template(template_name: str, **context) -> Union[Response, str]:
+    """
+    Return response that renders template while it is sent.
+    :param template_name: Name of template.
+    :param context: Variables of template.
+    :return: Union[Response, str]
+    """
+    app = current_app._get_current_object()
+    if not app.config['STREAM_TEMPLATES']:
+        return render_template(template_name, **context)
+    # Messages are removed from session now, while session can still be saved.
+    get_flashed_messages()
+    app.update_template_context(context)
+    stream = app.jinja_env.get_template(template_name).stream(context)
+    stream.enable_buffering(BUFFER_SIZE)
+    return Response(stream_with_context(stream))
@@ -6,6 +6,7 @@ Pages that are rendering are: teacher.html, add_teacher.html, update_teacher.htm
 This module contains functions: get_all_teachers(), get_add_teacher(), add_teacher(),
 get_update_teacher(), update_teacher(), search_by_date(), delete_teacher().
 """
+import datetime
 from typing import Union
 from flask import render_template
 from flask import request
@@ -14,26 +15,36 @@ from flask import url_for
 from flask import flash
 from werkzeug import Response
 
-from views import app
+from views import views
+from views.streaming import stream_template
 from app import logger
 from models.teacher import Teacher
 from models.university import University
 from service import universities_crud
+from database.replicas import replica_read
 from service import teachers_crud
 
+PAGE_SIZE = 100
 
-@app.route('/', methods=['GET'])
-def get_all_teachers() -> str:
+
+@views.route('/', methods=['GET'])
+def get_all_teachers() -> Union[Response, str]:
     """
-    Render main page "teachers.html", get every teacher from database.
-    :return: str
+    Render main page "teachers.html" with one page of teachers ordered by id.
+    Query string can contain "after" - id of the last teacher of previous page,
+    so size of page doesn't depend on number of teachers in database.
+    Teachers are read from database while page is streamed.
+    :return: Union[Response, str]
     """
-    teachers = teachers_crud.get_all_teachers()
+    after = request.args.get('after', type=int)
+    page = teachers_crud.iter_teachers_page(PAGE_SIZE, after)
+    page['after'] = after
     logger.debug('Route teacher.html is rendered.')
-    return render_template('teachers.html', title="Teachers", teachers=teachers)
+    return stream_template('teachers.html', title="Teachers", teachers=page['teachers'],
+                           page=page)
 
 
-@app.route('/add_teacher', methods=['GET'])
+@views.route('/add_teacher', methods=['GET'])
 def get_add_teacher() -> str:
     """
     Render page "add_teacher.html" Get all universities for this page to show a list of available
@@ -45,7 +56,7 @@ def get_add_teacher() -> str:
     return render_template('add_teacher.html', title='Add teachers', universities=universities)
 
 
-@app.route('/add_teacher', methods=['POST'])
+@views.route('/add_teacher', methods=['POST'])
 def add_teacher() -> Response:
     """
     Route with POST method to redirect to the "teachers.page". It checks validation of data
@@ -58,22 +69,28 @@ def add_teacher() -> Response:
     birth_date = request.form.get('birth_date')
     salary = request.form.get('salary')
     university = request.form.get('university')
-    university_db = University.query.filter_by(name=university).first()
-    new_teacher = Teacher(name, last_name, birth_date, salary, university_db)
     if not name or not last_name or not birth_date or not salary or not university:
         flash('You didn\'t enter some fields, please enter all fields', category='error')
         logger.debug('Some fields were not entered')
-        return redirect(url_for('add_teacher'))
+        return redirect(url_for('views.add_teacher'))
+    try:
+        birth_date = datetime.date.fromisoformat(birth_date)
+    except ValueError:
+        flash("Please enter date of birth in format year-month-day", category='error')
+        logger.debug('User entered date of birth in wrong format.')
+        return redirect(url_for('views.add_teacher'))
+    university_db = University.query.filter_by(name=university).first()
+    new_teacher = Teacher(name, last_name, birth_date, salary, university_db)
     if teachers_crud.create_teacher(new_teacher):
         flash('Teacher was added', category='success')
         logger.debug('Teacher was successfully added.')
-        return redirect(url_for('get_all_teachers'))
+        return redirect(url_for('views.get_all_teachers'))
     flash('You didn\'t enter some fields, please enter all fields', category='error')
     logger.debug('User did not enter some fields')
-    return redirect(url_for('add_teacher'))
+    return redirect(url_for('views.add_teacher'))
 
 
-@app.route('/update_teacher%<int:teacher_id>', methods=['GET'])
+@views.route('/update_teacher%<int:teacher_id>', methods=['GET'])
 def get_update_teacher(teacher_id) -> str:
     """
     Route with GET method to render "update_teacher.html" page. It takes current teacher
@@ -81,14 +98,14 @@ def get_update_teacher(teacher_id) -> str:
     :param teacher_id: Id of teacher.
     :return: str
     """
-    teacher = teachers_crud.get_teacher(teacher_id)
+    teacher = teachers_crud.get_teacher(teacher_id, with_university=True)
     universities = universities_crud.get_all_universities()
-    logger.debug(f'User click to update teacher with id {teacher_id}')
+    logger.debug('User click to update teacher with id %s', teacher_id)
     return render_template('update_teacher.html', title='Update teachers',
                            universities=universities, teacher=teacher)
 
 
-@app.route('/update_teacher', methods=['POST'])
+@views.route('/update_teacher', methods=['POST'])
 def update_teacher() -> Response:
     """
     Route updates teacher. It als o check validation before sending a database request.
@@ -104,22 +121,26 @@ def update_teacher() -> Response:
     if not name and not last_name and not birth_date and not university and not salary:
         flash('Incorrect data, please enter valid data', category='error')
         logger.debug('User entered incorrect data to form fields.')
-        return redirect(url_for('get_update_teacher', teacher_id=teacher_id))
+        return redirect(url_for('views.get_update_teacher', teacher_id=teacher_id))
     university_db = University.query.filter_by(name=university).first()
     if teachers_crud.update_teacher(name, last_name, birth_date, salary, university_db, int(teacher_id)):
         flash('Teacher was updated', category='success')
         logger.debug('Teacher was successfully updated.')
-        return redirect(url_for('get_all_teachers'))
+        return redirect(url_for('views.get_all_teachers'))
     flash('Incorrect data or any new changes, please enter valid data', category='error')
     logger.debug('User did not entered any new data')
-    return redirect(url_for('get_update_teacher', teacher_id=teacher_id))
+    return redirect(url_for('views.get_update_teacher', teacher_id=teacher_id))
 
 
-@app.route('/search_by_date', methods=['POST'])
+@views.route('/search_by_date', methods=['POST'])
+@replica_read
 def search_by_date() -> Union[Response, str]:
     """
     Route with POST method that search in interval of two dates
-    and return appropriate teachers to main page.
+    and return one page of appropriate teachers ordered by birth date to main page.
+    Form can contain "after" - cursor of the next page and "count" - checkbox
+    to show number of all found teachers. Teachers are read from database while page
+    is streamed.
     :return: Union[Response, str]
     """
     logger.debug('User click to search teachers in date intervals')
@@ -128,25 +149,42 @@ def search_by_date() -> Union[Response, str]:
     if not date_to or not date_from:
         flash("Please enter two dates and then click to search", category='error')
         logger.debug('User did not entered all dates in date form.')
-        return redirect(url_for('get_all_teachers'))
-    teachers = Teacher.query.filter(Teacher.birth_date.between(date_from, date_to))
-    logger.debug(f'Teachers in interval {date_from} to {date_to} were found.')
-    return render_template('teachers.html', title="Teachers", teachers=teachers)
-
-
-@app.route('/delete_teacher/<int:teacher_id>', methods=['POST'])
+        return redirect(url_for('views.get_all_teachers'))
+    try:
+        first_date = datetime.date.fromisoformat(date_from)
+        last_date = datetime.date.fromisoformat(date_to)
+    except ValueError:
+        flash("Please enter dates in format year-month-day", category='error')
+        logger.debug('User entered dates in wrong format.')
+        return redirect(url_for('views.get_all_teachers'))
+    try:
+        search = teachers_crud.iter_search_by_date(
+            first_date, last_date, PAGE_SIZE, request.form.get('after') or None,
+            request.form.get('count') == 'on')
+    except ValueError:
+        flash("Wrong page of search, please search again", category='error')
+        logger.debug('User sent wrong cursor of search.')
+        return redirect(url_for('views.get_all_teachers'))
+    logger.debug('Teachers in interval %s to %s were found.', date_from, date_to)
+    search.update(date_from=date_from, date_to=date_to,
+                  count=request.form.get('count') == 'on')
+    return stream_template('teachers.html', title="Teachers", teachers=search['teachers'],
+                           search=search)
+
+
+@views.route('/delete_teacher/<int:teacher_id>', methods=['POST'])
 def delete_teacher(teacher_id) -> Response:
     """
     Route delete teacher by given id. After it reloads the page.
     :param teacher_id: Id of teacher.
     :return: str
     """
-    logger.debug(f'User click delete teacher with id {teacher_id}.')
+    logger.debug('User click delete teacher with id %s.', teacher_id)
     res = teachers_crud.delete_teacher(teacher_id)
     if res:
         flash("Teacher was deleted", category='success')
-        logger.debug(f'Teacher with {teacher_id} was deleted.')
+        logger.debug('Teacher with %s was deleted.', teacher_id)
     else:
         flash("Error of deleting this Teacher", category='error')
         logger.error('Error of deleting this Teacher.')
-    return redirect(url_for('get_all_teachers'))
+    return redirect(url_for('views.get_all_teachers'))